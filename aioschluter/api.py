@@ -0,0 +1,313 @@
+"""Client for the Schluter DITRA-HEAT-E-WIFI cloud API."""
+
+import json
+import logging
+from collections.abc import AsyncIterator, Callable
+from datetime import datetime
+from typing import Any, Optional
+
+from aiohttp import ClientResponse, ClientSession
+
+from .collection import ThermostatCollection
+from .conditional import ConditionalState, body_digest
+from .const import (
+    API_APPLICATION_ID,
+    API_AUTH_PATH,
+    API_BASE_URL,
+    API_GET_THERMOSTATS_PATH,
+    API_SET_THERMOSTAT_PATH,
+    ENDPOINT_AUTH,
+    ENDPOINT_GET_THERMOSTATS,
+    ENDPOINT_SET_THERMOSTAT,
+    HTTP_NOT_MODIFIED,
+    HTTP_OK,
+    HTTP_UNAUTHORIZED,
+)
+from .exceptions import ApiError, InvalidSessionIdError, InvalidUserPasswordError
+from .observer import RequestObserver
+from .streaming import JsonDecoder, ThermostatStreamParser
+from .thermostat import Thermostat
+from .transport import Transport
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class SchluterApi:
+    """Main class to perform Schluter API requests."""
+
+    # Disable the Alternative Union Syntax, in 3.10
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        session: ClientSession,
+        json_decoder: JsonDecoder = json.loads,
+        base_url: str = API_BASE_URL,
+        transport: Optional[Transport] = None,
+        conditional: bool = False,
+    ):
+        """Initialize.
+
+        ``json_decoder`` decodes the thermostat responses, for example
+        ``aioschluter.streaming.get_default_decoder()`` to use orjson.
+        ``base_url`` points the client at another server, such as a local
+        stand-in for tests and benchmarks. ``transport`` sets the timeouts,
+        retries and circuit breaker; by default one is created for ``session``.
+        With ``conditional`` thermostat requests are revalidated with the
+        previous response, and a response identical to it is not decoded again.
+        """
+        self._json_decoder = json_decoder
+        base_url = base_url.rstrip("/")
+        self._auth_url = base_url + API_AUTH_PATH
+        self._get_thermostats_url = base_url + API_GET_THERMOSTATS_PATH
+        self._set_thermostat_url = base_url + API_SET_THERMOSTAT_PATH
+        self._username: Optional[str] = None
+        self._password: Optional[str] = None
+        self._session = session
+        self._sessionid: Optional[str] = None
+        self._sessionid_timestamp: Optional[datetime] = None
+        self._transport = transport or Transport(session)
+        self._conditional = ConditionalState() if conditional else None
+
+    @property
+    def username(self):
+        """Username."""
+        return self._username
+
+    @property
+    def password(self):
+        """Password."""
+        return self._password
+
+    @property
+    def sessionid(self):
+        """SessionId."""
+        return self._sessionid
+
+    @property
+    def sessionid_timestamp(self):
+        """Timestamp the session was created on."""
+        return self._sessionid_timestamp
+
+    @property
+    def conditional_state(self) -> Optional[ConditionalState]:
+        """State of the conditional thermostat requests, if enabled."""
+        return self._conditional
+
+    @property
+    def transport(self) -> Transport:
+        """Transport the requests are sent through."""
+        return self._transport
+
+    def restore_session(
+        self, username: str, sessionid: str, timestamp: datetime
+    ) -> None:
+        """Reuse a session id issued earlier, for example before a restart."""
+        self._username = username
+        self._sessionid = sessionid
+        self._sessionid_timestamp = timestamp
+
+    def add_observer(self, observer: RequestObserver) -> Callable[[], None]:
+        """Report every request to ``observer``; return a function to remove it."""
+        return self._transport.add_observer(observer)
+
+    @staticmethod
+    def _raise_for_status(resp: ClientResponse, unauthorized: Exception) -> None:
+        if resp.status == HTTP_UNAUTHORIZED:
+            raise unauthorized
+        if resp.status != HTTP_OK:
+            raise ApiError(f"Invalid Response from Schluter API: {resp.status}")
+
+    @staticmethod
+    def _extract_thermostats_from_data(data: dict[str, Any]) -> ThermostatCollection:
+        return ThermostatCollection.from_groups(data["Groups"])
+
+    async def async_get_sessionid(self, username, password) -> Optional[str]:
+        """Validate the username and password for the Schluter API."""
+
+        self._username = username
+        self._password = password
+
+        async with self._transport.async_request(
+            ENDPOINT_AUTH,
+            "POST",
+            self._auth_url,
+            json={
+                "Email": username,
+                "Password": password,
+                "Application": API_APPLICATION_ID,
+            },
+        ) as resp:
+            self._raise_for_status(
+                resp, InvalidUserPasswordError("Invalid username or password")
+            )
+
+            _LOGGER.debug(
+                "Data retrieved from %s, status: %s", self._auth_url, resp.status
+            )
+            self._sessionid_timestamp = datetime.now()
+            data = await resp.json()
+
+        if data["SessionId"] == "":
+            if data["ErrorCode"] == 1 or data["ErrorCode"] == 2:
+                raise InvalidUserPasswordError("Invalid username or password")
+            _LOGGER.error(
+                "Unkonwn ErrorCode was returned by Schluter API: %i",
+                data["ErrorCode"],
+            )
+            raise ApiError("Unknown ErrorCode was returned by Schluter Api")
+
+        self._sessionid = data["SessionId"]
+        return self._sessionid
+
+    async def async_get_current_thermostats(self, sessionid) -> ThermostatCollection:
+        """Get the current settings for all thermostats.
+
+        With conditional requests enabled, a response that did not change
+        returns a copy of the previous collection without decoding it again.
+        """
+        if len(sessionid) == 0:
+            raise InvalidSessionIdError("Invalid Session Id")
+
+        self._sessionid = sessionid
+        params = {"sessionId": sessionid}
+        if (conditional := self._conditional) is not None:
+            return await self._async_get_thermostats_conditional(params, conditional)
+        async with self._transport.async_request(
+            ENDPOINT_GET_THERMOSTATS, "GET", self._get_thermostats_url, params=params
+        ) as resp:
+            self._raise_for_status(
+                resp,
+                InvalidSessionIdError("An invalid or expired sessionid was supplied"),
+            )
+
+            _LOGGER.debug(
+                "Data retrieved from %s, status: %s",
+                self._get_thermostats_url,
+                resp.status,
+            )
+            data = await resp.json(loads=self._json_decoder)
+        return self._extract_thermostats_from_data(data)
+
+    async def _async_get_thermostats_conditional(
+        self, params: dict[str, str], conditional: ConditionalState
+    ) -> ThermostatCollection:
+        async with self._transport.async_request(
+            ENDPOINT_GET_THERMOSTATS,
+            "GET",
+            self._get_thermostats_url,
+            params=params,
+            headers=conditional.request_headers(),
+        ) as resp:
+            _LOGGER.debug(
+                "Data retrieved from %s, status: %s",
+                self._get_thermostats_url,
+                resp.status,
+            )
+            if resp.status == HTTP_NOT_MODIFIED and conditional.result is not None:
+                conditional.not_modified += 1
+                return conditional.result.copy()
+            self._raise_for_status(
+                resp,
+                InvalidSessionIdError("An invalid or expired sessionid was supplied"),
+            )
+            body = await resp.read()
+            headers = resp.headers
+
+        digest = body_digest(body)
+        if digest == conditional.digest and conditional.result is not None:
+            conditional.unchanged += 1
+            conditional.store(headers, digest, conditional.result)
+            return conditional.result.copy()
+        conditional.changed += 1
+        thermostats = self._extract_thermostats_from_data(self._json_decoder(body))
+        # Callers get their own copy, so changing it cannot alter the cache.
+        conditional.store(headers, digest, thermostats.copy())
+        return thermostats
+
+    async def async_stream_thermostats(self, sessionid) -> AsyncIterator[Thermostat]:
+        """Yield the thermostats one by one while the response is received."""
+        if len(sessionid) == 0:
+            raise InvalidSessionIdError("Invalid Session Id")
+
+        self._sessionid = sessionid
+        params = {"sessionId": sessionid}
+        parser = ThermostatStreamParser(self._json_decoder)
+        async with self._transport.async_request(
+            ENDPOINT_GET_THERMOSTATS, "GET", self._get_thermostats_url, params=params
+        ) as resp:
+            self._raise_for_status(
+                resp,
+                InvalidSessionIdError("An invalid or expired sessionid was supplied"),
+            )
+
+            _LOGGER.debug(
+                "Streaming data from %s, status: %s",
+                self._get_thermostats_url,
+                resp.status,
+            )
+            try:
+                async for chunk in resp.content.iter_any():
+                    for thermostat in parser.feed(chunk):
+                        yield thermostat
+                parser.close()
+            except ValueError as error:
+                raise ApiError(f"Invalid Response: {error}") from error
+
+    async def async_set_temperature(self, sessionid, serialnumber, temperature) -> bool:
+        """Set the temperature for a thermostat."""
+        if len(sessionid) == 0:
+            raise InvalidSessionIdError("Invalid Session Id")
+
+        self._sessionid = sessionid
+        adjusted_temp = int(temperature * 100)
+        params = {"sessionId": sessionid, "serialnumber": serialnumber}
+
+        async with self._transport.async_request(
+            ENDPOINT_SET_THERMOSTAT,
+            "POST",
+            self._set_thermostat_url,
+            params=params,
+            json={
+                "ManualTemperature": adjusted_temp,
+                "RegulationMode": 3,
+                "VacationEnabled": False,
+            },
+        ) as resp:
+            self._raise_for_status(
+                resp,
+                InvalidSessionIdError("An invalid or expired sessionid was supplied"),
+            )
+
+            _LOGGER.debug(
+                "Temperature set via %s, status: %s",
+                self._set_thermostat_url,
+                resp.status,
+            )
+            data = await resp.json()
+        return data["Success"]
+
+    async def async_set_regulation_mode(self, sessionid, serialnumber, mode) -> bool:
+        """set the regulation mode to SCHEDULE, MANUAL or AWAY"""
+        self._sessionid = sessionid
+        params = {"sessionId": sessionid, "serialnumber": serialnumber}
+
+        async with self._transport.async_request(
+            ENDPOINT_SET_THERMOSTAT,
+            "POST",
+            self._set_thermostat_url,
+            params=params,
+            json={"SerialNumber": serialnumber, "RegulationMode": mode},
+        ) as resp:
+            self._raise_for_status(
+                resp,
+                InvalidSessionIdError("An invalid or expired sessionid was supplied"),
+            )
+
+            _LOGGER.debug(
+                "HVAC mode set via %s, status: %s",
+                self._set_thermostat_url,
+                resp.status,
+            )
+            data = await resp.json()
+        return data["Success"]
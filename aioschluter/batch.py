@@ -0,0 +1,180 @@
+"""Write temperatures and regulation modes to many thermostats at once."""
+
+import asyncio
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional, Union
+
+from aiohttp import ClientError
+
+from .api import SchluterApi
+from .exceptions import ApiError
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_RETRIES = 2
+DEFAULT_RETRY_DELAY = 0.5
+
+RETRYABLE_ERRORS = (ApiError, ClientError, asyncio.TimeoutError)
+
+
+@dataclass(frozen=True)
+class WriteTarget:
+    """Values to write to a single thermostat."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    temperature: Optional[float] = None
+    regulation_mode: Optional[int] = None
+
+    def merge(self, other: "WriteTarget") -> "WriteTarget":
+        """Return a target where the values set in ``other`` win.
+
+        A temperature write also switches the thermostat to manual
+        regulation, so a newer temperature discards a pending regulation mode.
+        """
+        if other.regulation_mode is not None:
+            regulation_mode: Optional[int] = other.regulation_mode
+        elif other.temperature is not None:
+            regulation_mode = None
+        else:
+            regulation_mode = self.regulation_mode
+        return WriteTarget(
+            other.temperature if other.temperature is not None else self.temperature,
+            regulation_mode,
+        )
+
+
+@dataclass(frozen=True)
+class WriteResult:
+    """Outcome of the writes to a single thermostat."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    serialnumber: str
+    success: bool
+    attempts: int
+    error: Optional[BaseException] = None
+
+
+async def async_write_target(
+    api: SchluterApi, sessionid, serialnumber: str, target: WriteTarget
+) -> bool:
+    """Send the values of ``target`` to one thermostat."""
+    # A temperature write switches the thermostat to manual regulation, so
+    # the regulation mode, which merge only keeps when it came last, follows.
+    if target.temperature is not None:
+        if not await api.async_set_temperature(
+            sessionid, serialnumber, target.temperature
+        ):
+            return False
+    if target.regulation_mode is not None:
+        return await api.async_set_regulation_mode(
+            sessionid, serialnumber, target.regulation_mode
+        )
+    return True
+
+
+class BatchWriter:
+    """Dispatch thermostat writes with bounded concurrency and retries."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        api: SchluterApi,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        retries: int = DEFAULT_RETRIES,
+        retry_delay: float = DEFAULT_RETRY_DELAY,
+    ):
+        """Initialize.
+
+        A failed write is retried up to ``retries`` times, waiting
+        ``retry_delay`` seconds before the first retry and twice as long
+        before each following one.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        self._api = api
+        self._max_concurrency = max_concurrency
+        self._retries = retries
+        self._retry_delay = retry_delay
+        self._pending: dict[str, WriteTarget] = {}
+
+    @property
+    def pending(self) -> dict[str, WriteTarget]:
+        """Queued targets that have not been flushed yet."""
+        return dict(self._pending)
+
+    def queue(
+        self,
+        serialnumber: str,
+        temperature: Optional[float] = None,
+        regulation_mode: Optional[int] = None,
+    ) -> None:
+        """Queue a write, merging it with any pending write to the same serial."""
+        target = WriteTarget(temperature, regulation_mode)
+        if serialnumber in self._pending:
+            target = self._pending[serialnumber].merge(target)
+        self._pending[serialnumber] = target
+
+    async def async_flush(self, sessionid) -> dict[str, WriteResult]:
+        """Send all queued writes."""
+        targets, self._pending = self._pending, {}
+        return await self.async_write(sessionid, targets)
+
+    async def _async_write_one(
+        self,
+        sessionid,
+        serialnumber: str,
+        target: WriteTarget,
+        semaphore: asyncio.Semaphore,
+    ) -> WriteResult:
+        attempts = 0
+        while True:
+            attempts += 1
+            try:
+                async with semaphore:
+                    success = await async_write_target(
+                        self._api, sessionid, serialnumber, target
+                    )
+            except RETRYABLE_ERRORS as error:
+                if attempts > self._retries:
+                    return WriteResult(serialnumber, False, attempts, error)
+                _LOGGER.debug("Write to %s failed (%s), retrying", serialnumber, error)
+                await asyncio.sleep(self._retry_delay * 2 ** (attempts - 1))
+            except Exception as error:  # pylint: disable=broad-except
+                return WriteResult(serialnumber, False, attempts, error)
+            else:
+                return WriteResult(serialnumber, success, attempts)
+
+    async def async_write(
+        self,
+        sessionid,
+        targets: Mapping[str, Union[WriteTarget, float]],
+    ) -> dict[str, WriteResult]:
+        """Write ``targets`` and return the result for every serial number.
+
+        A plain number as target is taken as a temperature. Failures are
+        reported in the result instead of being raised.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        serials = list(targets)
+        results = await asyncio.gather(
+            *(
+                self._async_write_one(
+                    sessionid,
+                    serialnumber,
+                    (
+                        target
+                        if isinstance(target, WriteTarget)
+                        else WriteTarget(temperature=target)
+                    ),
+                    semaphore,
+                )
+                for serialnumber, target in targets.items()
+            )
+        )
+        return dict(zip(serials, results))
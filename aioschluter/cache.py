@@ -0,0 +1,133 @@
+"""Opt-in response cache for the Schluter thermostat list."""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from typing import Any
+
+from .api import SchluterApi
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL = 5.0
+DEFAULT_CACHE_SIZE = 128
+
+
+class CachedSchluterApi:
+    """Cache thermostat lists per session id and coalesce identical requests.
+
+    Any attribute not defined here is delegated to the wrapped SchluterApi, so
+    an instance can be used wherever the api is expected.
+    """
+
+    def __init__(
+        self,
+        api: SchluterApi,
+        ttl: float = DEFAULT_CACHE_TTL,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+    ):
+        """Initialize.
+
+        ``ttl`` is the number of seconds a thermostat list is served from the
+        cache, ``maxsize`` the number of session ids kept before the least
+        recently used one is evicted.
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._api = api
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._entries: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self._generation = 0
+
+    def __getattr__(self, name: str) -> Any:
+        """Delegate everything else to the wrapped api."""
+        if name == "_api":
+            raise AttributeError(name)
+        return getattr(self._api, name)
+
+    @property
+    def api(self) -> SchluterApi:
+        """The wrapped SchluterApi."""
+        return self._api
+
+    def __len__(self) -> int:
+        """Return the number of cached session ids."""
+        return len(self._entries)
+
+    def invalidate(self, sessionid=None, serialnumber=None) -> None:
+        """Drop cached thermostat lists.
+
+        Without arguments the whole cache is cleared. With ``serialnumber``
+        every list containing that thermostat is dropped.
+        """
+        self._generation += 1
+        # Requests already on the wire may return stale data, so new callers
+        # must not join them.
+        self._inflight.clear()
+        if sessionid is None and serialnumber is None:
+            self._entries.clear()
+            return
+        for key in list(self._entries):
+            if sessionid is not None and key != sessionid:
+                continue
+            if serialnumber is not None and serialnumber not in self._entries[key][1]:
+                continue
+            del self._entries[key]
+
+    def _get_fresh(self, sessionid: str):
+        if (entry := self._entries.get(sessionid)) is None:
+            return None
+        if time.monotonic() - entry[0] >= self._ttl:
+            del self._entries[sessionid]
+            return None
+        self._entries.move_to_end(sessionid)
+        return entry[1]
+
+    def _store(self, sessionid: str, thermostats: dict[str, Any]) -> None:
+        self._entries[sessionid] = (time.monotonic(), thermostats)
+        self._entries.move_to_end(sessionid)
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+    async def _async_fetch(self, sessionid: str) -> dict[str, Any]:
+        generation = self._generation
+        try:
+            thermostats = await self._api.async_get_current_thermostats(sessionid)
+        finally:
+            if self._inflight.get(sessionid) is asyncio.current_task():
+                del self._inflight[sessionid]
+        if generation == self._generation:
+            self._store(sessionid, thermostats)
+        return thermostats
+
+    async def async_get_current_thermostats(self, sessionid) -> dict[str, Any]:
+        """Get the current settings for all thermostats."""
+        if (thermostats := self._get_fresh(sessionid)) is None:
+            if (task := self._inflight.get(sessionid)) is None:
+                task = asyncio.ensure_future(self._async_fetch(sessionid))
+                self._inflight[sessionid] = task
+            else:
+                _LOGGER.debug("Joining in-flight thermostat request")
+            thermostats = await asyncio.shield(task)
+        return thermostats.copy()
+
+    async def async_set_temperature(self, sessionid, serialnumber, temperature) -> bool:
+        """Set the temperature for a thermostat."""
+        success = await self._api.async_set_temperature(
+            sessionid, serialnumber, temperature
+        )
+        if success:
+            self.invalidate(serialnumber=serialnumber)
+        return success
+
+    async def async_set_regulation_mode(self, sessionid, serialnumber, mode) -> bool:
+        """Set the regulation mode to SCHEDULE, MANUAL or AWAY."""
+        success = await self._api.async_set_regulation_mode(
+            sessionid, serialnumber, mode
+        )
+        if success:
+            self.invalidate(serialnumber=serialnumber)
+        return success
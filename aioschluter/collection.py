@@ -0,0 +1,220 @@
+"""Thermostats keyed by serial number with secondary indexes."""
+
+from collections.abc import Iterable, Mapping
+from operator import attrgetter
+from typing import Any
+
+from .thermostat import Thermostat
+
+INDEXED_ATTRIBUTES = ("group_id", "is_online", "is_heating", "regulation_mode")
+
+_index_key = attrgetter(*INDEXED_ATTRIBUTES)
+
+
+class ThermostatCollection(dict):
+    """A dict of thermostats keyed by serial number, indexed by state.
+
+    The collection keeps indexes by ``group_id``, ``is_online``,
+    ``is_heating`` and ``regulation_mode`` up to date on every change, so
+    queries such as ``offline()`` take time proportional to their result.
+    ``group_names`` only holds the groups that have thermostats.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        """Initialize like a dict."""
+        super().__init__()
+        self._keys: dict[str, tuple] = {}
+        self._indexes: tuple[dict[Any, dict[str, Thermostat]], ...] = tuple(
+            {} for _ in INDEXED_ATTRIBUTES
+        )
+        self.group_names: dict[int, str] = {}
+        # Set while copies share _keys and _indexes, see copy.
+        self._shared = False
+        self.update(*args, **kwargs)
+
+    def __reduce__(self):
+        """Pickle as the plain items, the indexes are rebuilt."""
+        return (self.__class__, (dict(self),))
+
+    @classmethod
+    def fromkeys(cls, iterable, value=None):
+        """Refuse to store one thermostat under several serial numbers."""
+        raise TypeError(f"{cls.__name__} does not support fromkeys")
+
+    def _own_indexes(self) -> None:
+        if not self._shared:
+            return
+        self._keys = dict(self._keys)
+        self._indexes = tuple(
+            {value: dict(entries) for value, entries in index.items()}
+            for index in self._indexes
+        )
+        self._shared = False
+
+    def _index(self, serial: str, thermostat: Thermostat) -> None:
+        self._own_indexes()
+        key = _index_key(thermostat)
+        old = self._keys.get(serial)
+        self._keys[serial] = key
+        for position, index in enumerate(self._indexes):
+            if old is not None and old[position] != key[position]:
+                self._remove_from(index, old[position], serial)
+            index.setdefault(key[position], {})[serial] = thermostat
+        if old is not None and old[0] not in self._indexes[0]:
+            self.group_names.pop(old[0], None)
+        if thermostat.group_name is not None:
+            self.group_names[thermostat.group_id] = thermostat.group_name
+
+    @staticmethod
+    def _remove_from(index: dict, value: Any, serial: str) -> None:
+        if (entries := index.get(value)) is not None:
+            entries.pop(serial, None)
+            if not entries:
+                del index[value]
+
+    def _unindex(self, serial: str) -> None:
+        if serial not in self._keys:
+            return
+        self._own_indexes()
+        key = self._keys.pop(serial)
+        for position, index in enumerate(self._indexes):
+            self._remove_from(index, key[position], serial)
+        if key[0] not in self._indexes[0]:
+            self.group_names.pop(key[0], None)
+
+    def __setitem__(self, serial: str, thermostat: Thermostat) -> None:
+        """Add or replace a thermostat."""
+        super().__setitem__(serial, thermostat)
+        self._index(serial, thermostat)
+
+    def __delitem__(self, serial: str) -> None:
+        """Remove a thermostat."""
+        super().__delitem__(serial)
+        self._unindex(serial)
+
+    def pop(self, serial, *default):
+        """Remove a thermostat and return it."""
+        if serial in self:
+            self._unindex(serial)
+        return super().pop(serial, *default)
+
+    def popitem(self):
+        """Remove and return the last added thermostat."""
+        serial, thermostat = super().popitem()
+        self._unindex(serial)
+        return serial, thermostat
+
+    def setdefault(self, serial, default=None):
+        """Return a thermostat, adding ``default`` if it is missing."""
+        if serial not in self:
+            self[serial] = default
+        return self[serial]
+
+    def clear(self) -> None:
+        """Remove all thermostats."""
+        super().clear()
+        self._keys = {}
+        self._indexes = tuple({} for _ in INDEXED_ATTRIBUTES)
+        self._shared = False
+        self.group_names.clear()
+
+    def update(self, *args: Any, **kwargs: Any) -> None:
+        """Add or replace thermostats like dict.update."""
+        for serial, thermostat in dict(*args, **kwargs).items():
+            self[serial] = thermostat
+
+    def __or__(self, other: Any) -> "ThermostatCollection":
+        """Return a copy with ``other`` added like dict |."""
+        collection = self.copy()
+        collection.update(other)
+        return collection
+
+    def __ior__(self, other: Any) -> "ThermostatCollection":
+        """Add or replace thermostats like dict |=."""
+        self.update(other)
+        return self
+
+    def copy(self) -> "ThermostatCollection":
+        """Return a shallow copy.
+
+        The copy shares the indexes with the collection until either of them
+        changes, so copying does not index the thermostats again.
+        """
+        self._shared = True
+        return self._sharing_indexes(self, self._keys, self._indexes)
+
+    @classmethod
+    def _sharing_indexes(
+        cls, thermostats: "ThermostatCollection", keys: dict, indexes: tuple
+    ) -> "ThermostatCollection":
+        collection = cls()
+        dict.update(collection, thermostats)
+        collection._keys = keys
+        collection._indexes = indexes
+        collection._shared = True
+        collection.group_names = dict(thermostats.group_names)
+        return collection
+
+    def apply_snapshot(self, thermostats: Mapping[str, Thermostat]) -> None:
+        """Replace the content with a new snapshot.
+
+        Thermostats missing from the snapshot are removed. Only index
+        entries whose values changed are moved.
+        """
+        for serial in [serial for serial in self if serial not in thermostats]:
+            del self[serial]
+        for serial, thermostat in thermostats.items():
+            self[serial] = thermostat
+
+    def _index_of(self, attribute: str) -> dict[Any, dict[str, Thermostat]]:
+        try:
+            return self._indexes[INDEXED_ATTRIBUTES.index(attribute)]
+        except ValueError:
+            raise ValueError(f"{attribute!r} is not indexed") from None
+
+    def where(self, attribute: str, value: Any) -> dict[str, Thermostat]:
+        """Return the thermostats whose indexed ``attribute`` equals ``value``."""
+        return dict(self._index_of(attribute).get(value, {}))
+
+    def in_group(self, group_id: int) -> dict[str, Thermostat]:
+        """Return the thermostats of a group."""
+        return self.where("group_id", group_id)
+
+    def online(self) -> dict[str, Thermostat]:
+        """Return the thermostats that are online."""
+        return self.where("is_online", True)
+
+    def offline(self) -> dict[str, Thermostat]:
+        """Return the thermostats that are offline."""
+        return self.where("is_online", False)
+
+    def heating(self) -> dict[str, Thermostat]:
+        """Return the thermostats that are heating."""
+        return self.where("is_heating", True)
+
+    def with_regulation_mode(self, mode: int) -> dict[str, Thermostat]:
+        """Return the thermostats in a regulation mode."""
+        return self.where("regulation_mode", mode)
+
+    @property
+    def group_ids(self) -> list[int]:
+        """Ids of the groups with thermostats."""
+        return list(self._indexes[0])
+
+    def counts(self, attribute: str) -> dict[Any, int]:
+        """Return the number of thermostats per value of an indexed attribute."""
+        index = self._index_of(attribute)
+        return {value: len(entries) for value, entries in index.items()}
+
+    @classmethod
+    def from_groups(cls, groups: Iterable[Mapping[str, Any]]) -> "ThermostatCollection":
+        """Build a collection from the ``Groups`` of a thermostats response."""
+        collection = cls()
+        for group in groups:
+            for tdata in group["Thermostats"]:
+                collection[tdata["SerialNumber"]] = Thermostat(tdata)
+            if group["GroupId"] in collection._indexes[0]:
+                collection.group_names[group["GroupId"]] = group["GroupName"]
+        return collection
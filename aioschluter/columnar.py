@@ -0,0 +1,267 @@
+"""Columnar export of thermostat snapshots to a memory-mappable file.
+
+A file starts with ``MAGIC``, the length of a json header as a little
+endian uint32 and the header itself. The header lists the dictionaries and,
+per column, the array typecode, its item size, byte offset and byte length.
+Typecodes such as ``I`` have a platform dependent size, so a file is only
+read where they have the size it was written with. The column data
+follows, every column aligned to 8 bytes, in the byte order named by the
+header. Reading maps the file and exposes each column as a memoryview, so
+nothing but the header is parsed.
+"""
+
+import json
+import mmap
+import struct
+import sys
+import time
+from array import array
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional, Union
+
+from .thermostat import Thermostat
+
+MAGIC = b"ASCOLv1\0"
+
+# Column name, array typecode and the function reading it from a Thermostat.
+COLUMNS = (
+    ("temperature", "f", lambda thermostat: thermostat.temperature),
+    ("set_point_temp", "f", lambda thermostat: thermostat.set_point_temp),
+    ("manual_temp", "f", lambda thermostat: thermostat.manual_temp),
+    ("regulation_mode", "b", lambda thermostat: thermostat.regulation_mode),
+    ("is_online", "B", lambda thermostat: bool(thermostat.is_online)),
+    ("is_heating", "B", lambda thermostat: bool(thermostat.is_heating)),
+    ("load_measured_watt", "f", lambda thermostat: thermostat.load_measured_watt or 0),
+    ("kwh_charge", "f", lambda thermostat: thermostat.kwh_charge or 0),
+    ("group_id", "q", lambda thermostat: thermostat.group_id),
+)
+
+TIMESTAMP = "timestamp"
+SERIAL_NUMBER = "serial_number"
+GROUP_NAME = "group_name"
+
+_ENCODED = (SERIAL_NUMBER, GROUP_NAME)
+_HEADER_LENGTH = struct.Struct("<I")
+_ALIGNMENT = 8
+
+# pylint: disable-next=consider-alternative-union-syntax
+Column = Union[array, memoryview]
+
+
+class ColumnarSnapshots:
+    """Rows of thermostat readings stored as one typed array per field.
+
+    Serial numbers and group names are dictionary encoded: their columns
+    hold indexes into ``dictionaries[SERIAL_NUMBER]`` and
+    ``dictionaries[GROUP_NAME]``. Several snapshots are told apart by the
+    ``timestamp`` column.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        columns: Mapping[str, Column],
+        dictionaries: Mapping[str, list[str]],
+        mapped: Optional[mmap.mmap] = None,
+    ):
+        """Initialize."""
+        self._columns = dict(columns)
+        self._dictionaries = dict(dictionaries)
+        self._mapped = mapped
+
+    @property
+    def column_names(self) -> list[str]:
+        """Names of all columns."""
+        return list(self._columns)
+
+    @property
+    def dictionaries(self) -> dict[str, list[str]]:
+        """The values of the dictionary encoded columns."""
+        return self._dictionaries
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self._columns[TIMESTAMP])
+
+    def column(self, name: str) -> Column:
+        """Return the typed values of a column."""
+        return self._columns[name]
+
+    def decode(self, name: str) -> list[str]:
+        """Return the values of a dictionary encoded column."""
+        values = self._dictionaries[name]
+        return [values[index] for index in self._columns[name]]
+
+    def row(self, index: int) -> dict[str, Any]:
+        """Return a single row, decoded."""
+        row = {name: column[index] for name, column in self._columns.items()}
+        for name in _ENCODED:
+            row[name] = self._dictionaries[name][row[name]]
+        return row
+
+    def write(self, path: str) -> None:
+        """Write the columns to ``path``."""
+        header: dict[str, Any] = {
+            "byteorder": sys.byteorder,
+            "rows": len(self),
+            "dictionaries": self._dictionaries,
+            "columns": [],
+        }
+        offset = 0
+        for name, column in self._columns.items():
+            itemsize = column.itemsize
+            header["columns"].append(
+                {
+                    "name": name,
+                    "typecode": (
+                        column.format
+                        if isinstance(column, memoryview)
+                        else column.typecode
+                    ),
+                    "itemsize": itemsize,
+                    "offset": offset,
+                    "length": len(column) * itemsize,
+                }
+            )
+            offset += -(-len(column) * itemsize // _ALIGNMENT) * _ALIGNMENT
+        encoded = json.dumps(header).encode()
+        start = len(MAGIC) + _HEADER_LENGTH.size + len(encoded)
+        padding = -start % _ALIGNMENT
+        with open(path, "wb") as file:
+            file.write(MAGIC)
+            file.write(_HEADER_LENGTH.pack(len(encoded) + padding))
+            file.write(encoded + b" " * padding)
+            for column in self._columns.values():
+                data = column.tobytes()
+                file.write(data)
+                file.write(b"\0" * (-len(data) % _ALIGNMENT))
+
+    @classmethod
+    def open(cls, path: str) -> "ColumnarSnapshots":
+        """Map a file written by ``write`` and return its columns.
+
+        The columns are views into the mapped file until ``close`` is
+        called. Files written with another byte order are copied and swapped;
+        files whose typecodes have another item size here are rejected.
+        """
+        with open(path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            if mapped[: len(MAGIC)] != MAGIC:
+                raise ValueError(f"{path} is not a columnar snapshot file")
+            (length,) = _HEADER_LENGTH.unpack_from(mapped, len(MAGIC))
+            start = len(MAGIC) + _HEADER_LENGTH.size
+            header = json.loads(mapped[start : start + length])
+            start += length
+            for spec in header["columns"]:
+                if (itemsize := array(spec["typecode"]).itemsize) != spec["itemsize"]:
+                    raise ValueError(
+                        f"{path} stores {spec['name']} with {spec['itemsize']} "
+                        f"byte items, typecode {spec['typecode']!r} has "
+                        f"{itemsize} bytes here"
+                    )
+            view = memoryview(mapped)
+            columns: dict[str, Column] = {}
+            for spec in header["columns"]:
+                offset = start + spec["offset"]
+                data = view[offset : offset + spec["length"]]
+                if header["byteorder"] == sys.byteorder:
+                    columns[spec["name"]] = data.cast(spec["typecode"])
+                else:
+                    swapped = array(spec["typecode"])
+                    swapped.frombytes(data)
+                    swapped.byteswap()
+                    columns[spec["name"]] = swapped
+            view.release()
+        except BaseException:
+            mapped.close()
+            raise
+        return cls(columns, header["dictionaries"], mapped)
+
+    def close(self) -> None:
+        """Release the mapped file, if any."""
+        if self._mapped is None:
+            return
+        for column in self._columns.values():
+            if isinstance(column, memoryview):
+                column.release()
+        self._columns = {}
+        self._mapped.close()
+        self._mapped = None
+
+    def __enter__(self) -> "ColumnarSnapshots":
+        """Return the snapshots."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Release the mapped file."""
+        self.close()
+
+
+class ColumnarBuilder:
+    """Append snapshots and build ColumnarSnapshots from them."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self):
+        """Initialize."""
+        self._timestamps = array("d")
+        self._columns = {name: array(typecode) for name, typecode, _ in COLUMNS}
+        self._encoded = {name: array("I") for name in _ENCODED}
+        self._dictionaries: dict[str, dict[str, int]] = {name: {} for name in _ENCODED}
+
+    def __len__(self) -> int:
+        """Return the number of rows added."""
+        return len(self._timestamps)
+
+    def _encode(self, name: str, value: str) -> int:
+        dictionary = self._dictionaries[name]
+        if (index := dictionary.get(value)) is None:
+            index = dictionary[value] = len(dictionary)
+        return index
+
+    def add(
+        self, thermostats: Mapping[str, Thermostat], timestamp: Optional[float] = None
+    ) -> None:
+        """Append a snapshot taken at ``timestamp``, by default now."""
+        if timestamp is None:
+            timestamp = time.time()
+        values = list(thermostats.values())
+        self._timestamps.extend([timestamp] * len(values))
+        self._encoded[SERIAL_NUMBER].extend(
+            [self._encode(SERIAL_NUMBER, item.serial_number) for item in values]
+        )
+        self._encoded[GROUP_NAME].extend(
+            [self._encode(GROUP_NAME, item.group_name) for item in values]
+        )
+        for name, _, getter in COLUMNS:
+            self._columns[name].extend(map(getter, values))
+
+    def build(self) -> ColumnarSnapshots:
+        """Return the rows added so far as ColumnarSnapshots."""
+        columns: dict[str, Column] = {TIMESTAMP: array("d", self._timestamps)}
+        for name in _ENCODED:
+            columns[name] = array("I", self._encoded[name])
+        for name, typecode, _ in COLUMNS:
+            columns[name] = array(typecode, self._columns[name])
+        return ColumnarSnapshots(
+            columns,
+            {name: list(values) for name, values in self._dictionaries.items()},
+        )
+
+
+def to_columnar(
+    # pylint: disable-next=consider-alternative-union-syntax
+    snapshots: Union[
+        Mapping[str, Thermostat], Iterable[tuple[float, Mapping[str, Thermostat]]]
+    ],
+) -> ColumnarSnapshots:
+    """Convert a snapshot, or ``(timestamp, snapshot)`` pairs, to columns."""
+    builder = ColumnarBuilder()
+    if isinstance(snapshots, Mapping):
+        builder.add(snapshots)
+    else:
+        for timestamp, thermostats in snapshots:
+            builder.add(thermostats, timestamp)
+    return builder.build()
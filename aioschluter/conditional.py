@@ -0,0 +1,59 @@
+"""Skip decoding thermostat responses that did not change."""
+
+import hashlib
+from collections.abc import Mapping
+from typing import Any, Optional
+
+from aiohttp import hdrs
+
+
+def body_digest(body: bytes) -> bytes:
+    """Return a short digest identifying a response body."""
+    return hashlib.blake2b(body, digest_size=16).digest()
+
+
+class ConditionalState:
+    """Validators and result of the previous thermostats response.
+
+    The ETag and Last-Modified headers, if the server sends them, are
+    returned as If-None-Match and If-Modified-Since with the next request.
+    Independently of them the digest of the body tells whether a full
+    response repeats the previous one.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self):
+        """Initialize."""
+        self.etag: Optional[str] = None
+        self.last_modified: Optional[str] = None
+        self.digest: Optional[bytes] = None
+        self.result: Any = None
+        self.not_modified = 0
+        self.unchanged = 0
+        self.changed = 0
+
+    def request_headers(self) -> dict[str, str]:
+        """Return the headers making the next request conditional."""
+        if self.result is None:
+            return {}
+        headers: dict[str, str] = {}
+        if self.etag is not None:
+            headers[hdrs.IF_NONE_MATCH] = self.etag
+        if self.last_modified is not None:
+            headers[hdrs.IF_MODIFIED_SINCE] = self.last_modified
+        return headers
+
+    def store(self, headers: Mapping[str, str], digest: bytes, result: Any) -> None:
+        """Remember a full response."""
+        self.etag = headers.get(hdrs.ETAG)
+        self.last_modified = headers.get(hdrs.LAST_MODIFIED)
+        self.digest = digest
+        self.result = result
+
+    def reset(self) -> None:
+        """Forget the previous response."""
+        self.etag = None
+        self.last_modified = None
+        self.digest = None
+        self.result = None
@@ -1,12 +1,19 @@
 """ constants for aioschluter """
 
 API_BASE_URL = "https://ditra-heat-e-wifi.schluter.com"
-API_AUTH_URL = API_BASE_URL + "/api/authenticate/user"
-API_GET_THERMOSTATS_URL = API_BASE_URL + "/api/thermostats"
-API_SET_THERMOSTAT_URL = API_BASE_URL + "/api/thermostat"
+API_AUTH_PATH = "/api/authenticate/user"
+API_GET_THERMOSTATS_PATH = "/api/thermostats"
+API_SET_THERMOSTAT_PATH = "/api/thermostat"
+API_AUTH_URL = API_BASE_URL + API_AUTH_PATH
+API_GET_THERMOSTATS_URL = API_BASE_URL + API_GET_THERMOSTATS_PATH
+API_SET_THERMOSTAT_URL = API_BASE_URL + API_SET_THERMOSTAT_PATH
 API_APPLICATION_ID = 7
+ENDPOINT_AUTH = "auth"
+ENDPOINT_GET_THERMOSTATS = "get_thermostats"
+ENDPOINT_SET_THERMOSTAT = "set_thermostat"
 HTTP_UNAUTHORIZED: int = 401
 HTTP_OK: int = 200
+HTTP_NOT_MODIFIED: int = 304
 REGULATION_MODE_SCHEDULE = 1
 REGULATION_MODE_MANUAL = 2
 REGULATION_MODE_AWAY = 3
@@ -0,0 +1,146 @@
+"""Debounce rapid writes to the same thermostat."""
+
+import asyncio
+import logging
+from typing import Optional
+
+from .api import SchluterApi
+from .batch import WriteTarget, async_write_target
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_DEBOUNCE_WINDOW = 0.5
+
+
+class _PendingWrite:
+    """Write state of a single thermostat."""
+
+    # pylint: disable=consider-alternative-union-syntax,too-few-public-methods
+
+    __slots__ = ("sessionid", "target", "waiters", "timer", "task")
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.sessionid = None
+        self.target: Optional[WriteTarget] = None
+        self.waiters: list[asyncio.Future] = []
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class DebouncedWriter:
+    """Coalesce writes per thermostat and send only the latest values.
+
+    A write is sent once no newer value for the same serial number arrived
+    within ``window`` seconds. At most one write per serial number is on the
+    wire at any time, so the last value queued is also the last one applied.
+    """
+
+    def __init__(self, api: SchluterApi, window: float = DEFAULT_DEBOUNCE_WINDOW):
+        """Initialize."""
+        self._api = api
+        self._window = window
+        self._writes: dict[str, _PendingWrite] = {}
+
+    @property
+    def pending(self) -> dict[str, WriteTarget]:
+        """Targets waiting for their debounce window to pass."""
+        return {
+            serial: state.target
+            for serial, state in self._writes.items()
+            if state.target is not None
+        }
+
+    def set_temperature(
+        self, sessionid, serialnumber: str, temperature: float
+    ) -> asyncio.Future:
+        """Queue a temperature and return a future for the acknowledgement."""
+        return self._queue(
+            sessionid, serialnumber, WriteTarget(temperature=temperature)
+        )
+
+    def set_regulation_mode(
+        self, sessionid, serialnumber: str, mode: int
+    ) -> asyncio.Future:
+        """Queue a regulation mode and return a future for the acknowledgement."""
+        return self._queue(sessionid, serialnumber, WriteTarget(regulation_mode=mode))
+
+    async def async_set_temperature(self, sessionid, serialnumber, temperature) -> bool:
+        """Set the temperature once the coalesced write is acknowledged."""
+        return await self.set_temperature(sessionid, serialnumber, temperature)
+
+    async def async_set_regulation_mode(self, sessionid, serialnumber, mode) -> bool:
+        """Set the regulation mode once the coalesced write is acknowledged."""
+        return await self.set_regulation_mode(sessionid, serialnumber, mode)
+
+    def _queue(
+        self, sessionid, serialnumber: str, target: WriteTarget
+    ) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        state = self._writes.setdefault(serialnumber, _PendingWrite())
+        state.sessionid = sessionid
+        state.target = target if state.target is None else state.target.merge(target)
+        waiter = loop.create_future()
+        state.waiters.append(waiter)
+        if state.timer is not None:
+            state.timer.cancel()
+        state.timer = loop.call_later(self._window, self._send, serialnumber)
+        return waiter
+
+    def _send(self, serialnumber: str) -> None:
+        state = self._writes[serialnumber]
+        state.timer = None
+        if state.task is not None or state.target is None:
+            # The running write sends the newer target when it completes.
+            return
+        target, waiters = state.target, state.waiters
+        state.target, state.waiters = None, []
+        state.task = asyncio.ensure_future(
+            self._async_send(serialnumber, state.sessionid, target, waiters)
+        )
+
+    async def _async_send(
+        self,
+        serialnumber: str,
+        sessionid,
+        target: WriteTarget,
+        waiters: list[asyncio.Future],
+    ) -> None:
+        _LOGGER.debug(
+            "Sending coalesced write of %i value(s) to %s", len(waiters), serialnumber
+        )
+        try:
+            success = await async_write_target(
+                self._api, sessionid, serialnumber, target
+            )
+        except asyncio.CancelledError:
+            for waiter in waiters:
+                waiter.cancel()
+            raise
+        except Exception as error:  # pylint: disable=broad-except
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_exception(error)
+        else:
+            for waiter in waiters:
+                if not waiter.done():
+                    waiter.set_result(success)
+        finally:
+            state = self._writes[serialnumber]
+            state.task = None
+            if state.target is None:
+                del self._writes[serialnumber]
+            elif state.timer is None:
+                self._send(serialnumber)
+
+    async def async_flush(self) -> None:
+        """Send all pending writes now and wait until they are acknowledged."""
+        while self._writes:
+            tasks = []
+            for serialnumber, state in list(self._writes.items()):
+                if state.timer is not None:
+                    state.timer.cancel()
+                    self._send(serialnumber)
+                if state.task is not None:
+                    tasks.append(state.task)
+            await asyncio.gather(*tasks)
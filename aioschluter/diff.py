@@ -0,0 +1,118 @@
+"""Report only the thermostats that changed between two polls."""
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Any
+
+from .thermostat import Thermostat
+
+DIFF_FIELDS = (
+    "name",
+    "group_id",
+    "group_name",
+    "temperature",
+    "set_point_temp",
+    "manual_temp",
+    "regulation_mode",
+    "is_online",
+    "is_heating",
+    "is_early_start_of_heating",
+    "max_temp",
+    "min_temp",
+    "kwh_charge",
+    "load_measured_watt",
+    "sw_version",
+)
+
+_MISSING = object()
+
+
+@dataclass(frozen=True)
+class ThermostatChange:
+    """A thermostat whose state differs from the previous snapshot."""
+
+    thermostat: Thermostat
+    previous: Thermostat
+    changes: dict[str, tuple[Any, Any]]
+
+    @property
+    def changed_fields(self) -> tuple[str, ...]:
+        """Names of the fields that changed."""
+        return tuple(self.changes)
+
+
+@dataclass(frozen=True)
+class SnapshotDiff:
+    """Difference between two thermostat snapshots, keyed by serial number."""
+
+    added: dict[str, Thermostat] = field(default_factory=dict)
+    removed: dict[str, Thermostat] = field(default_factory=dict)
+    changed: dict[str, ThermostatChange] = field(default_factory=dict)
+
+    def __bool__(self) -> bool:
+        """Return True if anything changed."""
+        return bool(self.added or self.removed or self.changed)
+
+
+class ThermostatDiffer:
+    """Keep the previous snapshot and compute what changed in the next one.
+
+    Every thermostat is reduced to a tuple of ``fields``, so an unchanged
+    thermostat costs a single tuple comparison.
+    """
+
+    def __init__(self, fields: Iterable[str] = DIFF_FIELDS):
+        """Initialize."""
+        self._fields = tuple(fields)
+        self._state = attrgetter(*self._fields)
+        self._snapshot: dict[str, Thermostat] = {}
+        self._states: dict[str, Any] = {}
+
+    @property
+    def snapshot(self) -> dict[str, Thermostat]:
+        """The most recent snapshot."""
+        return self._snapshot
+
+    def reset(self) -> None:
+        """Forget the previous snapshot."""
+        self._snapshot = {}
+        self._states = {}
+
+    def update(self, thermostats: Mapping[str, Thermostat]) -> SnapshotDiff:
+        """Store a new snapshot and return its difference to the previous one."""
+        state = self._state
+        previous_states = self._states
+        previous = self._snapshot
+        states = {}
+        added = {}
+        changed = {}
+        for serial, thermostat in thermostats.items():
+            current = states[serial] = state(thermostat)
+            old = previous_states.get(serial, _MISSING)
+            if old is _MISSING:
+                added[serial] = thermostat
+            elif old != current:
+                if len(self._fields) == 1:
+                    old, current = (old,), (current,)
+                changed[serial] = ThermostatChange(
+                    thermostat,
+                    previous[serial],
+                    {
+                        name: (before, after)
+                        for name, before, after in zip(self._fields, old, current)
+                        if before != after
+                    },
+                )
+        removed = {
+            serial: thermostat
+            for serial, thermostat in previous.items()
+            if serial not in states
+        }
+        self._snapshot = dict(thermostats)
+        self._states = states
+        return SnapshotDiff(added, removed, changed)
+
+    async def async_update(self, api, *args) -> SnapshotDiff:
+        """Diff the result of ``api.async_get_current_thermostats(*args)``."""
+        return self.update(await api.async_get_current_thermostats(*args))
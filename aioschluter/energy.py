@@ -0,0 +1,196 @@
+"""Running energy and cost totals per room, group and account."""
+
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Optional
+
+from .thermostat import Thermostat
+
+DEFAULT_MAX_GAP = 900.0
+
+_WATT_SECONDS_PER_KWH = 3_600_000.0
+
+
+@dataclass(frozen=True)
+class EnergyTotals:
+    """Energy used over the observed time."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    kwh: float = 0.0
+    cost: float = 0.0
+    heating_seconds: float = 0.0
+    seconds: float = 0.0
+    name: Optional[str] = None
+
+    @property
+    def duty_cycle(self) -> Optional[float]:
+        """Fraction of the observed time spent heating."""
+        if not self.seconds:
+            return None
+        return self.heating_seconds / self.seconds
+
+
+class _Accumulator:
+    """Mutable running totals."""
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("kwh", "cost", "heating_seconds", "seconds", "name")
+
+    def __init__(self, name=None):
+        """Initialize."""
+        self.kwh = 0.0
+        self.cost = 0.0
+        self.heating_seconds = 0.0
+        self.seconds = 0.0
+        self.name = name
+
+    def add(self, kwh, cost, heating_seconds, seconds):
+        """Add an interval to the totals."""
+        self.kwh += kwh
+        self.cost += cost
+        self.heating_seconds += heating_seconds
+        self.seconds += seconds
+
+    def totals(self) -> EnergyTotals:
+        """Return a frozen copy of the totals."""
+        return EnergyTotals(
+            self.kwh, self.cost, self.heating_seconds, self.seconds, self.name
+        )
+
+
+class _Reading:
+    """The state of a thermostat at its previous poll."""
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("timestamp", "heating", "watt", "kwh_charge", "group_key")
+
+    def __init__(self, timestamp, thermostat, group_key):
+        """Initialize."""
+        self.timestamp = timestamp
+        self.heating = bool(thermostat.is_heating)
+        self.watt = thermostat.load_measured_watt or 0
+        self.kwh_charge = thermostat.kwh_charge or 0.0
+        self.group_key = group_key
+
+
+class EnergyAggregator:
+    """Integrate the measured load over time from successive snapshots.
+
+    The state of a thermostat is assumed to hold until the next poll, so the
+    interval between two polls is counted with the heating state, load and
+    charge of the earlier one. Intervals longer than ``max_gap`` seconds,
+    such as after missed polls, are skipped rather than guessed. Each update
+    only adds the new intervals to the running totals, so reading the totals
+    of a room, group, account or the whole fleet costs nothing.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, max_gap: Optional[float] = DEFAULT_MAX_GAP):
+        """Initialize."""
+        self._max_gap = max_gap
+        self._readings: dict[tuple[Optional[str], str], _Reading] = {}
+        self._rooms: dict[tuple[Optional[str], str], _Accumulator] = {}
+        self._groups: dict[tuple[Optional[str], int], _Accumulator] = {}
+        self._accounts: dict[Optional[str], _Accumulator] = {}
+        self._total = _Accumulator()
+
+    def reset(self) -> None:
+        """Forget all totals and previous readings."""
+        self._readings.clear()
+        self._rooms.clear()
+        self._groups.clear()
+        self._accounts.clear()
+        self._total = _Accumulator()
+
+    def update(
+        self,
+        thermostats: Mapping[str, Thermostat],
+        timestamp: Optional[float] = None,
+        account: Optional[str] = None,
+    ) -> None:
+        """Add the intervals since the previous snapshot of ``account``."""
+        if timestamp is None:
+            timestamp = time.time()
+        if (account_totals := self._accounts.get(account)) is None:
+            account_totals = self._accounts[account] = _Accumulator(account)
+        for serial, thermostat in thermostats.items():
+            key = (account, serial)
+            group_key = (account, thermostat.group_id)
+            if (room := self._rooms.get(key)) is None:
+                room = self._rooms[key] = _Accumulator(thermostat.name)
+            room.name = thermostat.name
+            if (group := self._groups.get(group_key)) is None:
+                group = self._groups[group_key] = _Accumulator(thermostat.group_name)
+            group.name = thermostat.group_name
+
+            previous = self._readings.get(key)
+            self._readings[key] = _Reading(timestamp, thermostat, group_key)
+            if previous is not None:
+                self._add_interval(
+                    previous,
+                    timestamp,
+                    (
+                        room,
+                        self._groups.get(previous.group_key, group),
+                        account_totals,
+                        self._total,
+                    ),
+                )
+
+    def _add_interval(
+        self,
+        previous: _Reading,
+        timestamp: float,
+        accumulators: tuple[_Accumulator, ...],
+    ) -> None:
+        """Add the interval since ``previous`` to ``accumulators``."""
+        seconds = timestamp - previous.timestamp
+        if seconds <= 0 or (self._max_gap is not None and seconds > self._max_gap):
+            return
+        heating_seconds = seconds if previous.heating else 0.0
+        kwh = heating_seconds * previous.watt / _WATT_SECONDS_PER_KWH
+        cost = kwh * previous.kwh_charge
+        for accumulator in accumulators:
+            accumulator.add(kwh, cost, heating_seconds, seconds)
+
+    async def async_update(
+        self, api, *args, account: Optional[str] = None
+    ) -> dict[str, Thermostat]:
+        """Add and return ``api.async_get_current_thermostats(*args)``."""
+        thermostats = await api.async_get_current_thermostats(*args)
+        self.update(thermostats, account=account)
+        return thermostats
+
+    @property
+    def total(self) -> EnergyTotals:
+        """Totals over all accounts."""
+        return self._total.totals()
+
+    def room(self, serialnumber: str, account: Optional[str] = None) -> EnergyTotals:
+        """Return the totals of one thermostat."""
+        return self._rooms[(account, serialnumber)].totals()
+
+    def group(self, group_id: int, account: Optional[str] = None) -> EnergyTotals:
+        """Return the totals of one group."""
+        return self._groups[(account, group_id)].totals()
+
+    def account(self, account: Optional[str] = None) -> EnergyTotals:
+        """Return the totals of one account."""
+        return self._accounts[account].totals()
+
+    def rooms(self) -> dict[tuple[Optional[str], str], EnergyTotals]:
+        """Return the totals of every thermostat keyed by account and serial."""
+        return {key: totals.totals() for key, totals in self._rooms.items()}
+
+    def groups(self) -> dict[tuple[Optional[str], int], EnergyTotals]:
+        """Return the totals of every group keyed by account and group id."""
+        return {key: totals.totals() for key, totals in self._groups.items()}
+
+    def accounts(self) -> dict[Optional[str], EnergyTotals]:
+        """Return the totals of every account."""
+        return {key: totals.totals() for key, totals in self._accounts.items()}
@@ -0,0 +1,32 @@
+"""Exceptions raised by aioschluter."""
+
+
+class ApiError(Exception):
+    """Raised when Schluter API request ended in error."""
+
+    def __init__(self, status) -> None:
+        """Initialize."""
+        super().__init__(status)
+        self.status = status
+
+
+class InvalidUserPasswordError(Exception):
+    """Raise when Username is incorrect."""
+
+    def __init__(self, status: str) -> None:
+        """Initialize."""
+        super().__init__(status)
+        self.status = status
+
+
+class InvalidSessionIdError(Exception):
+    """Raise when the Schluter Session Id is missing."""
+
+    def __init__(self, status: str) -> None:
+        """Initialize."""
+        super().__init__(status)
+        self.status = status
+
+
+class CircuitOpenError(ApiError):
+    """Raised when requests are rejected while the Schluter API is degraded."""
@@ -0,0 +1,193 @@
+"""Poll the thermostats of many Schluter accounts concurrently."""
+
+import asyncio
+import logging
+from collections.abc import AsyncIterator, Iterable, Mapping
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Any, Optional, Union
+
+from aiohttp import ClientSession, TCPConnector
+
+from .api import SchluterApi
+from .const import API_BASE_URL
+from .ratelimit import RateLimiter
+from .session import DEFAULT_SESSION_TTL, SchluterSessionManager
+from .store import SessionStore
+from .transport import CircuitBreaker, EndpointPolicy, Transport
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONCURRENCY = 10
+DEFAULT_LIMIT_PER_HOST = 10
+
+
+@dataclass(frozen=True)
+class FleetResult:
+    """Outcome of polling a single account."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    username: str
+    thermostats: Optional[dict[str, Any]] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def success(self) -> bool:
+        """Return True if the thermostats were retrieved."""
+        return self.error is None
+
+
+class SchluterFleet:
+    """Fan out thermostat requests over many accounts with bounded concurrency."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        credentials: Union[Mapping[str, str], Iterable[tuple[str, str]]],
+        session: Optional[ClientSession] = None,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        limit_per_host: Optional[int] = None,
+        timeout: Optional[float] = None,
+        session_ttl: timedelta = DEFAULT_SESSION_TTL,
+        base_url: str = API_BASE_URL,
+        policies: Optional[Mapping[str, EndpointPolicy]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        session_store: Optional[SessionStore] = None,
+        conditional: bool = False,
+    ):
+        """Initialize.
+
+        ``credentials`` maps usernames to passwords. When no ``session`` is
+        given, one is created with a connector capped at ``limit_per_host``
+        connections, 10 by default, and closed again by ``async_close``; an
+        injected ``session`` keeps its own limits, so ``limit_per_host`` is
+        rejected with it. All accounts share one transport, so
+        ``circuit_breaker`` trips and ``rate_limiter`` throttles for the whole
+        fleet. With a ``session_store`` session ids are reused across restarts
+        instead of logging every account in again. ``conditional`` enables
+        conditional thermostat requests for every account.
+        """
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        if session is not None and limit_per_host is not None:
+            raise ValueError("limit_per_host only applies to a session of the fleet")
+        if isinstance(credentials, Mapping):
+            credentials = credentials.items()
+        self._credentials: dict[str, str] = dict(credentials)
+        self._owns_session = session is None
+        self._limit_per_host = (
+            DEFAULT_LIMIT_PER_HOST if limit_per_host is None else limit_per_host
+        )
+        self._session = session
+        self._max_concurrency = max_concurrency
+        self._timeout = timeout
+        self._session_ttl = session_ttl
+        self._base_url = base_url
+        self._policies = policies
+        self._circuit_breaker = circuit_breaker
+        self._rate_limiter = rate_limiter
+        self._session_store = session_store
+        self._conditional = conditional
+        self._transport: Optional[Transport] = None
+        self._managers: dict[str, SchluterSessionManager] = {}
+
+    @property
+    def usernames(self) -> list[str]:
+        """Usernames of all accounts in the fleet."""
+        return list(self._credentials)
+
+    @property
+    def session(self) -> ClientSession:
+        """Client session shared by all accounts."""
+        if self._session is None:
+            self._session = ClientSession(
+                connector=TCPConnector(limit_per_host=self._limit_per_host)
+            )
+        return self._session
+
+    @property
+    def transport(self) -> Transport:
+        """Transport shared by all accounts."""
+        if self._transport is None:
+            self._transport = Transport(
+                self.session,
+                self._policies,
+                self._circuit_breaker,
+                self._rate_limiter,
+            )
+        return self._transport
+
+    def manager(self, username: str) -> SchluterSessionManager:
+        """Return the session manager used for an account."""
+        if username not in self._credentials:
+            raise KeyError(username)
+        if username not in self._managers:
+            self._managers[username] = SchluterSessionManager(
+                SchluterApi(
+                    self.session,
+                    base_url=self._base_url,
+                    transport=self.transport,
+                    conditional=self._conditional,
+                ),
+                username,
+                self._credentials[username],
+                ttl=self._session_ttl,
+                store=self._session_store,
+            )
+        return self._managers[username]
+
+    def api(self, username: str) -> SchluterApi:
+        """Return the SchluterApi instance used for an account."""
+        return self.manager(username).api
+
+    async def _async_poll_account(
+        self, username: str, semaphore: asyncio.Semaphore
+    ) -> FleetResult:
+        async with semaphore:
+            try:
+                thermostats = await asyncio.wait_for(
+                    self.manager(username).async_get_current_thermostats(),
+                    self._timeout,
+                )
+            except Exception as error:  # pylint: disable=broad-except
+                _LOGGER.debug("Polling %s failed: %s", username, error)
+                return FleetResult(username, error=error)
+        return FleetResult(username, thermostats=thermostats)
+
+    async def async_poll(self) -> AsyncIterator[FleetResult]:
+        """Poll every account and yield the results as they complete."""
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        tasks = [
+            asyncio.ensure_future(self._async_poll_account(username, semaphore))
+            for username in self._credentials
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def async_poll_all(self) -> dict[str, FleetResult]:
+        """Poll every account and return all results keyed by username."""
+        return {result.username: result async for result in self.async_poll()}
+
+    async def async_close(self) -> None:
+        """Close the client session if the fleet created it."""
+        if self._owns_session and self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._transport = None
+            self._managers.clear()
+
+    async def __aenter__(self) -> "SchluterFleet":
+        """Enter the async context."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the fleet on exit."""
+        await self.async_close()
@@ -0,0 +1,311 @@
+"""Recent thermostat readings kept in fixed-size ring buffers."""
+
+import math
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from operator import mul, sub
+from typing import Optional
+
+from .thermostat import Thermostat
+
+DEFAULT_CAPACITY = 1440
+
+METRICS = ("temperature", "set_point_temp", "is_heating", "load_measured_watt")
+
+_SECONDS_PER_HOUR = 3600.0
+_WATT_PER_KILOWATT = 1000.0
+
+
+class RingBuffer:
+    """Fixed-size buffer of numbers backed by an ``array``.
+
+    Once full, every append overwrites the oldest value. Values are stored
+    unboxed, so a buffer of doubles costs eight bytes per sample.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, typecode: str, capacity: int):
+        """Initialize."""
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._data = array(typecode, bytes(array(typecode).itemsize * capacity))
+        self._capacity = capacity
+        self._start = 0
+        self._length = 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of values kept."""
+        return self._capacity
+
+    def __len__(self) -> int:
+        """Return the number of values kept."""
+        return self._length
+
+    @property
+    def last(self):
+        """The newest value."""
+        if not self._length:
+            raise IndexError("The buffer is empty")
+        return self._data[(self._start + self._length - 1) % self._capacity]
+
+    def append(self, value) -> None:
+        """Add a value, dropping the oldest one if the buffer is full."""
+        end = self._start + self._length
+        if self._length < self._capacity:
+            self._data[end % self._capacity] = value
+            self._length += 1
+        else:
+            self._data[self._start] = value
+            self._start = (self._start + 1) % self._capacity
+
+    def clear(self) -> None:
+        """Drop all values."""
+        self._start = 0
+        self._length = 0
+
+    def _segments(self) -> tuple[array, array]:
+        if (end := self._start + self._length) <= self._capacity:
+            return self._data[self._start : end], self._data[:0]
+        return self._data[self._start :], self._data[: end - self._capacity]
+
+    def to_array(self, start: int = 0, stop: Optional[int] = None) -> array:
+        """Return the values from oldest to newest, sliced by position."""
+        head, tail = self._segments()
+        return (head + tail)[start:stop]
+
+    def bisect_left(self, value) -> int:
+        """Return the position of ``value`` in an ascending buffer."""
+        head, tail = self._segments()
+        if not tail or (head and value <= head[-1]):
+            return bisect_left(head, value)
+        return len(head) + bisect_left(tail, value)
+
+    def bisect_right(self, value) -> int:
+        """Return the position after ``value`` in an ascending buffer."""
+        head, tail = self._segments()
+        if not tail or (head and value < head[-1]):
+            return bisect_right(head, value)
+        return len(head) + bisect_right(tail, value)
+
+
+# pylint: disable-next=consider-alternative-union-syntax
+def _mean(values: array) -> Optional[float]:
+    return math.fsum(values) / len(values) if values else None
+
+
+@dataclass(frozen=True)
+class HistoryWindow:
+    """Readings of one thermostat within a time range, one array per metric.
+
+    A reading is assumed to hold until the next one, so the aggregates
+    weigh each sample by the time until its successor. ``is_heating`` holds
+    the fraction of time spent heating, which is 0 or 1 for raw readings.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    timestamps: array
+    temperature: array
+    set_point_temp: array
+    is_heating: array
+    load_measured_watt: array
+    kwh_charge: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return len(self.timestamps)
+
+    def _metric(self, metric: str) -> array:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown metric {metric!r}")
+        return getattr(self, metric)
+
+    def _durations(self) -> array:
+        timestamps = self.timestamps
+        return array("d", map(sub, timestamps[1:], timestamps[:-1]))
+
+    def mean(self, metric: str) -> Optional[float]:
+        """Return the arithmetic mean of a metric."""
+        return _mean(self._metric(metric))
+
+    def minimum(self, metric: str) -> Optional[float]:
+        """Return the smallest value of a metric."""
+        values = self._metric(metric)
+        return min(values) if values else None
+
+    def maximum(self, metric: str) -> Optional[float]:
+        """Return the largest value of a metric."""
+        values = self._metric(metric)
+        return max(values) if values else None
+
+    def duty_cycle(self) -> Optional[float]:
+        """Return the fraction of the covered time spent heating."""
+        durations = self._durations()
+        if not (total := math.fsum(durations)):
+            return None
+        return math.fsum(map(mul, durations, self.is_heating)) / total
+
+    def energy_kwh(self) -> float:
+        """Estimate the energy used while heating from the measured load."""
+        heating_seconds = map(mul, self._durations(), self.is_heating)
+        watt_seconds = math.fsum(map(mul, heating_seconds, self.load_measured_watt))
+        return watt_seconds / _SECONDS_PER_HOUR / _WATT_PER_KILOWATT
+
+    def energy_cost(self) -> Optional[float]:
+        """Estimate the cost of the energy used at the latest ``kwh_charge``."""
+        if self.kwh_charge is None:
+            return None
+        return self.energy_kwh() * self.kwh_charge
+
+    def downsample(self, interval: float) -> "HistoryWindow":
+        """Return one sample per ``interval`` seconds holding the means.
+
+        Empty intervals are skipped. The timestamp of a sample is the start
+        of its interval.
+        """
+        if interval <= 0:
+            raise ValueError("interval must be positive")
+        timestamps = self.timestamps
+        result = HistoryWindow(
+            array("d"), array("d"), array("d"), array("d"), array("d"), self.kwh_charge
+        )
+        start = 0
+        while start < len(timestamps):
+            bucket = math.floor(timestamps[start] / interval) * interval
+            stop = bisect_left(timestamps, bucket + interval, start)
+            result.timestamps.append(bucket)
+            for metric in METRICS:
+                getattr(result, metric).append(_mean(getattr(self, metric)[start:stop]))
+            start = stop
+        return result
+
+
+class ThermostatSeries:
+    """Ring buffers with the recent readings of one thermostat."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Initialize."""
+        self._timestamps = RingBuffer("d", capacity)
+        self._temperature = RingBuffer("f", capacity)
+        self._set_point_temp = RingBuffer("f", capacity)
+        self._is_heating = RingBuffer("B", capacity)
+        self._load_measured_watt = RingBuffer("f", capacity)
+        self._kwh_charge: Optional[float] = None
+
+    def __len__(self) -> int:
+        """Return the number of samples kept."""
+        return len(self._timestamps)
+
+    def _buffers(self) -> Iterator[RingBuffer]:
+        yield self._timestamps
+        yield self._temperature
+        yield self._set_point_temp
+        yield self._is_heating
+        yield self._load_measured_watt
+
+    def append(self, timestamp: float, thermostat: Thermostat) -> None:
+        """Record the readings of ``thermostat`` taken at ``timestamp``.
+
+        Timestamps must not decrease; a reading older than the newest one
+        kept is ignored.
+        """
+        timestamps = self._timestamps
+        if len(timestamps) and timestamp < timestamps.last:
+            return
+        timestamps.append(timestamp)
+        self._temperature.append(thermostat.temperature)
+        self._set_point_temp.append(thermostat.set_point_temp)
+        self._is_heating.append(bool(thermostat.is_heating))
+        self._load_measured_watt.append(thermostat.load_measured_watt or 0)
+        if thermostat.kwh_charge is not None:
+            self._kwh_charge = thermostat.kwh_charge
+
+    def clear(self) -> None:
+        """Drop all readings."""
+        for buffer in self._buffers():
+            buffer.clear()
+
+    def window(
+        self, start: Optional[float] = None, end: Optional[float] = None
+    ) -> HistoryWindow:
+        """Return the readings taken from ``start`` up to and including ``end``."""
+        timestamps = self._timestamps
+        first = 0 if start is None else timestamps.bisect_left(start)
+        last = None if end is None else timestamps.bisect_right(end)
+        return HistoryWindow(
+            timestamps.to_array(first, last),
+            array("d", self._temperature.to_array(first, last)),
+            array("d", self._set_point_temp.to_array(first, last)),
+            array("d", self._is_heating.to_array(first, last)),
+            array("d", self._load_measured_watt.to_array(first, last)),
+            self._kwh_charge,
+        )
+
+
+class ThermostatHistory:
+    """Keep the recent readings of every thermostat, keyed by serial number."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        """Initialize.
+
+        ``capacity`` is the number of readings kept per thermostat; with one
+        poll a minute the default covers a day.
+        """
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self._capacity = capacity
+        self._series: dict[str, ThermostatSeries] = {}
+
+    @property
+    def serial_numbers(self) -> list[str]:
+        """Serial numbers with recorded readings."""
+        return list(self._series)
+
+    def __contains__(self, serialnumber: object) -> bool:
+        """Return True if readings of ``serialnumber`` are kept."""
+        return serialnumber in self._series
+
+    def series(self, serialnumber: str) -> ThermostatSeries:
+        """Return the readings of one thermostat."""
+        return self._series[serialnumber]
+
+    def update(
+        self,
+        thermostats: Mapping[str, Thermostat],
+        timestamp: Optional[float] = None,
+    ) -> None:
+        """Record a snapshot taken at ``timestamp``, by default now."""
+        if timestamp is None:
+            timestamp = time.time()
+        for serial, thermostat in thermostats.items():
+            if (series := self._series.get(serial)) is None:
+                series = self._series[serial] = ThermostatSeries(self._capacity)
+            series.append(timestamp, thermostat)
+
+    async def async_update(self, api, *args) -> dict[str, Thermostat]:
+        """Record and return ``api.async_get_current_thermostats(*args)``."""
+        thermostats = await api.async_get_current_thermostats(*args)
+        self.update(thermostats)
+        return thermostats
+
+    def window(
+        self,
+        serialnumber: str,
+        start: Optional[float] = None,
+        end: Optional[float] = None,
+    ) -> HistoryWindow:
+        """Return the readings of one thermostat within a time range."""
+        return self._series[serialnumber].window(start, end)
+
+    def remove(self, serialnumber: str) -> None:
+        """Forget the readings of a thermostat."""
+        self._series.pop(serialnumber, None)
@@ -0,0 +1,123 @@
+"""In-process request metrics for SchluterApi."""
+
+import math
+from collections import deque
+from typing import Any, Optional
+
+from .observer import RequestEvent
+
+DEFAULT_WINDOW = 1024
+PERCENTILES = (50, 95, 99)
+
+
+class RollingHistogram:
+    """Keep the most recent ``window`` samples and report their percentiles."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """Initialize."""
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, value: float) -> None:
+        """Add a sample, dropping the oldest one if the window is full."""
+        self._samples.append(value)
+
+    def percentile(self, percent: float) -> Optional[float]:
+        """Return the nearest-rank percentile, None if there are no samples."""
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        rank = max(1, math.ceil(percent / 100 * len(ordered)))
+        return ordered[rank - 1]
+
+    def as_dict(self) -> dict[str, Optional[float]]:
+        """Return count, mean and percentiles of the window."""
+        if not self._samples:
+            return {"count": 0, "mean": None, **{f"p{p}": None for p in PERCENTILES}}
+        ordered = sorted(self._samples)
+        result: dict[str, Optional[float]] = {
+            "count": len(ordered),
+            "mean": sum(ordered) / len(ordered),
+            "max": ordered[-1],
+        }
+        for percent in PERCENTILES:
+            rank = max(1, math.ceil(percent / 100 * len(ordered)))
+            result[f"p{percent}"] = ordered[rank - 1]
+        return result
+
+
+class _EndpointMetrics:
+    """Counters and latencies of a single endpoint."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, window: int):
+        """Initialize."""
+        self.latency = RollingHistogram(window)
+        self.outcomes: deque[bool] = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.payload_bytes = 0
+        self.statuses: dict[Any, int] = {}
+
+    def add(self, event: RequestEvent) -> None:
+        """Record an event."""
+        self.requests += 1
+        self.retries += event.retries
+        if event.payload_size:
+            self.payload_bytes += event.payload_size
+        status = event.status if event.status is not None else "error"
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        if not (success := event.success):
+            self.errors += 1
+        self.outcomes.append(success)
+        self.latency.add(event.latency)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Export the metrics."""
+        failures = self.outcomes.count(False)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "payload_bytes": self.payload_bytes,
+            "error_rate": failures / len(self.outcomes) if self.outcomes else 0.0,
+            "statuses": dict(self.statuses),
+            "latency": self.latency.as_dict(),
+        }
+
+
+class MetricsAggregator:
+    """Request observer aggregating latency and errors per endpoint.
+
+    Register it with ``SchluterApi.add_observer``. Totals count every request
+    seen, while latency percentiles and the error rate cover the most recent
+    ``window`` requests of each endpoint.
+    """
+
+    def __init__(self, window: int = DEFAULT_WINDOW):
+        """Initialize."""
+        self._window = window
+        self._endpoints: dict[str, _EndpointMetrics] = {}
+
+    def __call__(self, event: RequestEvent) -> None:
+        """Record a request event."""
+        if (metrics := self._endpoints.get(event.endpoint)) is None:
+            metrics = self._endpoints[event.endpoint] = _EndpointMetrics(self._window)
+        metrics.add(event)
+
+    def reset(self) -> None:
+        """Forget all recorded requests."""
+        self._endpoints.clear()
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Export the metrics of every endpoint."""
+        return {
+            endpoint: metrics.as_dict() for endpoint, metrics in self._endpoints.items()
+        }
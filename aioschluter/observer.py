@@ -0,0 +1,30 @@
+"""Events reported to request observers."""
+
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Optional
+
+from .const import HTTP_OK
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    """A single request to the Schluter API."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    endpoint: str
+    method: str
+    status: Optional[int]
+    latency: float
+    payload_size: Optional[int] = None
+    retries: int = 0
+    error: Optional[BaseException] = None
+
+    @property
+    def success(self) -> bool:
+        """Return True if the request completed with HTTP 200."""
+        return self.error is None and self.status == HTTP_OK
+
+
+RequestObserver = Callable[[RequestEvent], None]
@@ -0,0 +1,158 @@
+"""Show acknowledged writes before the next poll confirms them."""
+
+import logging
+import time
+from collections.abc import Callable, Mapping
+from typing import Any, Optional
+
+from .api import SchluterApi
+from .thermostat import Thermostat, to_degrees
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CONFIRM_TIMEOUT = 120.0
+
+RollbackListener = Callable[[str, str, Any, Any], Any]
+
+
+class _PendingValue:
+    """A written value waiting for a poll to confirm it."""
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("value", "expires_at")
+
+    def __init__(self, value: Any, expires_at: float):
+        """Initialize."""
+        self.value = value
+        self.expires_at = expires_at
+
+
+class OptimisticState:
+    """Apply acknowledged writes to the local thermostats right away.
+
+    Written values are overlaid on the polled thermostats and marked as
+    pending. A poll showing the written value confirms it; once
+    ``confirm_timeout`` seconds pass without confirmation the value is
+    rolled back to what the server reports and ``on_rollback`` is called
+    with the serial number, attribute, written and reported value.
+
+    ``api`` may be a SchluterApi or anything with the same write methods,
+    such as a CachedSchluterApi or a DebouncedWriter.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        api: SchluterApi,
+        confirm_timeout: float = DEFAULT_CONFIRM_TIMEOUT,
+        on_rollback: Optional[RollbackListener] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize."""
+        self._api = api
+        self._confirm_timeout = confirm_timeout
+        self._on_rollback = on_rollback
+        self._clock = clock
+        self._polled: dict[str, Thermostat] = {}
+        self._thermostats: dict[str, Thermostat] = {}
+        self._pending: dict[str, dict[str, _PendingValue]] = {}
+
+    @property
+    def thermostats(self) -> dict[str, Thermostat]:
+        """The polled thermostats with the pending writes applied."""
+        return self._thermostats
+
+    @property
+    def pending(self) -> dict[str, dict[str, Any]]:
+        """Unconfirmed values keyed by serial number and attribute."""
+        return {
+            serial: {name: pending.value for name, pending in values.items()}
+            for serial, values in self._pending.items()
+        }
+
+    def is_pending(self, serialnumber: str) -> bool:
+        """Return True if a write to ``serialnumber`` awaits confirmation."""
+        return serialnumber in self._pending
+
+    def _apply(self, serialnumber: str) -> None:
+        if (thermostat := self._polled.get(serialnumber)) is None:
+            return
+        if values := self._pending.get(serialnumber):
+            thermostat = thermostat.replace(
+                **{name: pending.value for name, pending in values.items()}
+            )
+        self._thermostats[serialnumber] = thermostat
+
+    def _set_pending(self, serialnumber: str, **values: Any) -> None:
+        expires_at = self._clock() + self._confirm_timeout
+        pending = self._pending.setdefault(serialnumber, {})
+        for name, value in values.items():
+            pending[name] = _PendingValue(value, expires_at)
+        self._apply(serialnumber)
+
+    def update(self, thermostats: Mapping[str, Thermostat]) -> dict[str, Thermostat]:
+        """Store a polled snapshot, confirm or roll back pending writes.
+
+        Return the thermostats with the remaining pending writes applied.
+        """
+        now = self._clock()
+        self._polled = dict(thermostats)
+        self._thermostats = dict(thermostats)
+        for serial in list(self._pending):
+            values = self._pending[serial]
+            thermostat = self._polled.get(serial)
+            for name in list(values):
+                pending = values[name]
+                actual = None if thermostat is None else getattr(thermostat, name)
+                if actual == pending.value:
+                    _LOGGER.debug("%s of %s confirmed", name, serial)
+                    del values[name]
+                elif now >= pending.expires_at:
+                    _LOGGER.info(
+                        "%s of %s was not confirmed, rolling back %s to %s",
+                        name,
+                        serial,
+                        pending.value,
+                        actual,
+                    )
+                    del values[name]
+                    if self._on_rollback is None:
+                        continue
+                    try:
+                        self._on_rollback(serial, name, pending.value, actual)
+                    except Exception:  # pylint: disable=broad-except
+                        _LOGGER.exception("Error in rollback listener of %s", serial)
+            if not values:
+                del self._pending[serial]
+            self._apply(serial)
+        return self._thermostats
+
+    async def async_update(self, api, *args) -> dict[str, Thermostat]:
+        """Return the optimistic view of a fresh thermostat list.
+
+        ``args`` are passed on to ``api.async_get_current_thermostats``.
+        """
+        return self.update(await api.async_get_current_thermostats(*args))
+
+    async def async_set_temperature(self, sessionid, serialnumber, temperature) -> bool:
+        """Set the temperature and show it as soon as it is acknowledged."""
+        success = await self._api.async_set_temperature(
+            sessionid, serialnumber, temperature
+        )
+        if success:
+            temperature = to_degrees(int(temperature * 100))
+            self._set_pending(
+                serialnumber, set_point_temp=temperature, manual_temp=temperature
+            )
+        return success
+
+    async def async_set_regulation_mode(self, sessionid, serialnumber, mode) -> bool:
+        """Set the regulation mode and show it as soon as it is acknowledged."""
+        success = await self._api.async_set_regulation_mode(
+            sessionid, serialnumber, mode
+        )
+        if success:
+            self._set_pending(serialnumber, regulation_mode=mode)
+        return success
@@ -0,0 +1,195 @@
+"""Token bucket rate limiting shared between SchluterApi instances."""
+
+import asyncio
+import heapq
+import itertools
+import time
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .const import ENDPOINT_AUTH, ENDPOINT_GET_THERMOSTATS, ENDPOINT_SET_THERMOSTAT
+
+PRIORITY_USER = 0
+PRIORITY_BACKGROUND = 10
+
+TOTAL_BUCKET = "total"
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """Sustained ``rate`` in requests per second with bursts up to ``burst``."""
+
+    rate: float
+    burst: int = 1
+
+
+DEFAULT_LIMITS: dict[str, RateLimit] = {
+    ENDPOINT_AUTH: RateLimit(rate=1.0, burst=5),
+    ENDPOINT_GET_THERMOSTATS: RateLimit(rate=5.0, burst=10),
+    ENDPOINT_SET_THERMOSTAT: RateLimit(rate=5.0, burst=10),
+}
+
+DEFAULT_PRIORITIES: dict[str, int] = {
+    ENDPOINT_AUTH: PRIORITY_USER,
+    ENDPOINT_GET_THERMOSTATS: PRIORITY_BACKGROUND,
+    ENDPOINT_SET_THERMOSTAT: PRIORITY_USER,
+}
+
+
+class TokenBucket:
+    """Token bucket serving waiters by priority, then in arrival order."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, limit: RateLimit, clock: Callable[[], float] = time.monotonic):
+        """Initialize."""
+        if limit.rate <= 0 or limit.burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self._rate = limit.rate
+        self._capacity = float(limit.burst)
+        self._clock = clock
+        self._tokens = self._capacity
+        self._updated = clock()
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self.acquired = 0
+        self.delayed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Number of requests waiting for a token."""
+        return sum(not waiter.done() for _, _, waiter in self._waiters)
+
+    @property
+    def tokens(self) -> float:
+        """Tokens currently available."""
+        self._refill()
+        return self._tokens
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self._capacity, self._tokens + (now - self._updated) * self._rate
+        )
+        self._updated = now
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._refill()
+        while self._waiters:
+            waiter = self._waiters[0][2]
+            if waiter.done():
+                heapq.heappop(self._waiters)
+                continue
+            if self._tokens < 1:
+                break
+            heapq.heappop(self._waiters)
+            self._tokens -= 1
+            waiter.set_result(None)
+        if self._waiters and self._timer is None:
+            delay = (1 - self._tokens) / self._rate
+            self._timer = asyncio.get_running_loop().call_later(delay, self._dispatch)
+
+    async def async_acquire(self, priority: int = PRIORITY_BACKGROUND) -> float:
+        """Wait for a token and return the seconds spent waiting."""
+        self.acquired += 1
+        self._refill()
+        if not self._waiters and self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+
+        start = self._clock()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._sequence), waiter))
+        if self._timer is None:
+            self._dispatch()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                # The token was granted as we were cancelled, hand it back.
+                self._tokens += 1
+                self._dispatch()
+            raise
+        waited = self._clock() - start
+        self.delayed += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+        return waited
+
+    def as_dict(self) -> dict[str, Any]:
+        """Export the queue and wait metrics."""
+        return {
+            "tokens": self.tokens,
+            "queue_depth": self.queue_depth,
+            "acquired": self.acquired,
+            "delayed": self.delayed,
+            "total_wait": self.total_wait,
+            "max_wait": self.max_wait,
+            "mean_wait": self.total_wait / self.delayed if self.delayed else 0.0,
+        }
+
+
+class RateLimiter:
+    """Rate limit requests per endpoint and, optionally, in total.
+
+    Share one instance between the transports of all SchluterApi instances
+    to keep the whole process within its budget. Requests waiting for the
+    same bucket are served by priority. Every endpoint has a bucket of its
+    own, so user-initiated writes only overtake background polls in the
+    ``total`` bucket they share.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        limits: Optional[Mapping[str, RateLimit]] = None,
+        total: Optional[RateLimit] = None,
+        priorities: Optional[Mapping[str, int]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize.
+
+        ``limits`` replace DEFAULT_LIMITS per endpoint; endpoints without a
+        limit are not throttled individually. ``total`` limits all endpoints
+        together.
+        """
+        limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self._buckets = {
+            endpoint: TokenBucket(limit, clock) for endpoint, limit in limits.items()
+        }
+        self._total = TokenBucket(total, clock) if total is not None else None
+        self._priorities = {**DEFAULT_PRIORITIES, **(priorities or {})}
+
+    def priority(self, endpoint: str) -> int:
+        """Return the default priority of an endpoint."""
+        return self._priorities.get(endpoint, PRIORITY_BACKGROUND)
+
+    async def async_acquire(
+        self, endpoint: str, priority: Optional[int] = None
+    ) -> float:
+        """Wait until a request to ``endpoint`` may be sent; return the wait."""
+        if priority is None:
+            priority = self.priority(endpoint)
+        waited = 0.0
+        if (bucket := self._buckets.get(endpoint)) is not None:
+            waited += await bucket.async_acquire(priority)
+        if self._total is not None:
+            waited += await self._total.async_acquire(priority)
+        return waited
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Export the metrics of every bucket."""
+        result = {
+            endpoint: bucket.as_dict() for endpoint, bucket in self._buckets.items()
+        }
+        if self._total is not None:
+            result[TOTAL_BUCKET] = self._total.as_dict()
+        return result
@@ -0,0 +1,187 @@
+"""Poll the thermostats at an adaptive interval."""
+
+import asyncio
+import inspect
+import logging
+import random
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from typing import Any, Optional
+
+from aiohttp import ClientError
+
+from .exceptions import ApiError
+from .thermostat import Thermostat
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 60.0
+DEFAULT_ACTIVE_INTERVAL = 15.0
+DEFAULT_MAX_INTERVAL = 900.0
+DEFAULT_JITTER = 0.1
+DEFAULT_BACKOFF_FACTOR = 2.0
+DEFAULT_WRITE_CONFIRM_WINDOW = 120.0
+
+BACKOFF_ERRORS = (ApiError, ClientError, asyncio.TimeoutError)
+
+PollFunction = Callable[[], Awaitable[Mapping[str, Thermostat]]]
+PollListener = Callable[[Mapping[str, Thermostat]], Any]
+
+
+class PollScheduler:
+    """Run a poll function in a loop with jitter, backoff and active intervals.
+
+    The scheduler polls every ``interval`` seconds. While a thermostat is
+    heating or a write waits for confirmation it polls every
+    ``active_interval`` seconds instead. Every failed poll multiplies the
+    interval by ``backoff_factor`` up to ``max_interval``, every successful
+    one divides it again until the normal interval is reached.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        poll: PollFunction,
+        listener: Optional[PollListener] = None,
+        interval: float = DEFAULT_INTERVAL,
+        active_interval: float = DEFAULT_ACTIVE_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        jitter: float = DEFAULT_JITTER,
+        backoff_factor: float = DEFAULT_BACKOFF_FACTOR,
+        write_confirm_window: float = DEFAULT_WRITE_CONFIRM_WINDOW,
+    ):
+        """Initialize.
+
+        ``poll`` is usually ``SchluterSessionManager.async_get_current_thermostats``
+        or a ``functools.partial`` of ``SchluterApi.async_get_current_thermostats``.
+        ``listener`` is called, and awaited if it returns an awaitable, with
+        every successful result.
+        """
+        if not 0 <= jitter < 1:
+            raise ValueError("jitter must be between 0 and 1")
+        self._poll = poll
+        self._listener = listener
+        self._interval = interval
+        self._active_interval = min(active_interval, interval)
+        self._max_interval = max(max_interval, interval)
+        self._jitter = jitter
+        self._backoff_factor = backoff_factor
+        self._write_confirm_window = write_confirm_window
+        self._backoff = 1.0
+        self._heating = False
+        self._active_until = 0.0
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._last_error: Optional[BaseException] = None
+
+    @property
+    def running(self) -> bool:
+        """Return True while the polling loop runs."""
+        return self._task is not None and not self._task.done()
+
+    @property
+    def task(self) -> Optional[asyncio.Task]:
+        """The background task running the polling loop, if started."""
+        return self._task
+
+    @property
+    def last_error(self) -> Optional[BaseException]:
+        """Error of the last poll, None if it succeeded."""
+        return self._last_error
+
+    @property
+    def is_active(self) -> bool:
+        """Return True while the shorter active interval applies."""
+        return self._heating or time.monotonic() < self._active_until
+
+    def next_interval(self) -> float:
+        """Return the delay before the next poll, including jitter."""
+        base = self._active_interval if self.is_active else self._interval
+        delay = min(base * self._backoff, self._max_interval)
+        if self._jitter:
+            delay *= random.uniform(1 - self._jitter, 1 + self._jitter)  # nosec
+        return delay
+
+    def mark_write_pending(self, window: Optional[float] = None) -> None:
+        """Poll at the active interval until a write had time to show up."""
+        if window is None:
+            window = self._write_confirm_window
+        self._active_until = max(self._active_until, time.monotonic() + window)
+        self.request_refresh()
+
+    def request_refresh(self) -> None:
+        """Cut the current wait short and poll on the next occasion."""
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def async_poll_once(self) -> Optional[Mapping[str, Thermostat]]:
+        """Poll once and update the interval; return None if the poll failed.
+
+        Errors are not raised but logged, kept in ``last_error`` and backed
+        off from. Errors other than BACKOFF_ERRORS, such as a rejected
+        session or password, are logged as errors since retrying alone will
+        not fix them. An error raised by the listener is logged and does not
+        affect the interval.
+        """
+        try:
+            thermostats = await self._poll()
+        except Exception as error:  # pylint: disable=broad-except
+            self._last_error = error
+            self._backoff = min(
+                self._backoff * self._backoff_factor,
+                self._max_interval / self._active_interval,
+            )
+            if isinstance(error, BACKOFF_ERRORS):
+                _LOGGER.debug(
+                    "Poll failed (%s), backing off to x%.1f", error, self._backoff
+                )
+            else:
+                _LOGGER.error(
+                    "Poll failed (%r), backing off to x%.1f", error, self._backoff
+                )
+            return None
+        self._last_error = None
+        self._backoff = max(1.0, self._backoff / self._backoff_factor)
+        self._heating = any(
+            thermostat.is_heating for thermostat in thermostats.values()
+        )
+        if self._listener is not None:
+            try:
+                result = self._listener(thermostats)
+                if inspect.isawaitable(result):
+                    await result
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in poll listener")
+        return thermostats
+
+    async def _async_run(self, wakeup: asyncio.Event) -> None:
+        while True:
+            wakeup.clear()
+            await self.async_poll_once()
+            try:
+                await asyncio.wait_for(wakeup.wait(), self.next_interval())
+            except asyncio.TimeoutError:
+                pass
+
+    def start(self) -> None:
+        """Start polling in the background."""
+        if self.running:
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.ensure_future(self._async_run(self._wakeup))
+
+    async def async_stop(self) -> None:
+        """Stop polling."""
+        if self._task is None:
+            return
+        task, self._task = self._task, None
+        if task.done():
+            if (error := None if task.cancelled() else task.exception()) is not None:
+                _LOGGER.error("Polling loop had stopped with %r", error)
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
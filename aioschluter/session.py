@@ -0,0 +1,158 @@
+"""Keep a Schluter session id valid across concurrent callers."""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import datetime, timedelta
+from typing import Any, Optional, TypeVar
+
+from .api import SchluterApi
+from .exceptions import InvalidSessionIdError
+from .store import SessionStore, StoredSession
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_SESSION_TTL = timedelta(hours=1)
+DEFAULT_REFRESH_MARGIN = timedelta(minutes=5)
+
+_T = TypeVar("_T")
+
+
+class SchluterSessionManager:
+    """Authenticate on demand and share a single re-authentication."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        api: SchluterApi,
+        username: str,
+        password: str,
+        ttl: timedelta = DEFAULT_SESSION_TTL,
+        refresh_margin: timedelta = DEFAULT_REFRESH_MARGIN,
+        store: Optional[SessionStore] = None,
+    ):
+        """Initialize.
+
+        The session id is refreshed ``refresh_margin`` before ``ttl`` has
+        passed since it was issued. With a ``store`` the session id survives
+        restarts: a stored one is reused until it expires or is rejected.
+        """
+        self._api = api
+        self._username = username
+        self._password = password
+        self._ttl = ttl
+        self._refresh_margin = refresh_margin
+        self._store = store
+        self._restore_task: Optional[asyncio.Future] = None
+        self._auth_task: Optional[asyncio.Future] = None
+
+    @property
+    def api(self) -> SchluterApi:
+        """The SchluterApi used for the requests."""
+        return self._api
+
+    @property
+    def username(self) -> str:
+        """Username."""
+        return self._username
+
+    @property
+    def sessionid(self) -> Optional[str]:
+        """Current SessionId, if any."""
+        return self._api.sessionid
+
+    @property
+    def expires_at(self) -> Optional[datetime]:
+        """Time the current session is expected to expire."""
+        if self._api.sessionid_timestamp is None:
+            return None
+        return self._api.sessionid_timestamp + self._ttl
+
+    def needs_refresh(self) -> bool:
+        """Return True if the session is missing or about to expire."""
+        expires_at = self.expires_at
+        if not self._api.sessionid or expires_at is None:
+            return True
+        return datetime.now() >= expires_at - self._refresh_margin
+
+    async def _async_restore(self, store: SessionStore) -> None:
+        try:
+            stored = await store.async_load(self._username)
+        except Exception:  # pylint: disable=broad-except
+            _LOGGER.exception("Error loading session of %s", self._username)
+            return
+        if stored is None or self._api.sessionid is not None:
+            return
+        _LOGGER.debug("Reusing stored session of %s", self._username)
+        self._api.restore_session(self._username, stored.sessionid, stored.timestamp)
+
+    async def _async_authenticate(self) -> str:
+        _LOGGER.debug("Authenticating %s", self._username)
+        sessionid = await self._api.async_get_sessionid(self._username, self._password)
+        if sessionid is None:
+            raise InvalidSessionIdError("No session id was returned")
+        if self._store is not None:
+            try:
+                await self._store.async_save(
+                    self._username,
+                    StoredSession(sessionid, self._api.sessionid_timestamp),
+                )
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error storing session of %s", self._username)
+        return sessionid
+
+    def _clear_auth_task(self, task: asyncio.Future) -> None:
+        if self._auth_task is task:
+            self._auth_task = None
+
+    async def _async_reauthenticate(self, stale: Optional[str] = None) -> str:
+        """Authenticate once for all callers holding the same stale session."""
+        if self._auth_task is None:
+            if stale is not None and self._api.sessionid not in (None, stale):
+                # Another caller already replaced the rejected session.
+                return self._api.sessionid
+            self._auth_task = asyncio.ensure_future(self._async_authenticate())
+            self._auth_task.add_done_callback(self._clear_auth_task)
+        return await asyncio.shield(self._auth_task)
+
+    async def async_get_sessionid(self) -> str:
+        """Return a valid session id, authenticating if required."""
+        if self._store is not None and self._api.sessionid is None:
+            if self._restore_task is None:
+                self._restore_task = asyncio.ensure_future(
+                    self._async_restore(self._store)
+                )
+            await asyncio.shield(self._restore_task)
+        if self._auth_task is None and not self.needs_refresh():
+            return self._api.sessionid
+        return await self._async_reauthenticate()
+
+    async def async_invalidate(self) -> None:
+        """Force a new authentication on the next request."""
+        await self._async_reauthenticate(self._api.sessionid)
+
+    async def _async_call(self, func: Callable[..., Awaitable[_T]], *args: Any) -> _T:
+        sessionid = await self.async_get_sessionid()
+        try:
+            return await func(sessionid, *args)
+        except InvalidSessionIdError:
+            _LOGGER.debug("Session for %s was rejected, retrying", self._username)
+            sessionid = await self._async_reauthenticate(sessionid)
+            return await func(sessionid, *args)
+
+    async def async_get_current_thermostats(self) -> dict[str, Any]:
+        """Get the current settings for all thermostats."""
+        return await self._async_call(self._api.async_get_current_thermostats)
+
+    async def async_set_temperature(self, serialnumber, temperature) -> bool:
+        """Set the temperature for a thermostat."""
+        return await self._async_call(
+            self._api.async_set_temperature, serialnumber, temperature
+        )
+
+    async def async_set_regulation_mode(self, serialnumber, mode) -> bool:
+        """Set the regulation mode to SCHEDULE, MANUAL or AWAY."""
+        return await self._async_call(
+            self._api.async_set_regulation_mode, serialnumber, mode
+        )
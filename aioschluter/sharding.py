@@ -0,0 +1,343 @@
+"""Spread the accounts of a fleet over several worker processes."""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+from bisect import bisect
+from collections.abc import AsyncIterator, Hashable, Iterable, Mapping
+from multiprocessing.connection import Connection
+from typing import Any, Generic, Optional, TypeVar, Union
+
+from .exceptions import ApiError
+from .fleet import FleetResult, SchluterFleet
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_REPLICAS = 64
+DEFAULT_STOP_TIMEOUT = 10.0
+
+_N = TypeVar("_N", bound=Hashable)
+
+_POLL = "poll"
+_STOP = "stop"
+_RESULT = "result"
+_DONE = "done"
+
+
+def _hash(key: str) -> int:
+    digest = hashlib.md5(key.encode()).digest()  # nosec
+    return int.from_bytes(digest[:8], "big")
+
+
+class HashRing(Generic[_N]):
+    """Consistent hashing of keys onto nodes.
+
+    Every node is placed ``replicas`` times on the ring, so adding or
+    removing a node only moves the keys next to its points.
+    """
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, nodes: Iterable[_N], replicas: int = DEFAULT_REPLICAS):
+        """Initialize."""
+        points = sorted(
+            (_hash(f"{node}:{replica}"), node)
+            for node in nodes
+            for replica in range(replicas)
+        )
+        if not points:
+            raise ValueError("A hash ring needs at least one node")
+        self._hashes = [point for point, _ in points]
+        self._nodes = [node for _, node in points]
+
+    def node(self, key: str) -> _N:
+        """Return the node responsible for ``key``."""
+        position = bisect(self._hashes, _hash(key)) % len(self._hashes)
+        return self._nodes[position]
+
+
+def _dumps(message: Any) -> bytes:
+    return pickle.dumps(message, pickle.HIGHEST_PROTOCOL)
+
+
+def _portable_error(error: BaseException) -> BaseException:
+    """Return ``error`` if it survives pickling, an ApiError otherwise."""
+    try:
+        pickle.loads(_dumps(error))
+    except Exception:  # pylint: disable=broad-except
+        return ApiError(repr(error))
+    return error
+
+
+async def _async_worker(
+    conn: Connection, credentials: dict[str, str], fleet_options: dict[str, Any]
+) -> None:
+    loop = asyncio.get_running_loop()
+    async with SchluterFleet(credentials, **fleet_options) as fleet:
+        while True:
+            try:
+                command = await loop.run_in_executor(None, conn.recv)
+            except EOFError:
+                return
+            if command == _STOP:
+                return
+            _, sequence = command
+            async for result in fleet.async_poll():
+                if (error := result.error) is not None:
+                    error = _portable_error(error)
+                conn.send_bytes(
+                    _dumps(
+                        (_RESULT, sequence, result.username, result.thermostats, error)
+                    )
+                )
+            conn.send_bytes(_dumps((_DONE, sequence)))
+
+
+def _worker_main(
+    conn: Connection, credentials: dict[str, str], fleet_options: dict[str, Any]
+) -> None:
+    """Run a SchluterFleet for one shard until told to stop."""
+    try:
+        asyncio.run(_async_worker(conn, credentials, fleet_options))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        conn.close()
+
+
+def _read_messages(
+    conn: Connection, loop: asyncio.AbstractEventLoop, queue: asyncio.Queue
+) -> None:
+    """Unpickle the messages of a worker and queue them, None once it exits."""
+    while True:
+        try:
+            message = pickle.loads(conn.recv_bytes())
+        except (EOFError, OSError):
+            message = None
+        try:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+        except RuntimeError:
+            return
+        if message is None:
+            return
+
+
+class _Worker:
+    """A running worker process and the thread reading its messages."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(
+        self,
+        process: multiprocessing.process.BaseProcess,
+        conn: Connection,
+        reader: threading.Thread,
+        messages: asyncio.Queue,
+    ):
+        """Initialize."""
+        self.process = process
+        self.conn = conn
+        self.reader = reader
+        self.messages = messages
+        self.lock = asyncio.Lock()
+        self.sequence = 0
+
+
+class _Shard:
+    """The accounts polled by one worker."""
+
+    # pylint: disable=consider-alternative-union-syntax,too-few-public-methods
+
+    def __init__(self, index: int, credentials: dict[str, str]):
+        """Initialize."""
+        self.index = index
+        self.credentials = credentials
+        self.worker: Optional[_Worker] = None
+
+
+class ShardedFleet:
+    """Poll a large fleet from a pool of worker processes.
+
+    Accounts are assigned to ``workers`` shards by consistent hashing of the
+    username, so changing the number of workers only moves a small part of
+    the accounts. Every worker runs its own SchluterFleet, with its own
+    client session, and sends each result back pickled as soon as it is
+    complete. JSON decoding and Thermostat construction therefore run in
+    parallel on all cores.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        credentials: Union[Mapping[str, str], Iterable[tuple[str, str]]],
+        workers: Optional[int] = None,
+        replicas: int = DEFAULT_REPLICAS,
+        mp_context: Optional[multiprocessing.context.BaseContext] = None,
+        **fleet_options: Any,
+    ):
+        """Initialize.
+
+        ``workers`` defaults to the number of CPUs. ``fleet_options`` are
+        passed on to the SchluterFleet of every worker and must be picklable;
+        a SessionStore given there must be safe to use from several
+        processes. Workers are started with the ``spawn`` method unless
+        another ``mp_context`` is given.
+        """
+        if isinstance(credentials, Mapping):
+            credentials = credentials.items()
+        credentials = dict(credentials)
+        if (workers := workers or os.cpu_count() or 1) < 1:
+            raise ValueError("workers must be at least 1")
+        self._ring: HashRing[int] = HashRing(range(workers), replicas)
+        self._shards = [_Shard(index, {}) for index in range(workers)]
+        for username, password in credentials.items():
+            self._shards[self._ring.node(username)].credentials[username] = password
+        self._fleet_options = fleet_options
+        # Typeshed only declares Process on the concrete context classes.
+        self._context: Any = mp_context or multiprocessing.get_context("spawn")
+
+    @property
+    def workers(self) -> int:
+        """Number of worker processes."""
+        return len(self._shards)
+
+    @property
+    def running(self) -> bool:
+        """Return True while the worker processes run."""
+        return any(shard.worker is not None for shard in self._shards)
+
+    def shard(self, username: str) -> int:
+        """Return the index of the worker polling ``username``."""
+        return self._ring.node(username)
+
+    def usernames(self, shard: int) -> list[str]:
+        """Return the usernames polled by a worker."""
+        return list(self._shards[shard].credentials)
+
+    def start(self) -> None:
+        """Start the worker processes; call this from the event loop.
+
+        Workers that died are started again on the next call, which every
+        poll makes.
+        """
+        loop = asyncio.get_running_loop()
+        for shard in self._shards:
+            if shard.worker is not None or not shard.credentials:
+                continue
+            parent_conn, child_conn = self._context.Pipe()
+            process = self._context.Process(
+                target=_worker_main,
+                args=(child_conn, shard.credentials, self._fleet_options),
+                name=f"aioschluter-shard-{shard.index}",
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            messages: asyncio.Queue = asyncio.Queue()
+            reader = threading.Thread(
+                target=_read_messages,
+                args=(parent_conn, loop, messages),
+                name=f"aioschluter-shard-{shard.index}-reader",
+                daemon=True,
+            )
+            reader.start()
+            shard.worker = _Worker(process, parent_conn, reader, messages)
+
+    async def _async_poll_shard(self, shard: _Shard, queue: asyncio.Queue) -> None:
+        pending = set(shard.credentials)
+        worker = shard.worker
+        try:
+            if worker is None:
+                raise ApiError(f"Worker {shard.index} is not running")
+            async with worker.lock:
+                worker.sequence += 1
+                sequence = worker.sequence
+                worker.conn.send((_POLL, sequence))
+                while True:
+                    if (message := await worker.messages.get()) is None:
+                        raise EOFError("Worker exited")
+                    if message[1] != sequence:
+                        # Left over from a poll that was cancelled.
+                        continue
+                    if message[0] == _DONE:
+                        break
+                    _, _, username, thermostats, error = message
+                    pending.discard(username)
+                    await queue.put(FleetResult(username, thermostats, error))
+        except (ApiError, EOFError, OSError) as error:
+            _LOGGER.error("Worker %s failed: %r", shard.index, error)
+            for username in pending:
+                await queue.put(
+                    FleetResult(username, error=ApiError(f"Worker failed: {error!r}"))
+                )
+            if worker is not None and shard.worker is worker:
+                # Reap the dead worker so that the next poll starts a new one.
+                shard.worker = None
+                await self._async_stop_worker(shard, worker, DEFAULT_STOP_TIMEOUT)
+        finally:
+            await queue.put(None)
+
+    async def async_poll(self) -> AsyncIterator[FleetResult]:
+        """Poll every account and yield the results as they arrive."""
+        self.start()
+        queue: asyncio.Queue = asyncio.Queue()
+        shards = [shard for shard in self._shards if shard.credentials]
+        tasks = [
+            asyncio.ensure_future(self._async_poll_shard(shard, queue))
+            for shard in shards
+        ]
+        remaining = len(tasks)
+        try:
+            while remaining:
+                if (result := await queue.get()) is None:
+                    remaining -= 1
+                else:
+                    yield result
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+
+    async def async_poll_all(self) -> dict[str, FleetResult]:
+        """Poll every account and return all results keyed by username."""
+        return {result.username: result async for result in self.async_poll()}
+
+    @staticmethod
+    async def _async_stop_worker(
+        shard: _Shard, worker: _Worker, timeout: float
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            worker.conn.send(_STOP)
+        except OSError:
+            pass
+        await loop.run_in_executor(None, worker.process.join, timeout)
+        if worker.process.is_alive():
+            _LOGGER.warning("Terminating worker %s", shard.index)
+            worker.process.terminate()
+            await loop.run_in_executor(None, worker.process.join)
+        # The reader sees the end of the pipe once the worker is gone.
+        await loop.run_in_executor(None, worker.reader.join, timeout)
+        worker.conn.close()
+
+    async def async_close(self, timeout: float = DEFAULT_STOP_TIMEOUT) -> None:
+        """Stop the worker processes."""
+        for shard in self._shards:
+            worker, shard.worker = shard.worker, None
+            if worker is not None:
+                await self._async_stop_worker(shard, worker, timeout)
+
+    async def __aenter__(self) -> "ShardedFleet":
+        """Start the worker processes."""
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Stop the worker processes."""
+        await self.async_close()
@@ -0,0 +1,159 @@
+"""Persist session ids so restarts do not re-authenticate every account."""
+
+import asyncio
+import json
+import logging
+import os
+import tempfile
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Optional
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class StoredSession:
+    """A session id and the time it was issued."""
+
+    sessionid: str
+    timestamp: datetime
+
+
+class SessionStore(ABC):
+    """Storage for the session ids of several accounts, keyed by username."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    @abstractmethod
+    async def async_load(self, username: str) -> Optional[StoredSession]:
+        """Return the stored session of ``username``, if any."""
+
+    @abstractmethod
+    async def async_save(self, username: str, session: StoredSession) -> None:
+        """Store the session of ``username``."""
+
+    @abstractmethod
+    async def async_remove(self, username: str) -> None:
+        """Forget the session of ``username``."""
+
+
+class MemorySessionStore(SessionStore):
+    """Keep the sessions in memory, for sharing between managers and tests."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self):
+        """Initialize."""
+        self._sessions: dict[str, StoredSession] = {}
+
+    async def async_load(self, username: str) -> Optional[StoredSession]:
+        """Return the stored session of ``username``, if any."""
+        return self._sessions.get(username)
+
+    async def async_save(self, username: str, session: StoredSession) -> None:
+        """Store the session of ``username``."""
+        self._sessions[username] = session
+
+    async def async_remove(self, username: str) -> None:
+        """Forget the session of ``username``."""
+        self._sessions.pop(username, None)
+
+
+class JsonFileSessionStore(SessionStore):
+    """Keep the sessions in a json file.
+
+    The file is read once, on first use, and rewritten atomically after every
+    change. File access runs in the default executor. The file holds live
+    session ids, so it is created readable by its owner only.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, path: str):
+        """Initialize."""
+        self._path = path
+        self._sessions: Optional[dict[str, StoredSession]] = None
+        self._lock: Optional[asyncio.Lock] = None
+
+    @property
+    def path(self) -> str:
+        """Path of the json file."""
+        return self._path
+
+    def _read(self) -> dict[str, StoredSession]:
+        try:
+            with open(self._path, encoding="utf-8") as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as error:
+            _LOGGER.warning(
+                "Ignoring unreadable session store %s: %s", self._path, error
+            )
+            return {}
+        sessions = {}
+        for username, item in data.items():
+            try:
+                sessions[username] = StoredSession(
+                    item["sessionid"], datetime.fromisoformat(item["timestamp"])
+                )
+            except (KeyError, TypeError, ValueError):
+                _LOGGER.debug("Ignoring malformed stored session of %s", username)
+        return sessions
+
+    def _write(self, data: dict[str, Any]) -> None:
+        directory = os.path.dirname(os.path.abspath(self._path))
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".sessions-")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as file:
+                json.dump(data, file)
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @property
+    def _file_lock(self) -> asyncio.Lock:
+        # Created on first use so it belongs to the running loop on Python 3.9.
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        return self._lock
+
+    async def _async_sessions(self) -> dict[str, StoredSession]:
+        if self._sessions is None:
+            loop = asyncio.get_running_loop()
+            self._sessions = await loop.run_in_executor(None, self._read)
+        return self._sessions
+
+    async def _async_flush(self) -> None:
+        data = {
+            username: {
+                "sessionid": session.sessionid,
+                "timestamp": session.timestamp.isoformat(),
+            }
+            for username, session in (await self._async_sessions()).items()
+        }
+        await asyncio.get_running_loop().run_in_executor(None, self._write, data)
+
+    async def async_load(self, username: str) -> Optional[StoredSession]:
+        """Return the stored session of ``username``, if any."""
+        async with self._file_lock:
+            return (await self._async_sessions()).get(username)
+
+    async def async_save(self, username: str, session: StoredSession) -> None:
+        """Store the session of ``username``."""
+        async with self._file_lock:
+            sessions = await self._async_sessions()
+            if sessions.get(username) == session:
+                return
+            sessions[username] = session
+            await self._async_flush()
+
+    async def async_remove(self, username: str) -> None:
+        """Forget the session of ``username``."""
+        async with self._file_lock:
+            sessions = await self._async_sessions()
+            if sessions.pop(username, None) is not None:
+                await self._async_flush()
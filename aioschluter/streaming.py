@@ -0,0 +1,124 @@
+"""Incremental parsing of the thermostats response."""
+
+import json
+import re
+from collections.abc import Callable
+from typing import Any, Union
+
+from .thermostat import Thermostat
+
+# Decoders are given bytes when streaming and str by aiohttp's json().
+# pylint: disable-next=consider-alternative-union-syntax
+JsonDecoder = Callable[[Union[str, bytes]], Any]
+
+THERMOSTATS_KEY = b"Thermostats"
+
+_SPECIAL = re.compile(rb'[{}\[\]":]')
+_STRING_END = re.compile(rb'(?:[^"\\]|\\.)*"', re.DOTALL)
+
+_OBJECT = 0
+_ARRAY = 1
+_THERMOSTATS_ARRAY = 2
+
+
+def get_default_decoder() -> JsonDecoder:
+    """Return orjson.loads if orjson is installed, json.loads otherwise."""
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        return json.loads
+    return orjson.loads  # pylint: disable=no-member
+
+
+class ThermostatStreamParser:
+    """Extract thermostats from a thermostats response fed in chunks.
+
+    Only the structure of the document is scanned; each object inside a
+    ``Thermostats`` array is handed to ``decoder`` on its own as soon as its
+    closing brace arrives, so the full document is never held in memory.
+    """
+
+    def __init__(self, decoder: JsonDecoder = json.loads):
+        """Initialize."""
+        self._decoder = decoder
+        self._buffer = b""
+        self._scan_pos = 0
+        self._stack: list[int] = []
+        self._last_string = b""
+        self._after_colon = False
+        self._capture_start = -1
+        self._capture_depth = 0
+        self._started = False
+
+    def feed(self, data: bytes) -> list[Thermostat]:
+        """Consume a chunk and return the thermostats completed by it."""
+        raw = self.feed_raw(data)
+        return [Thermostat(self._decoder(item)) for item in raw]
+
+    def feed_raw(self, data: bytes) -> list[bytes]:
+        """Consume a chunk and return the raw json of completed thermostats."""
+        # pylint: disable=too-many-branches,too-many-statements
+        buf = self._buffer + data if self._buffer else data
+        pos = self._scan_pos
+        completed = []
+        stack = self._stack
+        while True:
+            if (match := _SPECIAL.search(buf, pos)) is None:
+                pos = len(buf)
+                break
+            index = match.start()
+            if (char := buf[index]) == 0x22:  # "
+                if (end := _STRING_END.match(buf, index + 1)) is None:
+                    pos = index
+                    break
+                pos = end.end()
+                if self._capture_depth == 0:
+                    self._last_string = buf[index + 1 : pos - 1]
+                    self._after_colon = False
+                continue
+            pos = index + 1
+            if self._capture_depth:
+                if char in b"{[":
+                    self._capture_depth += 1
+                elif char in b"}]":
+                    self._capture_depth -= 1
+                    if self._capture_depth == 0:
+                        completed.append(buf[self._capture_start : pos])
+                        self._capture_start = -1
+                continue
+            if char == 0x3A:  # :
+                self._after_colon = True
+                continue
+            if char == 0x7B:  # {
+                if stack and stack[-1] == _THERMOSTATS_ARRAY:
+                    self._capture_depth = 1
+                    self._capture_start = index
+                else:
+                    stack.append(_OBJECT)
+            elif char == 0x5B:  # [
+                if self._after_colon and self._last_string == THERMOSTATS_KEY:
+                    stack.append(_THERMOSTATS_ARRAY)
+                else:
+                    stack.append(_ARRAY)
+            else:
+                if not stack:
+                    raise ValueError(f"Unbalanced json at offset {index}")
+                stack.pop()
+            self._started = True
+            self._after_colon = False
+
+        if self._capture_depth:
+            self._buffer = buf[self._capture_start :]
+            self._scan_pos = pos - self._capture_start
+            self._capture_start = 0
+        else:
+            self._buffer = buf[pos:]
+            self._scan_pos = 0
+        return completed
+
+    def close(self) -> None:
+        """Verify that a complete document was consumed."""
+        if not self._started or self._stack or self._capture_depth:
+            raise ValueError("Incomplete thermostats response")
+        if self._buffer.strip():
+            raise ValueError("Unexpected trailing data in thermostats response")
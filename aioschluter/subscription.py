@@ -0,0 +1,261 @@
+"""Fan one poll out to any number of async consumers."""
+
+import asyncio
+import logging
+from collections import deque
+from collections.abc import Iterable, Mapping
+from typing import Any, Optional
+
+from .scheduler import PollFunction, PollScheduler
+from .thermostat import Thermostat
+
+_LOGGER = logging.getLogger(__name__)
+
+OVERFLOW_DROP_OLDEST = "drop_oldest"
+OVERFLOW_COALESCE = "coalesce"
+
+DEFAULT_MAXSIZE = 16
+
+
+class SubscriptionClosed(Exception):
+    """Raised when waiting on a closed subscription."""
+
+
+class Subscription:
+    """Bounded queue of snapshots for one consumer.
+
+    When the queue is full the ``drop_oldest`` policy discards the oldest
+    snapshot, while ``coalesce`` replaces the newest queued one with the new
+    snapshot; every snapshot holds the full state, so nothing is lost and
+    removed thermostats do not linger. Either way publishing never waits for
+    the consumer.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        serialnumbers: Optional[Iterable[str]] = None,
+        group_ids: Optional[Iterable[int]] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        overflow: str = OVERFLOW_COALESCE,
+        hub: Optional["SubscriptionHub"] = None,
+    ):
+        """Initialize."""
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        if overflow not in (OVERFLOW_DROP_OLDEST, OVERFLOW_COALESCE):
+            raise ValueError(f"Unknown overflow policy {overflow!r}")
+        self._serialnumbers = None if serialnumbers is None else set(serialnumbers)
+        self._group_ids = None if group_ids is None else set(group_ids)
+        self._maxsize = maxsize
+        self._overflow = overflow
+        self._hub = hub
+        self._queue: deque[dict[str, Thermostat]] = deque()
+        self._waiter: Optional[asyncio.Future] = None
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self.dropped = 0
+
+    @property
+    def closed(self) -> bool:
+        """Return True once the subscription was closed."""
+        return self._closed
+
+    @property
+    def error(self) -> Optional[BaseException]:
+        """Error the subscription was closed with, if any."""
+        return self._error
+
+    @property
+    def qsize(self) -> int:
+        """Number of queued snapshots."""
+        return len(self._queue)
+
+    def matches(self, thermostat: Thermostat) -> bool:
+        """Return True if the filters select ``thermostat``."""
+        if (
+            self._serialnumbers is not None
+            and thermostat.serial_number not in self._serialnumbers
+        ):
+            return False
+        return self._group_ids is None or thermostat.group_id in self._group_ids
+
+    def put(self, thermostats: Mapping[str, Thermostat]) -> None:
+        """Queue the selected thermostats of a snapshot without waiting."""
+        if self._closed:
+            return
+        if self._serialnumbers is None and self._group_ids is None:
+            snapshot = dict(thermostats)
+        else:
+            snapshot = {
+                serial: thermostat
+                for serial, thermostat in thermostats.items()
+                if self.matches(thermostat)
+            }
+            if not snapshot:
+                return
+        queue = self._queue
+        if len(queue) >= self._maxsize:
+            self.dropped += 1
+            if self._overflow == OVERFLOW_COALESCE:
+                queue[-1] = snapshot
+                return
+            queue.popleft()
+        queue.append(snapshot)
+        self._wake()
+
+    def _wake(self) -> None:
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    async def async_get(self) -> dict[str, Thermostat]:
+        """Wait for and return the next snapshot."""
+        while not self._queue:
+            if self._closed:
+                raise SubscriptionClosed("The subscription is closed") from self._error
+            self._waiter = asyncio.get_running_loop().create_future()
+            try:
+                await self._waiter
+            finally:
+                self._waiter = None
+        return self._queue.popleft()
+
+    def close(self, error: Optional[BaseException] = None) -> None:
+        """Stop receiving snapshots; queued ones can still be read.
+
+        With an ``error`` the subscription ends with SubscriptionClosed
+        caused by it, also when iterated over, instead of ending quietly.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._error = error
+        if self._hub is not None:
+            self._hub.unsubscribe(self)
+        self._wake()
+
+    def __aiter__(self) -> "Subscription":
+        """Iterate over the snapshots until the subscription is closed."""
+        return self
+
+    async def __anext__(self) -> dict[str, Thermostat]:
+        """Return the next snapshot."""
+        try:
+            return await self.async_get()
+        except SubscriptionClosed:
+            if self._error is not None:
+                raise
+            raise StopAsyncIteration from None
+
+    async def __aenter__(self) -> "Subscription":
+        """Return the subscription."""
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Close the subscription."""
+        self.close()
+
+
+class SubscriptionHub:
+    """Poll once for all subscribers and hand every snapshot to each of them.
+
+    Polling is done by a PollScheduler, which is available as ``scheduler``
+    to request refreshes or mark pending writes. New subscribers receive the
+    latest snapshot straight away. Should the polling loop end, every
+    subscription is closed, with the error that ended the loop if any, and
+    subscriptions made until the hub is started again are closed at once.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(self, poll: PollFunction, **scheduler_options: Any):
+        """Initialize.
+
+        ``scheduler_options`` are passed on to PollScheduler.
+        """
+        self._scheduler = PollScheduler(poll, self.publish, **scheduler_options)
+        self._subscriptions: list[Subscription] = []
+        self._latest: Optional[dict[str, Thermostat]] = None
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+
+    @property
+    def scheduler(self) -> PollScheduler:
+        """The scheduler running the poll."""
+        return self._scheduler
+
+    @property
+    def latest(self) -> Optional[dict[str, Thermostat]]:
+        """The most recent snapshot, if any."""
+        return self._latest
+
+    @property
+    def subscriptions(self) -> list[Subscription]:
+        """The open subscriptions."""
+        return list(self._subscriptions)
+
+    def subscribe(
+        self,
+        serialnumbers: Optional[Iterable[str]] = None,
+        group_ids: Optional[Iterable[int]] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        overflow: str = OVERFLOW_COALESCE,
+    ) -> Subscription:
+        """Return a new subscription, optionally limited to some thermostats."""
+        subscription = Subscription(serialnumbers, group_ids, maxsize, overflow, self)
+        self._subscriptions.append(subscription)
+        if self._latest is not None:
+            subscription.put(self._latest)
+        if self._stopped:
+            subscription.close(self._error)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop delivering snapshots to ``subscription``."""
+        if subscription in self._subscriptions:
+            self._subscriptions.remove(subscription)
+        subscription.close()
+
+    def publish(self, thermostats: Mapping[str, Thermostat]) -> None:
+        """Hand a snapshot to every subscriber."""
+        self._latest = dict(thermostats)
+        for subscription in list(self._subscriptions):
+            try:
+                subscription.put(thermostats)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error publishing to %s", subscription)
+
+    def start(self) -> None:
+        """Start polling in the background."""
+        if self._scheduler.running:
+            return
+        self._stopped = False
+        self._error = None
+        self._scheduler.start()
+        if (task := self._scheduler.task) is not None:
+            task.add_done_callback(self._poll_loop_done)
+
+    def _poll_loop_done(self, task: asyncio.Task) -> None:
+        if (error := None if task.cancelled() else task.exception()) is not None:
+            _LOGGER.error("Polling stopped with %r, closing subscriptions", error)
+        self._stopped = True
+        self._error = error
+        for subscription in list(self._subscriptions):
+            subscription.close(error)
+
+    async def async_stop(self) -> None:
+        """Stop polling and close every subscription."""
+        await self._scheduler.async_stop()
+        self._stopped = True
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    async def __aenter__(self) -> "SubscriptionHub":
+        """Start polling."""
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Stop polling."""
+        await self.async_stop()
@@ -0,0 +1,220 @@
+"""Blocking access to the Schluter API for code without an event loop."""
+
+import asyncio
+import logging
+import os
+import threading
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from typing import Any, NamedTuple, Optional, TypeVar, Union
+
+from .fleet import FleetResult, SchluterFleet
+from .thermostat import Thermostat
+
+_LOGGER = logging.getLogger(__name__)
+
+DEFAULT_CLOSE_TIMEOUT = 10.0
+
+_T = TypeVar("_T")
+
+
+async def _async_invoke(func: Callable[[], Awaitable[_T]]) -> _T:
+    return await func()
+
+
+async def _async_shutdown(fleet: SchluterFleet) -> None:
+    """Cancel the calls still running, then close the client session."""
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+    await fleet.async_close()
+
+
+class _Runtime(NamedTuple):
+    """The event loop thread of a client and the fleet it runs."""
+
+    loop: asyncio.AbstractEventLoop
+    thread: threading.Thread
+    fleet: SchluterFleet
+    pid: int
+
+
+def _run_loop(loop: asyncio.AbstractEventLoop) -> None:
+    """Run ``loop`` until it is stopped, then close it."""
+    asyncio.set_event_loop(loop)
+    try:
+        loop.run_forever()
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+class SyncSchluterClient:
+    """Call the Schluter API from synchronous code, from any thread.
+
+    The client runs one event loop in a background thread for its whole
+    lifetime. The loop owns a SchluterFleet, so every call shares one pooled
+    ClientSession and transport, and every account logs in once and reuses
+    its session id until it expires or is rejected. Blocking methods submit
+    their request to the loop and wait for the result, so calls from many
+    threads are multiplexed over the same connections.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        credentials: Union[Mapping[str, str], Iterable[tuple[str, str]]],
+        call_timeout: Optional[float] = None,
+        **fleet_options: Any,
+    ):
+        """Initialize.
+
+        ``credentials`` maps usernames to passwords. ``fleet_options`` are
+        passed on to the SchluterFleet, for example ``limit_per_host``,
+        ``rate_limiter`` or ``session_store``; the client session is always
+        created by the client. A blocking call waiting longer than
+        ``call_timeout`` seconds cancels its request and raises
+        ``concurrent.futures.TimeoutError``.
+
+        The loop thread is started by the first call. In a child process,
+        such as a Celery prefork worker, the first call starts a new loop
+        and client session instead of using the ones of the parent.
+        """
+        if "session" in fleet_options:
+            raise TypeError("The client session is created by the client")
+        if isinstance(credentials, Mapping):
+            credentials = credentials.items()
+        self._credentials: dict[str, str] = dict(credentials)
+        self._call_timeout = call_timeout
+        self._fleet_options = fleet_options
+        self._lock = threading.Lock()
+        self._runtime: Optional[_Runtime] = None
+        self._closed = False
+
+    @property
+    def usernames(self) -> list[str]:
+        """Usernames of all accounts."""
+        return list(self._credentials)
+
+    @property
+    def closed(self) -> bool:
+        """Return True once the client is closed."""
+        return self._closed
+
+    def _start(self) -> _Runtime:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("The client is closed")
+            runtime = self._runtime
+            if runtime is None or runtime.pid != os.getpid():
+                if runtime is not None:
+                    _LOGGER.debug("Starting a new event loop after a fork")
+                loop = asyncio.new_event_loop()
+                thread = threading.Thread(
+                    target=_run_loop,
+                    args=(loop,),
+                    name="aioschluter-sync",
+                    daemon=True,
+                )
+                runtime = self._runtime = _Runtime(
+                    loop,
+                    thread,
+                    SchluterFleet(self._credentials, **self._fleet_options),
+                    os.getpid(),
+                )
+                thread.start()
+            return runtime
+
+    def _username(self, username: Optional[str]) -> str:
+        if username is not None:
+            return username
+        if len(self._credentials) != 1:
+            raise ValueError("A username is required with several accounts")
+        return next(iter(self._credentials))
+
+    def call(self, func: Callable[..., Awaitable[_T]], *args: Any) -> _T:
+        """Run ``func(fleet, *args)`` on the event loop and return its result.
+
+        ``func`` is a coroutine function receiving the SchluterFleet, so any
+        async part of the library can be used with the shared session.
+        """
+        runtime = self._start()
+        if threading.current_thread() is runtime.thread:
+            raise RuntimeError("Blocking call from the event loop of the client")
+        future = asyncio.run_coroutine_threadsafe(
+            _async_invoke(lambda: func(runtime.fleet, *args)), runtime.loop
+        )
+        try:
+            return future.result(self._call_timeout)
+        except BaseException:
+            # Stop the request on a timeout or an interrupt.
+            future.cancel()
+            raise
+
+    def get_current_thermostats(
+        self, username: Optional[str] = None
+    ) -> dict[str, Thermostat]:
+        """Get the current settings for all thermostats of an account.
+
+        ``username`` may be left out when there is only one account.
+        """
+        username = self._username(username)
+        return self.call(
+            lambda fleet: fleet.manager(username).async_get_current_thermostats()
+        )
+
+    def set_temperature(
+        self, serialnumber, temperature, username: Optional[str] = None
+    ) -> bool:
+        """Set the temperature for a thermostat."""
+        username = self._username(username)
+        return self.call(
+            lambda fleet: fleet.manager(username).async_set_temperature(
+                serialnumber, temperature
+            )
+        )
+
+    def set_regulation_mode(
+        self, serialnumber, mode, username: Optional[str] = None
+    ) -> bool:
+        """Set the regulation mode to SCHEDULE, MANUAL or AWAY."""
+        username = self._username(username)
+        return self.call(
+            lambda fleet: fleet.manager(username).async_set_regulation_mode(
+                serialnumber, mode
+            )
+        )
+
+    def poll_all(self) -> dict[str, FleetResult]:
+        """Poll every account and return all results keyed by username."""
+        return self.call(lambda fleet: fleet.async_poll_all())
+
+    def close(self, timeout: float = DEFAULT_CLOSE_TIMEOUT) -> None:
+        """Cancel the running calls, close the client session and the loop."""
+        runtime = self._runtime
+        if runtime is not None and threading.current_thread() is runtime.thread:
+            raise RuntimeError("The client cannot be closed from its event loop")
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            runtime, self._runtime = self._runtime, None
+        if runtime is None or runtime.pid != os.getpid():
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(
+                _async_shutdown(runtime.fleet), runtime.loop
+            ).result(timeout)
+        finally:
+            runtime.loop.call_soon_threadsafe(runtime.loop.stop)
+            runtime.thread.join(timeout)
+
+    def __enter__(self) -> "SyncSchluterClient":
+        """Return the client."""
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        """Close the client."""
+        self.close()
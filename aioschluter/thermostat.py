@@ -1,17 +1,60 @@
 """ A single instance of a Schluter Thermostat """
 
 
+def to_degrees(value):
+    """Convert 1/100 degree to degree, rounded to the nearest half degree."""
+    return round((value / 100) * 2) / 2
+
+
 class Thermostat:
     """A Schluter Thermostat"""
 
+    __slots__ = (
+        "_serial_number",
+        "_name",
+        "_group_name",
+        "_group_id",
+        "_temperature",
+        "_set_point_temp",
+        "_regulation_mode",
+        "_vacation_enabled",
+        "_vacation_begin_day",
+        "_vacation_end_day",
+        "_vacation_temperature",
+        "_comfort_temperature",
+        "_comfort_end_time",
+        "_manual_temp",
+        "_is_online",
+        "_is_heating",
+        "_is_early_start_of_heating",
+        "_max_temp",
+        "_min_temp",
+        "_error_code",
+        "_is_confirmed",
+        "_email",
+        "_tz_offset",
+        "_kwh_charge",
+        "_is_load_measuring_active",
+        "_load_manually_set_watt",
+        "_load_measured_watt",
+        "_sw_version",
+        "_is_assigned",
+        "_distributer_id",
+        "_support",
+    )
+
     def __init__(self, data):
-        """Initialize Thermostat."""
+        """Initialize Thermostat.
+
+        Temperatures are converted from 1/100 degree once, here, so reading
+        them is a plain attribute access.
+        """
         self._serial_number = data["SerialNumber"]
         self._name = data["Room"]
         self._group_name = data["GroupName"]
         self._group_id = data["GroupId"]
-        self._temperature = data["Temperature"]
-        self._set_point_temp = data["SetPointTemp"]
+        self._temperature = to_degrees(data["Temperature"])
+        self._set_point_temp = to_degrees(data["SetPointTemp"])
         self._regulation_mode = data["RegulationMode"]
         self._vacation_enabled = data["VacationEnabled"]
         self._vacation_begin_day = data["VacationBeginDay"]
@@ -19,12 +62,12 @@ class Thermostat:
         self._vacation_temperature = data["VacationTemperature"]
         self._comfort_temperature = data["ComfortTemperature"]
         self._comfort_end_time = data["ComfortEndTime"]
-        self._manual_temp = data["ManualTemperature"]
+        self._manual_temp = to_degrees(data["ManualTemperature"])
         self._is_online = data["Online"]
         self._is_heating = data["Heating"]
-        self._is_early_start_of_heating = ["EarlyStartOfHeating"]
-        self._max_temp = data["MaxTemp"]
-        self._min_temp = data["MinTemp"]
+        self._is_early_start_of_heating = data["EarlyStartOfHeating"]
+        self._max_temp = to_degrees(data["MaxTemp"])
+        self._min_temp = to_degrees(data["MinTemp"])
         self._error_code = data["ErrorCode"]
         self._is_confirmed = data["Confirmed"]
         self._email = data["Email"]
@@ -38,6 +81,17 @@ class Thermostat:
         self._distributer_id = data["DistributerId"]
         self._support = data["Support"]
 
+    def replace(self, **changes):
+        """Return a copy with some attributes replaced, e.g. set_point_temp."""
+        thermostat = Thermostat.__new__(Thermostat)
+        for slot in self.__slots__:
+            setattr(thermostat, slot, getattr(self, slot))
+        for name, value in changes.items():
+            if "_" + name not in self.__slots__:
+                raise AttributeError(f"Thermostat has no attribute {name!r}")
+            setattr(thermostat, "_" + name, value)
+        return thermostat
+
     def __repr__(self):
         """Print Method."""
         return f"Thermostat: {self._serial_number}, {self._name}"
@@ -65,12 +119,12 @@ class Thermostat:
     @property
     def temperature(self):
         """Temperature."""
-        return round((self._temperature / 100) * 2) / 2
+        return self._temperature
 
     @property
     def set_point_temp(self):
         """Set Point Temperature."""
-        return round((self._set_point_temp / 100) * 2) / 2
+        return self._set_point_temp
 
     @property
     def regulation_mode(self):
@@ -80,7 +134,7 @@ class Thermostat:
     @property
     def manual_temp(self):
         """Manual Temperature."""
-        return round((self._manual_temp / 100) * 2) / 2
+        return self._manual_temp
 
     @property
     def is_online(self):
@@ -92,15 +146,20 @@ class Thermostat:
         """Is Thermostat Heating."""
         return self._is_heating
 
+    @property
+    def is_early_start_of_heating(self):
+        """Is Thermostat heating ahead of the next scheduled event."""
+        return self._is_early_start_of_heating
+
     @property
     def max_temp(self):
         """Maximum Temperature."""
-        return round((self._max_temp / 100) * 2) / 2
+        return self._max_temp
 
     @property
     def min_temp(self):
         """Minimum Temperature."""
-        return round((self._min_temp / 100) * 2) / 2
+        return self._min_temp
 
     @property
     def kwh_charge(self):
@@ -0,0 +1,299 @@
+"""Shared request path with timeouts, retries and a circuit breaker."""
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from aiohttp import ClientError, ClientResponse, ClientSession, ClientTimeout
+
+from .const import ENDPOINT_AUTH, ENDPOINT_GET_THERMOSTATS, ENDPOINT_SET_THERMOSTAT
+from .exceptions import CircuitOpenError
+from .observer import RequestEvent, RequestObserver
+from .ratelimit import RateLimiter
+
+_LOGGER = logging.getLogger(__name__)
+
+HTTP_SERVER_ERROR = 500
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+TRANSIENT_ERRORS = (ClientError, asyncio.TimeoutError)
+
+
+@dataclass(frozen=True)
+class EndpointPolicy:
+    """Timeout and retry settings of an endpoint.
+
+    Only idempotent endpoints should be given retries. The delay before the
+    n-th retry is ``backoff * 2 ** (n - 1)`` seconds, capped at
+    ``max_backoff`` and randomized to between half and all of that.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    timeout: Optional[float] = 30.0
+    retries: int = 0
+    backoff: float = 0.5
+    max_backoff: float = 10.0
+
+    def retry_delay(self, attempt: int) -> float:
+        """Return the delay before retrying after ``attempt`` failed."""
+        delay = min(self.backoff * 2 ** (attempt - 1), self.max_backoff)
+        return random.uniform(delay / 2, delay)  # nosec
+
+
+DEFAULT_POLICY = EndpointPolicy()
+DEFAULT_POLICIES: dict[str, EndpointPolicy] = {
+    ENDPOINT_AUTH: EndpointPolicy(timeout=30.0, retries=0),
+    ENDPOINT_GET_THERMOSTATS: EndpointPolicy(timeout=30.0, retries=2),
+    ENDPOINT_SET_THERMOSTAT: EndpointPolicy(timeout=15.0, retries=0),
+}
+
+
+class CircuitBreaker:
+    """Fail fast after repeated failures and probe for recovery.
+
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    requests raise CircuitOpenError. Once ``recovery_time`` seconds passed a
+    single probe request is let through; its success closes the circuit
+    again, its failure keeps it open for another ``recovery_time``.
+    A breaker can be shared by several transports talking to the same host.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        recovery_time: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize."""
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self._failure_threshold = failure_threshold
+        self._recovery_time = recovery_time
+        self._clock = clock
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_started_at: Optional[float] = None
+
+    @property
+    def state(self) -> str:
+        """Current state of the circuit."""
+        if self._failures < self._failure_threshold:
+            return CIRCUIT_CLOSED
+        if self._clock() - self._opened_at < self._recovery_time:
+            return CIRCUIT_OPEN
+        return CIRCUIT_HALF_OPEN
+
+    def before_request(self) -> None:
+        """Raise CircuitOpenError unless a request may be sent now."""
+        if (state := self.state) == CIRCUIT_CLOSED:
+            return
+        now = self._clock()
+        if state == CIRCUIT_HALF_OPEN and (
+            self._probe_started_at is None
+            or now - self._probe_started_at >= self._recovery_time
+        ):
+            _LOGGER.debug("Circuit half open, sending probe request")
+            self._probe_started_at = now
+            return
+        raise CircuitOpenError("Schluter API unavailable, circuit is open")
+
+    def record_success(self) -> None:
+        """Record a request the server answered."""
+        if self._failures >= self._failure_threshold:
+            _LOGGER.info("Schluter API recovered, closing circuit")
+        self._failures = 0
+        self._probe_started_at = None
+
+    def record_failure(self) -> None:
+        """Record a transport error, timeout or server error."""
+        self._failures += 1
+        self._probe_started_at = None
+        if self._failures >= self._failure_threshold:
+            if self._failures == self._failure_threshold:
+                _LOGGER.warning("Schluter API failing, opening circuit")
+            self._opened_at = self._clock()
+
+
+class _Retries:
+    """Retries of one request, still known when the request raises."""
+
+    # pylint: disable=too-few-public-methods
+
+    __slots__ = ("count",)
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.count = 0
+
+
+class Transport:
+    """Send requests for SchluterApi and report them to observers."""
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        session: ClientSession,
+        policies: Optional[Mapping[str, EndpointPolicy]] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+    ):
+        """Initialize.
+
+        ``policies`` override the DEFAULT_POLICIES of individual endpoints.
+        Without ``circuit_breaker`` requests are never rejected up front, and
+        without ``rate_limiter`` they are never delayed. Both can be shared by
+        several transports.
+        """
+        self._session = session
+        self._policies = {**DEFAULT_POLICIES, **(policies or {})}
+        self._circuit_breaker = circuit_breaker
+        self._rate_limiter = rate_limiter
+        self._observers: list[RequestObserver] = []
+
+    @property
+    def session(self) -> ClientSession:
+        """The client session requests are sent with."""
+        return self._session
+
+    @property
+    def circuit_breaker(self) -> Optional[CircuitBreaker]:
+        """The circuit breaker guarding the requests, if any."""
+        return self._circuit_breaker
+
+    @property
+    def rate_limiter(self) -> Optional[RateLimiter]:
+        """The rate limiter delaying the requests, if any."""
+        return self._rate_limiter
+
+    def policy(self, endpoint: str) -> EndpointPolicy:
+        """Return the policy of an endpoint."""
+        return self._policies.get(endpoint, DEFAULT_POLICY)
+
+    def add_observer(self, observer: RequestObserver) -> Callable[[], None]:
+        """Report every request to ``observer``; return a function to remove it."""
+        self._observers.append(observer)
+
+        def remove_observer() -> None:
+            if observer in self._observers:
+                self._observers.remove(observer)
+
+        return remove_observer
+
+    def _notify(self, event: RequestEvent) -> None:
+        for observer in list(self._observers):
+            try:
+                observer(event)
+            except Exception:  # pylint: disable=broad-except
+                _LOGGER.exception("Error in request observer %s", observer)
+
+    async def _async_send(
+        self,
+        endpoint: str,
+        policy: EndpointPolicy,
+        retries: _Retries,
+        method: str,
+        url: str,
+        **kwargs,
+    ) -> ClientResponse:
+        """Send a request, retrying transient failures, and count the retries."""
+        breaker = self._circuit_breaker
+        rate_limiter = self._rate_limiter
+        timeout = ClientTimeout(total=policy.timeout)
+        attempt = 0
+        while True:
+            if breaker is not None:
+                breaker.before_request()
+            if rate_limiter is not None:
+                await rate_limiter.async_acquire(endpoint)
+            attempt += 1
+            retries.count = attempt - 1
+            try:
+                resp = await self._session.request(
+                    method, url, timeout=timeout, **kwargs
+                )
+            except TRANSIENT_ERRORS as error:
+                if breaker is not None:
+                    breaker.record_failure()
+                if attempt > policy.retries:
+                    raise
+                _LOGGER.debug("Request to %s failed (%r), retrying", endpoint, error)
+            else:
+                if resp.status < HTTP_SERVER_ERROR:
+                    if breaker is not None:
+                        breaker.record_success()
+                    return resp
+                if breaker is not None:
+                    breaker.record_failure()
+                if attempt > policy.retries:
+                    return resp
+                resp.release()
+                _LOGGER.debug(
+                    "Request to %s answered %s, retrying", endpoint, resp.status
+                )
+            await asyncio.sleep(policy.retry_delay(attempt))
+
+    @asynccontextmanager
+    async def async_request(
+        self, endpoint: str, method: str, url: str, **kwargs: Any
+    ) -> AsyncIterator[ClientResponse]:
+        """Send a request and yield the response.
+
+        Transient errors and server errors are retried according to the
+        policy of ``endpoint`` before the response is handed out.
+        """
+        policy = self.policy(endpoint)
+        if not self._observers:
+            resp = await self._async_send(
+                endpoint, policy, _Retries(), method, url, **kwargs
+            )
+            async with resp:
+                yield resp
+            return
+
+        start = time.perf_counter()
+        status = None
+        payload_size = None
+        retries = _Retries()
+        try:
+            resp = await self._async_send(
+                endpoint, policy, retries, method, url, **kwargs
+            )
+            status = resp.status
+            payload_size = resp.content_length
+            async with resp:
+                yield resp
+        except BaseException as error:
+            self._notify(
+                RequestEvent(
+                    endpoint,
+                    method,
+                    status,
+                    time.perf_counter() - start,
+                    payload_size,
+                    retries.count,
+                    error,
+                )
+            )
+            raise
+        self._notify(
+            RequestEvent(
+                endpoint,
+                method,
+                status,
+                time.perf_counter() - start,
+                payload_size,
+                retries.count,
+            )
+        )
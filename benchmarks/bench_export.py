@@ -0,0 +1,99 @@
+"""Compare exporting snapshots as json with the columnar file format.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_export --thermostats 1000 --snapshots 60
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+
+from aioschluter.collection import ThermostatCollection
+from aioschluter.columnar import ColumnarSnapshots, to_columnar
+from tests.mock_server import make_groups
+
+FIELDS = (
+    "serial_number",
+    "group_id",
+    "group_name",
+    "temperature",
+    "set_point_temp",
+    "manual_temp",
+    "regulation_mode",
+    "is_online",
+    "is_heating",
+    "load_measured_watt",
+    "kwh_charge",
+)
+
+
+def timed(func):
+    """Return the result of ``func`` and the seconds it took."""
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def main(args):
+    """Run the benchmark."""
+    groups = make_groups("export@example.org", args.groups, args.thermostats)
+    snapshot = ThermostatCollection.from_groups(groups)
+    snapshots = [(float(index * 60), snapshot) for index in range(args.snapshots)]
+    rows = len(snapshot) * args.snapshots
+    print(f"{rows} rows")
+
+    with tempfile.TemporaryDirectory() as directory:
+        json_path = os.path.join(directory, "snapshots.json")
+        columnar_path = os.path.join(directory, "snapshots.col")
+
+        def write_json():
+            records = [
+                dict(
+                    {field: getattr(item, field) for field in FIELDS},
+                    timestamp=timestamp,
+                )
+                for timestamp, thermostats in snapshots
+                for item in thermostats.values()
+            ]
+            with open(json_path, "w", encoding="utf-8") as file:
+                json.dump(records, file)
+
+        def read_json():
+            with open(json_path, encoding="utf-8") as file:
+                records = json.load(file)
+            return sum(record["temperature"] for record in records)
+
+        def write_columnar():
+            to_columnar(snapshots).write(columnar_path)
+
+        def read_columnar():
+            with ColumnarSnapshots.open(columnar_path) as columns:
+                return sum(columns.column("temperature"))
+
+        for label, write, read, path in (
+            ("json", write_json, read_json, json_path),
+            ("columnar", write_columnar, read_columnar, columnar_path),
+        ):
+            _, write_seconds = timed(write)
+            _, read_seconds = timed(read)
+            print(
+                f"  {label:<9} write {write_seconds * 1e3:8.1f} ms  "
+                f"read {read_seconds * 1e3:8.1f} ms  "
+                f"{os.path.getsize(path) / 1024:9.1f} KiB"
+            )
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--groups", type=int, default=10)
+    parser.add_argument("--thermostats", type=int, default=100)
+    parser.add_argument("--snapshots", type=int, default=60)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,64 @@
+"""Measure the time it takes to import aioschluter and its submodules.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_import --repeat 5 aioschluter aioschluter.api
+
+Every import runs in a fresh interpreter with ``-X importtime``.
+"""
+
+import argparse
+import statistics
+import subprocess  # nosec
+import sys
+
+
+def import_times(module: str) -> dict[str, int]:
+    """Import ``module`` in a new interpreter.
+
+    Return the cumulative import time in microseconds of every module that
+    was loaded, keyed by module name.
+    """
+    process = subprocess.run(  # nosec
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    times = {}
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def main(args):
+    """Run the benchmark."""
+    for module in args.modules:
+        runs = [import_times(module) for _ in range(args.repeat)]
+        cumulative = [run[module] / 1e3 for run in runs]
+        loaded = runs[-1]
+        heavy = sorted(
+            name for name in ("aiohttp", "yarl", "multidict") if name in loaded
+        )
+        print(
+            f"  {module:<24} {statistics.median(cumulative):8.1f} ms"
+            f"  {len(loaded):4} modules  heavy: {', '.join(heavy) or '-'}"
+        )
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "modules", nargs="*", default=["aioschluter", "aioschluter.api"]
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,145 @@
+"""Measure client throughput and tail latency against the local mock server.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_load --accounts 200 --latency 0.02 0.08
+
+The mock server runs in the same event loop as the client, so the absolute
+numbers understate a real deployment; compare runs against each other.
+"""
+
+import argparse
+import asyncio
+import time
+
+from aiohttp import ClientSession, TCPConnector
+
+from aioschluter import SchluterApi, const
+from aioschluter.batch import BatchWriter
+from aioschluter.fleet import SchluterFleet
+from aioschluter.metrics import MetricsAggregator
+from aioschluter.session import SchluterSessionManager
+from tests.mock_server import MockSchluterServer
+
+
+def report(label, concurrency, seconds, requests, metrics, endpoint):
+    """Print one result line."""
+    latency = metrics.as_dict().get(endpoint, {}).get("latency", {})
+    percentiles = "  ".join(
+        f"{name} {latency[name] * 1e3:7.1f} ms"
+        for name in ("p50", "p95", "p99")
+        if latency.get(name) is not None
+    )
+    print(
+        f"  {label:<8} c={concurrency:<4} {seconds * 1e3:8.1f} ms  "
+        f"{requests / seconds:8.1f} req/s  {percentiles}"
+    )
+
+
+async def bench_polling(server, accounts, concurrency):
+    """Poll every account once through a fleet."""
+    credentials = {f"user{index}@example.org": "pw" for index in range(accounts)}
+    metrics = MetricsAggregator()
+    async with SchluterFleet(
+        credentials,
+        max_concurrency=concurrency,
+        limit_per_host=concurrency,
+        base_url=server.url,
+    ) as fleet:
+        fleet.transport.add_observer(metrics)
+        # Log in outside of the measurement.
+        await fleet.async_poll_all()
+        metrics.reset()
+        start = time.perf_counter()
+        results = await fleet.async_poll_all()
+        seconds = time.perf_counter() - start
+    failed = sum(not result.success for result in results.values())
+    report(
+        "poll", concurrency, seconds, accounts, metrics, const.ENDPOINT_GET_THERMOSTATS
+    )
+    if failed:
+        print(f"           {failed} account(s) failed")
+
+
+async def bench_batch_write(server, websession, concurrency):
+    """Write every thermostat of one account."""
+    api = SchluterApi(websession, base_url=server.url)
+    sessionid = await api.async_get_sessionid("writer@example.org", "pw")
+    serials = [
+        thermostat["SerialNumber"]
+        for group in server.account("writer@example.org")
+        for thermostat in group["Thermostats"]
+    ]
+    metrics = MetricsAggregator()
+    api.add_observer(metrics)
+    writer = BatchWriter(api, max_concurrency=concurrency, retry_delay=0.01)
+    start = time.perf_counter()
+    await writer.async_write(sessionid, dict.fromkeys(serials, 21.5))
+    seconds = time.perf_counter() - start
+    report(
+        "write",
+        concurrency,
+        seconds,
+        len(serials),
+        metrics,
+        const.ENDPOINT_SET_THERMOSTAT,
+    )
+
+
+async def bench_reauth(server, websession, concurrency):
+    """Send concurrent requests on an expired session."""
+    api = SchluterApi(websession, base_url=server.url)
+    metrics = MetricsAggregator()
+    manager = SchluterSessionManager(api, "reauth@example.org", "pw")
+    await manager.async_get_sessionid()
+    api.add_observer(metrics)
+    server.expire_sessions()
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(manager.async_get_current_thermostats() for _ in range(concurrency))
+    )
+    seconds = time.perf_counter() - start
+    report("reauth", concurrency, seconds, concurrency, metrics, const.ENDPOINT_AUTH)
+    auth_calls = metrics.as_dict()[const.ENDPOINT_AUTH]["requests"]
+    print(f"           {auth_calls} authentication(s) for {concurrency} callers")
+
+
+async def main(args):
+    """Run all benchmarks."""
+    server = MockSchluterServer(
+        groups=args.groups,
+        thermostats_per_group=args.thermostats,
+        latency=tuple(args.latency),
+        error_rate=args.error_rate,
+        seed=1,
+    )
+    async with server:
+        print(
+            f"{args.accounts} accounts, {args.groups}x{args.thermostats} thermostats, "
+            f"latency {args.latency[0]}-{args.latency[1]} s"
+        )
+        for concurrency in args.concurrency:
+            await bench_polling(server, args.accounts, concurrency)
+        async with ClientSession(connector=TCPConnector(limit=0)) as websession:
+            for concurrency in args.concurrency:
+                await bench_batch_write(server, websession, concurrency)
+            for concurrency in args.concurrency:
+                await bench_reauth(server, websession, concurrency)
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=100)
+    parser.add_argument("--groups", type=int, default=2)
+    parser.add_argument("--thermostats", type=int, default=10)
+    parser.add_argument(
+        "--latency", type=float, nargs=2, default=[0.01, 0.05], metavar=("MIN", "MAX")
+    )
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32, 128])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
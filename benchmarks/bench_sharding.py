@@ -0,0 +1,102 @@
+"""Compare polling a large fleet from one process and from worker processes.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_sharding --accounts 400 --workers 1 2 4
+
+The mock server runs in its own process so it does not compete with the
+client for the event loop.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+
+from aioschluter.fleet import SchluterFleet
+from aioschluter.sharding import ShardedFleet
+from tests.mock_server import MockSchluterServer
+
+
+def serve(conn, groups, thermostats):
+    """Run the mock server until the parent closes the pipe."""
+
+    async def run():
+        async with MockSchluterServer(groups, thermostats, seed=1) as server:
+            conn.send(server.url)
+            await asyncio.get_running_loop().run_in_executor(None, conn.recv)
+
+    try:
+        asyncio.run(run())
+    except EOFError:
+        pass
+
+
+async def bench(label, fleet, accounts):
+    """Poll twice, the first time to log in, and print the second poll."""
+    async with fleet:
+        await fleet.async_poll_all()
+        start = time.perf_counter()
+        results = await fleet.async_poll_all()
+        seconds = time.perf_counter() - start
+    failed = sum(not result.success for result in results.values())
+    print(
+        f"  {label:<12} {seconds * 1e3:8.1f} ms  {accounts / seconds:8.1f} accounts/s"
+        + (f"  {failed} failed" if failed else "")
+    )
+
+
+async def main(args):
+    """Run the benchmark."""
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe()
+    server = context.Process(
+        target=serve, args=(child_conn, args.groups, args.thermostats), daemon=True
+    )
+    server.start()
+    url = parent_conn.recv()
+    credentials = {f"user{index}@example.org": "pw" for index in range(args.accounts)}
+    print(
+        f"{args.accounts} accounts, {args.groups}x{args.thermostats} thermostats each"
+    )
+    try:
+        await bench(
+            "in process",
+            SchluterFleet(
+                credentials,
+                max_concurrency=args.concurrency,
+                limit_per_host=args.concurrency,
+                base_url=url,
+            ),
+            args.accounts,
+        )
+        for workers in args.workers:
+            await bench(
+                f"{workers} worker(s)",
+                ShardedFleet(
+                    credentials,
+                    workers=workers,
+                    max_concurrency=args.concurrency,
+                    limit_per_host=args.concurrency,
+                    base_url=url,
+                ),
+                args.accounts,
+            )
+    finally:
+        parent_conn.close()
+        server.join(5)
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--accounts", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=4)
+    parser.add_argument("--thermostats", type=int, default=25)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
@@ -0,0 +1,86 @@
+"""Compare blocking calls through SyncSchluterClient with asyncio.run per call.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_sync --calls 200 --threads 1 8
+
+The baseline creates a client session, logs in and fetches the thermostats
+in a new event loop for every call, as a cron script or Celery task would
+without the synchronous client. The mock server runs in its own process.
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from aiohttp import ClientSession
+
+from aioschluter import SchluterApi
+from aioschluter.sync import SyncSchluterClient
+
+from .bench_sharding import serve
+
+USERNAME = "user@example.org"
+
+
+def fetch_per_call(url):
+    """Fetch the thermostats with a new loop, session and login."""
+
+    async def fetch():
+        async with ClientSession() as websession:
+            api = SchluterApi(websession, base_url=url)
+            sessionid = await api.async_get_sessionid(USERNAME, "pw")
+            return await api.async_get_current_thermostats(sessionid)
+
+    return asyncio.run(fetch())
+
+
+def bench(label, func, calls, threads):
+    """Run ``func`` ``calls`` times from ``threads`` threads and print the rate."""
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as executor:
+        list(executor.map(lambda _: func(), range(calls)))
+    seconds = time.perf_counter() - start
+    print(
+        f"  {label:<12} threads={threads:<3} {seconds * 1e3:8.1f} ms"
+        f"  {seconds / calls * 1e3:6.2f} ms/call"
+    )
+
+
+def main(args):
+    """Run the benchmark."""
+    context = multiprocessing.get_context("spawn")
+    parent_conn, child_conn = context.Pipe()
+    server = context.Process(
+        target=serve, args=(child_conn, args.groups, args.thermostats), daemon=True
+    )
+    server.start()
+    url = parent_conn.recv()
+    print(f"{args.calls} calls, {args.groups}x{args.thermostats} thermostats")
+    try:
+        for threads in args.threads:
+            bench("per call", lambda: fetch_per_call(url), args.calls, threads)
+            with SyncSchluterClient({USERNAME: "pw"}, base_url=url) as client:
+                client.get_current_thermostats()
+                bench(
+                    "sync client", client.get_current_thermostats, args.calls, threads
+                )
+    finally:
+        parent_conn.close()
+        server.join(5)
+
+
+def parse_args():
+    """Parse the command line."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--groups", type=int, default=2)
+    parser.add_argument("--thermostats", type=int, default=10)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
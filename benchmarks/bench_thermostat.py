@@ -0,0 +1,127 @@
+"""Compare the footprint and build cost of Thermostat with the dict based class.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_thermostat --count 20000
+"""
+
+import argparse
+import copy
+import json
+import timeit
+import tracemalloc
+
+from aioschluter import SchluterApi
+from aioschluter.thermostat import Thermostat
+
+FIXTURE = "tests/fixtures/thermostats_data.json"
+
+
+class DictThermostat:
+    """The previous Thermostat layout: one instance __dict__ per object."""
+
+    # pylint: disable=too-few-public-methods,too-many-statements
+
+    def __init__(self, data):
+        """Initialize."""
+        self._serial_number = data["SerialNumber"]
+        self._name = data["Room"]
+        self._group_name = data["GroupName"]
+        self._group_id = data["GroupId"]
+        self._temperature = data["Temperature"]
+        self._set_point_temp = data["SetPointTemp"]
+        self._regulation_mode = data["RegulationMode"]
+        self._vacation_enabled = data["VacationEnabled"]
+        self._vacation_begin_day = data["VacationBeginDay"]
+        self._vacation_end_day = data["VacationEndDay"]
+        self._vacation_temperature = data["VacationTemperature"]
+        self._comfort_temperature = data["ComfortTemperature"]
+        self._comfort_end_time = data["ComfortEndTime"]
+        self._manual_temp = data["ManualTemperature"]
+        self._is_online = data["Online"]
+        self._is_heating = data["Heating"]
+        self._is_early_start_of_heating = data["EarlyStartOfHeating"]
+        self._max_temp = data["MaxTemp"]
+        self._min_temp = data["MinTemp"]
+        self._error_code = data["ErrorCode"]
+        self._is_confirmed = data["Confirmed"]
+        self._email = data["Email"]
+        self._tz_offset = data["TZOffset"]
+        self._kwh_charge = data["KwhCharge"]
+        self._is_load_measuring_active = data["LoadMeasuringActive"]
+        self._load_manually_set_watt = data["LoadManuallySetWatt"]
+        self._load_measured_watt = data["LoadMeasuredWatt"]
+        self._sw_version = data["SWVersion"]
+        self._is_assigned = data["HasBeenAssigned"]
+        self._distributer_id = data["DistributerId"]
+        self._support = data["Support"]
+
+    @property
+    def temperature(self):
+        """Temperature, converted on every read."""
+        return round((self._temperature / 100) * 2) / 2
+
+
+def build_payload(count):
+    """Build a thermostats payload with ``count`` thermostats."""
+    with open(FIXTURE, encoding="utf-8") as file:
+        template = json.load(file)["Groups"][0]["Thermostats"][0]
+    thermostats = []
+    for index in range(count):
+        tdata = copy.deepcopy(template)
+        tdata["SerialNumber"] = str(index)
+        thermostats.append(tdata)
+    return {
+        "Groups": [{"GroupName": "Bench", "GroupId": 1, "Thermostats": thermostats}]
+    }
+
+
+def extract(data, cls):
+    """Mirror SchluterApi._extract_thermostats_from_data for ``cls``."""
+    return {
+        tdata["SerialNumber"]: cls(tdata)
+        for group in data["Groups"]
+        for tdata in group["Thermostats"]
+    }
+
+
+def measure_memory(data, cls):
+    """Return the bytes allocated per thermostat while building ``cls``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    thermostats = extract(data, cls)
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (after - before) / len(thermostats)
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    data = build_payload(args.count)
+    print(f"{args.count} thermostats")
+    for label, build in (
+        ("dict based", lambda: extract(data, DictThermostat)),
+        ("slots", lambda: SchluterApi._extract_thermostats_from_data(data)),
+    ):
+        seconds = min(timeit.repeat(build, number=1, repeat=args.repeat))
+        print(f"  {label:<10} build: {seconds * 1e3:8.2f} ms")
+
+    for label, cls in (("dict based", DictThermostat), ("slots", Thermostat)):
+        print(f"  {label:<10} memory: {measure_memory(data, cls):8.1f} B/thermostat")
+
+    legacy = DictThermostat(data["Groups"][0]["Thermostats"][0])
+    current = Thermostat(data["Groups"][0]["Thermostats"][0])
+    for label, obj in (("dict based", legacy), ("slots", current)):
+        seconds = min(
+            timeit.repeat(lambda o=obj: o.temperature, number=100000, repeat=3)
+        )
+        print(f"  {label:<10} temperature read: {seconds * 1e4:6.1f} ns")
+
+
+if __name__ == "__main__":
+    main()
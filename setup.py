@@ -20,7 +20,7 @@ setup(
     include_package_data=True,
     url="https://github.com/IngoS11/aioschluter",
     license="MIT License",
-    packages=find_packages(exclude=["tests"]),
+    packages=find_packages(exclude=["tests", "benchmarks"]),
     package_data={"nettigo_air_monitor": ["py.typed"]},
     python_requires=">=3.9",
     install_requires=install_requires,
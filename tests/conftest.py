@@ -0,0 +1,40 @@
+"""Shared fixtures and constants for the aioschluter tests."""
+
+import json
+import re
+
+import pytest
+
+AUTH_URL = "https://ditra-heat-e-wifi.schluter.com/api/authenticate/user"
+THERMOSTATS_URL = re.compile(
+    r"^https://ditra-heat-e-wifi\.schluter\.com/api/thermostats\?sessionId=.*$"
+)
+THERMOSTAT_URL = re.compile(
+    r"^https://ditra-heat-e-wifi\.schluter\.com/api/thermostat\?.*$"
+)
+
+
+def thermostat_url(serialnumber):
+    """Return a pattern matching writes to one thermostat."""
+    return re.compile(
+        r"^https://ditra-heat-e-wifi\.schluter\.com/api/thermostat\?"
+        rf".*serialnumber={serialnumber}(&.*)?$"
+    )
+
+
+def load_fixture(name):
+    """Load a json fixture."""
+    with open(f"tests/fixtures/{name}", encoding="utf-8") as file:
+        return json.load(file)
+
+
+def load_raw_fixture(name):
+    """Load a fixture as bytes."""
+    with open(f"tests/fixtures/{name}", "rb") as file:
+        return file.read()
+
+
+@pytest.fixture(name="thermostat_data")
+def fixture_thermostat_data():
+    """Return the raw data of the first thermostat in the fixture."""
+    return load_fixture("thermostats_data.json")["Groups"][0]["Thermostats"][0]
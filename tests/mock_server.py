@@ -0,0 +1,259 @@
+"""Local stand-in for the Schluter cloud API.
+
+The server implements the three endpoints used by SchluterApi on top of
+synthetic accounts. Latency, session expiry and server errors can be injected
+to see how the client behaves under load::
+
+    async with MockSchluterServer(groups=4, thermostats_per_group=25) as server:
+        api = SchluterApi(websession, base_url=server.url)
+"""
+
+import asyncio
+import hashlib
+import json
+import random
+import secrets
+import time
+from collections import Counter
+from typing import Any, Optional
+
+from aiohttp import web
+
+from aioschluter import const
+
+INVALID_PASSWORD = "invalid"
+
+
+def make_thermostat(email: str, group_id: int, group_name: str, index: int):
+    """Return the raw data of one synthetic thermostat."""
+    digest = hashlib.sha1(f"{email}/{group_id}/{index}".encode()).hexdigest()  # nosec
+    seed = int(digest[:8], 16)
+    return {
+        "SerialNumber": str(1000000 + seed % 9000000),
+        "Room": f"Room {group_id}-{index}",
+        "GroupName": group_name,
+        "GroupId": group_id,
+        "Temperature": 1800 + seed % 800,
+        "SetPointTemp": 2000,
+        "RegulationMode": 1,
+        "VacationEnabled": False,
+        "VacationBeginDay": "01/01/1970 00:00:00",
+        "VacationEndDay": "01/01/1970 00:00:00",
+        "VacationTemperature": 500,
+        "ComfortTemperature": 2944,
+        "ComfortEndTime": "28/04/2022 14:30:00 +00:00",
+        "ManualTemperature": 2300,
+        "LastPrimaryModeIsAuto": True,
+        "Online": seed % 10 != 0,
+        "Heating": seed % 3 == 0,
+        "EarlyStartOfHeating": False,
+        "MaxTemp": 4000,
+        "MinTemp": 500,
+        "ErrorCode": 0,
+        "Confirmed": True,
+        "Email": email,
+        "TZOffset": "-07:00",
+        "Assigned": True,
+        "KwhCharge": 0.25,
+        "LoadMeasuringActive": True,
+        "LoadManuallySetWatt": 100,
+        "LoadMeasuredWatt": 500 + seed % 500,
+        "SWVersion": "1012P201",
+        "HasBeenAssigned": True,
+        "DistributerId": 10207,
+        "Schedules": [],
+        "Support": {"Phone": "", "Email": "", "Url": ""},
+    }
+
+
+def make_groups(email: str, groups: int, thermostats_per_group: int):
+    """Return the groups of a synthetic account."""
+    result = []
+    for group_index in range(groups):
+        group_id = 1000 + group_index
+        group_name = f"Group {group_index}"
+        result.append(
+            {
+                "GroupName": group_name,
+                "GroupId": group_id,
+                "AwayMode": False,
+                "Thermostats": [
+                    make_thermostat(email, group_id, group_name, index)
+                    for index in range(thermostats_per_group)
+                ],
+            }
+        )
+    return result
+
+
+class MockSchluterServer:
+    """Serve synthetic Schluter accounts on a local port.
+
+    Every username is accepted unless the password is ``"invalid"``; its
+    account is created with ``groups`` groups of ``thermostats_per_group``
+    thermostats on first login. ``latency`` is a ``(min, max)`` range of
+    seconds added to every response, ``session_ttl`` makes session ids expire
+    and ``error_rate`` is the fraction of requests answered with HTTP 503.
+    With ``etag`` thermostat responses carry an ETag and are answered with
+    HTTP 304 when it matches, with ``compress`` they are compressed for
+    clients accepting it.
+    """
+
+    # pylint: disable=consider-alternative-union-syntax
+
+    def __init__(
+        self,
+        groups: int = 1,
+        thermostats_per_group: int = 5,
+        latency: tuple[float, float] = (0.0, 0.0),
+        session_ttl: Optional[float] = None,
+        error_rate: float = 0.0,
+        seed: Optional[int] = None,
+        etag: bool = False,
+        compress: bool = False,
+    ):
+        """Initialize."""
+        self.groups = groups
+        self.thermostats_per_group = thermostats_per_group
+        self.latency = latency
+        self.session_ttl = session_ttl
+        self.error_rate = error_rate
+        self.etag = etag
+        self.compress = compress
+        self.requests: Counter = Counter()
+        self._random = random.Random(seed)  # nosec
+        self._accounts: dict[str, list[dict[str, Any]]] = {}
+        self._sessions: dict[str, tuple[str, float]] = {}
+        self._runner: Optional[web.AppRunner] = None
+        self._url: Optional[str] = None
+
+    @property
+    def url(self) -> str:
+        """Base url of the running server."""
+        if self._url is None:
+            raise RuntimeError("The server is not running")
+        return self._url
+
+    def account(self, email: str) -> list[dict[str, Any]]:
+        """Return the groups of an account, creating it if needed."""
+        if email not in self._accounts:
+            self._accounts[email] = make_groups(
+                email, self.groups, self.thermostats_per_group
+            )
+        return self._accounts[email]
+
+    def expire_sessions(self) -> None:
+        """Invalidate every session id handed out so far."""
+        self._sessions.clear()
+
+    def _app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_post(const.API_AUTH_PATH, self._handle_auth)
+        app.router.add_get(const.API_GET_THERMOSTATS_PATH, self._handle_get_thermostats)
+        app.router.add_post(const.API_SET_THERMOSTAT_PATH, self._handle_set_thermostat)
+        return app
+
+    async def _inject(self, endpoint: str) -> Optional[web.Response]:
+        self.requests[endpoint] += 1
+        low, high = self.latency
+        if high > 0:
+            await asyncio.sleep(self._random.uniform(low, high))
+        if self.error_rate and self._random.random() < self.error_rate:
+            return web.Response(status=503)
+        return None
+
+    def _session_email(self, request: web.Request) -> Optional[str]:
+        if (session := self._sessions.get(request.query.get("sessionId", ""))) is None:
+            return None
+        email, created = session
+        if (
+            self.session_ttl is not None
+            and time.monotonic() - created > self.session_ttl
+        ):
+            del self._sessions[request.query["sessionId"]]
+            return None
+        return email
+
+    async def _handle_auth(self, request: web.Request) -> web.Response:
+        if (error := await self._inject("auth")) is not None:
+            return error
+        body = await request.json()
+        email = body.get("Email", "")
+        if body.get("Password") == INVALID_PASSWORD:
+            return web.json_response({"SessionId": "", "ErrorCode": 2})
+        sessionid = secrets.token_urlsafe(16)
+        self._sessions[sessionid] = (email, time.monotonic())
+        self.account(email)
+        return web.json_response(
+            {
+                "SessionId": sessionid,
+                "NewAccount": False,
+                "ErrorCode": 0,
+                "RoleType": 3000,
+                "Email": email,
+                "Language": "EN",
+            }
+        )
+
+    async def _handle_get_thermostats(self, request: web.Request) -> web.Response:
+        if (error := await self._inject("get_thermostats")) is not None:
+            return error
+        if (email := self._session_email(request)) is None:
+            return web.Response(status=401)
+        body = json.dumps({"Groups": self.account(email)}).encode()
+        headers = {}
+        if self.etag:
+            headers["ETag"] = '"' + hashlib.sha1(body).hexdigest() + '"'  # nosec
+            if request.headers.get("If-None-Match") == headers["ETag"]:
+                return web.Response(status=304, headers=headers)
+        response = web.Response(
+            body=body, content_type="application/json", headers=headers
+        )
+        if self.compress:
+            response.enable_compression()
+        return response
+
+    async def _handle_set_thermostat(self, request: web.Request) -> web.Response:
+        if (error := await self._inject("set_thermostat")) is not None:
+            return error
+        if (email := self._session_email(request)) is None:
+            return web.Response(status=401)
+        body = await request.json()
+        serialnumber = request.query.get("serialnumber")
+        for group in self.account(email):
+            for thermostat in group["Thermostats"]:
+                if thermostat["SerialNumber"] != serialnumber:
+                    continue
+                if "ManualTemperature" in body:
+                    thermostat["ManualTemperature"] = body["ManualTemperature"]
+                    thermostat["SetPointTemp"] = body["ManualTemperature"]
+                if "RegulationMode" in body:
+                    thermostat["RegulationMode"] = body["RegulationMode"]
+                return web.json_response({"Success": True})
+        return web.json_response({"Success": False})
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Start serving and return the base url."""
+        self._runner = web.AppRunner(self._app(), access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port)
+        await site.start()
+        sockets = site._server.sockets  # pylint: disable=protected-access
+        self._url = f"http://{host}:{sockets[0].getsockname()[1]}"
+        return self._url
+
+    async def async_stop(self) -> None:
+        """Stop serving."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+            self._url = None
+
+    async def __aenter__(self) -> "MockSchluterServer":
+        """Start the server."""
+        await self.async_start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        """Stop the server."""
+        await self.async_stop()
@@ -0,0 +1,89 @@
+"""Tests for the aioschluter batch writer."""
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import ApiError, InvalidSessionIdError, SchluterApi
+from aioschluter.batch import BatchWriter, WriteTarget
+from aioschluter.const import REGULATION_MODE_AWAY
+
+from .conftest import load_fixture, thermostat_url
+
+
+@pytest.mark.asyncio
+async def test_batch_write_reports_per_serial_results():
+    """Test that failures are reported per serial without aborting the batch."""
+    success_data = load_fixture("thermostat_set_data.json")
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(thermostat_url("1"), payload=success_data, repeat=True)
+        session_mock.post(thermostat_url("2"), status=500)
+        session_mock.post(thermostat_url("2"), payload=success_data)
+        session_mock.post(thermostat_url("3"), status=401, repeat=True)
+        writer = BatchWriter(SchluterApi(websession), retry_delay=0)
+        results = await writer.async_write(
+            "abcd",
+            {
+                "1": WriteTarget(
+                    temperature=21.5, regulation_mode=REGULATION_MODE_AWAY
+                ),
+                "2": 19.0,
+                "3": 18.0,
+            },
+        )
+
+    await websession.close()
+    assert results["1"].success and results["1"].attempts == 1
+    assert results["2"].success and results["2"].attempts == 2
+    assert not results["3"].success
+    assert isinstance(results["3"].error, InvalidSessionIdError)
+
+
+@pytest.mark.asyncio
+async def test_batch_write_gives_up_after_retries():
+    """Test that a persistently failing write stops after the retries."""
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(thermostat_url("1"), status=503, repeat=True)
+        writer = BatchWriter(SchluterApi(websession), retries=2, retry_delay=0)
+        results = await writer.async_write("abcd", {"1": 20.0})
+
+    await websession.close()
+    assert results["1"].attempts == 3
+    assert isinstance(results["1"].error, ApiError)
+
+
+@pytest.mark.asyncio
+async def test_queued_writes_are_merged():
+    """Test that only the latest queued values for a serial are sent."""
+    success_data = load_fixture("thermostat_set_data.json")
+
+    writer = BatchWriter(None)
+    writer.queue("1", temperature=20.0)
+    writer.queue("1", regulation_mode=REGULATION_MODE_AWAY)
+    writer.queue("1", temperature=22.0)
+    assert writer.pending == {"1": WriteTarget(temperature=22.0)}
+    writer.queue("1", regulation_mode=REGULATION_MODE_AWAY)
+    assert writer.pending == {
+        "1": WriteTarget(temperature=22.0, regulation_mode=REGULATION_MODE_AWAY)
+    }
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(thermostat_url("1"), payload=success_data, repeat=True)
+        writer = BatchWriter(SchluterApi(websession))
+        writer.queue("1", temperature=20.0)
+        writer.queue("1", temperature=22.0)
+        results = await writer.async_flush("abcd")
+        bodies = [
+            call.kwargs["json"]
+            for key, calls in session_mock.requests.items()
+            for call in calls
+        ]
+
+    await websession.close()
+    assert results["1"].success
+    assert not writer.pending
+    assert [body["ManualTemperature"] for body in bodies] == [2200]
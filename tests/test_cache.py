@@ -0,0 +1,79 @@
+"""Tests for the aioschluter response cache."""
+
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import SchluterApi
+from aioschluter.cache import CachedSchluterApi
+
+from .conftest import THERMOSTAT_URL, THERMOSTATS_URL, load_fixture
+
+
+def count_requests(session_mock, method):
+    """Count the requests issued with the given method."""
+    return sum(
+        len(calls) for key, calls in session_mock.requests.items() if key[0] == method
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_are_coalesced():
+    """Test that concurrent callers share one request and later ones hit the cache."""
+    thermostat_data = load_fixture("thermostats_data.json")
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data, repeat=True)
+        cache = CachedSchluterApi(SchluterApi(websession), ttl=60)
+        results = await asyncio.gather(
+            *(cache.async_get_current_thermostats("abcd") for _ in range(5))
+        )
+        await cache.async_get_current_thermostats("abcd")
+        get_count = count_requests(session_mock, "GET")
+
+    await websession.close()
+    assert get_count == 1
+    assert all(result["1084135"].name == "Bathroom" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_successful_write_invalidates_entry():
+    """Test that writing a thermostat forces the next read to the API."""
+    thermostat_data = load_fixture("thermostats_data.json")
+    success_data = load_fixture("thermostat_set_data.json")
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data, repeat=True)
+        session_mock.post(THERMOSTAT_URL, payload=success_data)
+        cache = CachedSchluterApi(SchluterApi(websession), ttl=60)
+        await cache.async_get_current_thermostats("abcd")
+        assert await cache.async_set_temperature("abcd", "1084135", 21.5)
+        assert len(cache) == 0
+        await cache.async_get_current_thermostats("abcd")
+        get_count = count_requests(session_mock, "GET")
+
+    await websession.close()
+    assert get_count == 2
+
+
+@pytest.mark.asyncio
+async def test_least_recently_used_entry_is_evicted():
+    """Test that the cache never holds more than maxsize session ids."""
+    thermostat_data = load_fixture("thermostats_data.json")
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data, repeat=True)
+        cache = CachedSchluterApi(SchluterApi(websession), ttl=60, maxsize=2)
+        for sessionid in ("first", "second", "first", "third"):
+            await cache.async_get_current_thermostats(sessionid)
+        get_count = count_requests(session_mock, "GET")
+
+    await websession.close()
+    assert len(cache) == 2
+    assert get_count == 3
+    assert cache.sessionid == "third"
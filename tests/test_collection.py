@@ -0,0 +1,121 @@
+"""Tests for the aioschluter thermostat collection."""
+
+import copy
+import pickle
+
+import pytest
+
+from aioschluter import SchluterApi
+from aioschluter.collection import ThermostatCollection
+from aioschluter.thermostat import Thermostat
+
+from .conftest import load_fixture
+
+
+@pytest.fixture(name="thermostats_data")
+def fixture_thermostats_data():
+    """Return the thermostats fixture with a second, offline thermostat."""
+    data = load_fixture("thermostats_data.json")
+    other = copy.deepcopy(data["Groups"][0]["Thermostats"][0])
+    other.update(
+        SerialNumber="2000",
+        GroupId=99,
+        GroupName="Cabin",
+        Online=False,
+        Heating=True,
+        RegulationMode=2,
+    )
+    data["Groups"].append({"GroupId": 99, "GroupName": "Cabin", "Thermostats": [other]})
+    return data
+
+
+def test_extracted_thermostats_are_indexed(thermostats_data):
+    """Test that the api returns a dict compatible indexed collection."""
+    # pylint: disable=protected-access
+    thermostats = SchluterApi._extract_thermostats_from_data(thermostats_data)
+
+    assert isinstance(thermostats, dict)
+    assert thermostats["1084135"].name == "Bathroom"
+    assert list(thermostats.offline()) == ["2000"]
+    assert list(thermostats.heating()) == ["2000"]
+    assert list(thermostats.in_group(99)) == ["2000"]
+    assert list(thermostats.with_regulation_mode(2)) == ["2000"]
+    assert thermostats.group_names[99] == "Cabin"
+    assert thermostats.counts("is_online") == {True: 1, False: 1}
+
+
+def test_indexes_follow_changes(thermostats_data):
+    """Test that snapshots, deletions and updates keep the indexes right."""
+    collection = ThermostatCollection.from_groups(thermostats_data["Groups"])
+    online = copy.deepcopy(thermostats_data["Groups"][1]["Thermostats"][0])
+    online["Online"] = True
+
+    collection.apply_snapshot({"2000": Thermostat(online)})
+    assert list(collection) == ["2000"]
+    assert list(collection.online()) == ["2000"]
+    assert not collection.offline()
+    assert collection.group_ids == [99]
+
+    collection.pop("2000")
+    assert not collection.online()
+    assert not collection.group_names
+
+    merged = collection | {"2000": Thermostat(online)}
+    assert isinstance(merged, ThermostatCollection)
+    assert list(merged.in_group(99)) == ["2000"]
+    assert not collection
+    collection |= {"2000": Thermostat(online)}
+    assert list(collection.in_group(99)) == ["2000"]
+    with pytest.raises(ValueError):
+        collection.where("name", "Bathroom")
+
+
+def test_copy_and_pickle_keep_indexes(thermostats_data):
+    """Test that copies rebuild their own indexes."""
+    collection = ThermostatCollection.from_groups(thermostats_data["Groups"])
+
+    for clone in (collection.copy(), pickle.loads(pickle.dumps(collection))):
+        assert isinstance(clone, ThermostatCollection)
+        assert list(clone.offline()) == ["2000"]
+        del clone["2000"]
+        assert list(collection.offline()) == ["2000"]
+
+
+def test_copies_share_indexes_until_changed(thermostats_data):
+    """Test that a copy reuses the indexes and either side can still change."""
+    # pylint: disable=protected-access
+    collection = ThermostatCollection.from_groups(thermostats_data["Groups"])
+    clone = collection.copy()
+    assert clone._indexes is collection._indexes
+
+    collection.pop("2000")
+    assert clone._indexes is not collection._indexes
+    assert list(clone.offline()) == ["2000"]
+    assert clone.group_names[99] == "Cabin"
+    assert not collection.offline()
+    assert 99 not in collection.group_names
+
+    other = clone.copy()
+    other.clear()
+    assert list(clone.offline()) == ["2000"]
+
+
+def test_group_names_only_cover_groups_with_thermostats(thermostats_data):
+    """Test that empty groups have no name, whether built or emptied by a move."""
+    thermostats_data["Groups"].append(
+        {"GroupId": 7, "GroupName": "Empty", "Thermostats": []}
+    )
+    collection = ThermostatCollection.from_groups(thermostats_data["Groups"])
+    assert collection.group_names == {5774: "MyGroup", 99: "Cabin"}
+
+    moved = copy.deepcopy(thermostats_data["Groups"][1]["Thermostats"][0])
+    moved.update(GroupId=5774, GroupName="MyGroup")
+    collection["2000"] = Thermostat(moved)
+    assert collection.group_ids == [5774]
+    assert collection.group_names == {5774: "MyGroup"}
+
+
+def test_fromkeys_is_refused():
+    """Test that fromkeys cannot bypass the serial numbers of the thermostats."""
+    with pytest.raises(TypeError):
+        ThermostatCollection.fromkeys(["1084135"])
@@ -0,0 +1,103 @@
+"""Tests for the aioschluter columnar export."""
+
+import copy
+import sys
+from array import array
+
+import pytest
+
+from aioschluter.collection import ThermostatCollection
+from aioschluter.columnar import (
+    GROUP_NAME,
+    SERIAL_NUMBER,
+    TIMESTAMP,
+    ColumnarSnapshots,
+    to_columnar,
+)
+
+from .conftest import load_fixture
+
+
+@pytest.fixture(name="snapshot")
+def fixture_snapshot():
+    """Return a snapshot with a second thermostat in another group."""
+    data = load_fixture("thermostats_data.json")
+    other = copy.deepcopy(data["Groups"][0]["Thermostats"][0])
+    other.update(SerialNumber="2000", GroupId=99, GroupName="Cabin", Heating=True)
+    data["Groups"].append({"GroupId": 99, "GroupName": "Cabin", "Thermostats": [other]})
+    return ThermostatCollection.from_groups(data["Groups"])
+
+
+def test_snapshots_are_split_into_typed_columns(snapshot):
+    """Test that every field ends up in its own typed array."""
+    columns = to_columnar([(100.0, snapshot), (160.0, snapshot)])
+
+    assert len(columns) == 4
+    assert list(columns.column(TIMESTAMP)) == [100.0, 100.0, 160.0, 160.0]
+    assert columns.column("temperature").typecode == "f"
+    assert list(columns.column("is_heating")) == [0, 1, 0, 1]
+    assert list(columns.column(SERIAL_NUMBER)) == [0, 1, 0, 1]
+    assert columns.dictionaries[SERIAL_NUMBER] == ["1084135", "2000"]
+    assert columns.decode(GROUP_NAME)[1] == "Cabin"
+    assert columns.row(1)["group_id"] == 99
+
+
+def test_file_round_trip_is_memory_mapped(snapshot, tmp_path):
+    """Test that a written file is read back as views into the mapping."""
+    path = str(tmp_path / "snapshot.col")
+    columns = to_columnar(snapshot)
+    columns.write(path)
+
+    with ColumnarSnapshots.open(path) as mapped:
+        temperature = mapped.column("temperature")
+        assert isinstance(temperature, memoryview)
+        assert temperature.readonly
+        assert list(temperature) == list(columns.column("temperature"))
+        assert mapped.column_names == columns.column_names
+        assert mapped.row(1) == columns.row(1)
+    assert not mapped.column_names
+
+
+def test_other_byte_order_is_swapped(snapshot, tmp_path, monkeypatch):
+    """Test that a file written on a machine of the other byte order is read."""
+    path = str(tmp_path / "swapped.col")
+    columns = to_columnar([(100.0, snapshot), (160.0, snapshot)])
+    swapped = {}
+    for name in columns.column_names:
+        swapped[name] = array(columns.column(name).typecode, columns.column(name))
+        swapped[name].byteswap()
+    other = "big" if sys.byteorder == "little" else "little"
+    with monkeypatch.context() as patch:
+        patch.setattr(sys, "byteorder", other)
+        ColumnarSnapshots(swapped, columns.dictionaries).write(path)
+
+    with ColumnarSnapshots.open(path) as mapped:
+        assert len(mapped) == 4
+        for name in columns.column_names:
+            assert list(mapped.column(name)) == list(columns.column(name))
+        assert mapped.row(1) == columns.row(1)
+
+
+def test_open_rejects_other_files(tmp_path):
+    """Test that files without the magic bytes are rejected."""
+    path = tmp_path / "other.col"
+    path.write_bytes(b"not a columnar file")
+
+    with pytest.raises(ValueError):
+        ColumnarSnapshots.open(str(path))
+
+
+def test_open_rejects_other_item_sizes(snapshot, tmp_path):
+    """Test that a file written where a typecode had another size is rejected."""
+    path = tmp_path / "other.col"
+    to_columnar(snapshot).write(str(path))
+    itemsize = array("I").itemsize
+    data = path.read_bytes()
+    written = f'"typecode": "I", "itemsize": {itemsize}'.encode()
+    assert written in data
+    path.write_bytes(
+        data.replace(written, f'"typecode": "I", "itemsize": {itemsize * 2}'.encode())
+    )
+
+    with pytest.raises(ValueError, match="byte items"):
+        ColumnarSnapshots.open(str(path))
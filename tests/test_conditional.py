@@ -0,0 +1,103 @@
+"""Tests for conditional thermostat requests."""
+
+import json
+import logging
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import SchluterApi
+from aioschluter.fleet import SchluterFleet
+
+from .conftest import THERMOSTATS_URL, load_fixture
+from .mock_server import MockSchluterServer
+
+
+@pytest.mark.asyncio
+async def test_identical_body_is_not_decoded_again():
+    """Test that a repeated body returns a copy of the previous collection."""
+    thermostat_data = load_fixture("thermostats_data.json")
+    body = json.dumps(thermostat_data)
+    changed = dict(thermostat_data, Extra=True)
+    decoded = []
+
+    def decoder(data):
+        decoded.append(data)
+        return json.loads(data)
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        for _ in range(3):
+            session_mock.get(THERMOSTATS_URL, body=body)
+        session_mock.get(THERMOSTATS_URL, body=json.dumps(changed))
+        api = SchluterApi(websession, json_decoder=decoder, conditional=True)
+        first = await api.async_get_current_thermostats("sessionid")
+        second = await api.async_get_current_thermostats("sessionid")
+        assert second == first
+        assert second is not first
+        first.clear()
+        second.pop("1084135")
+        third = await api.async_get_current_thermostats("sessionid")
+        fourth = await api.async_get_current_thermostats("sessionid")
+    await websession.close()
+
+    assert third["1084135"].name == "Bathroom"
+    assert fourth["1084135"].name == "Bathroom"
+    assert len(decoded) == 2
+    state = api.conditional_state
+    assert (state.changed, state.unchanged, state.not_modified) == (2, 2, 0)
+
+
+@pytest.mark.asyncio
+async def test_etag_revalidation_with_compression(caplog):
+    """Test that a matching ETag is answered with 304 and reused."""
+    caplog.set_level(logging.DEBUG, logger="aioschluter.api")
+    async with MockSchluterServer(etag=True, compress=True) as server:
+        async with ClientSession() as websession:
+            api = SchluterApi(websession, base_url=server.url, conditional=True)
+            sessionid = await api.async_get_sessionid("user@example.org", "pw")
+            first = await api.async_get_current_thermostats(sessionid)
+            second = await api.async_get_current_thermostats(sessionid)
+            group = server.account("user@example.org")[0]
+            group["Thermostats"][0]["SetPointTemp"] = 2500
+            third = await api.async_get_current_thermostats(sessionid)
+
+    assert api.conditional_state.etag is not None
+    assert second == first
+    assert api.conditional_state.not_modified == 1
+    assert "status: 304" in caplog.text
+    serial = group["Thermostats"][0]["SerialNumber"]
+    assert third[serial].set_point_temp == 25.0
+
+
+@pytest.mark.asyncio
+async def test_conditional_requests_are_opt_in():
+    """Test that every response is decoded without conditional requests."""
+    thermostat_data = load_fixture("thermostats_data.json")
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data, repeat=True)
+        api = SchluterApi(websession)
+        first = await api.async_get_current_thermostats("sessionid")
+        second = await api.async_get_current_thermostats("sessionid")
+    await websession.close()
+
+    assert second is not first
+    assert api.conditional_state is None
+
+
+@pytest.mark.asyncio
+async def test_fleet_sends_conditional_requests():
+    """Test that a fleet passes conditional requests on to its accounts."""
+    async with MockSchluterServer(etag=True) as server:
+        async with SchluterFleet(
+            {"user@example.org": "pw"}, base_url=server.url, conditional=True
+        ) as fleet:
+            await fleet.async_poll_all()
+            second = await fleet.async_poll_all()
+            state = fleet.api("user@example.org").conditional_state
+
+    assert second["user@example.org"].success
+    assert state.not_modified == 1
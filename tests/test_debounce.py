@@ -0,0 +1,102 @@
+"""Tests for the aioschluter debounced writer."""
+
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import CallbackResult, aioresponses
+
+from aioschluter import SchluterApi
+from aioschluter.debounce import DebouncedWriter
+
+from .conftest import THERMOSTAT_URL, load_fixture
+
+
+@pytest.mark.asyncio
+async def test_rapid_writes_are_coalesced():
+    """Test that writes within the window result in one request."""
+    success_data = load_fixture("thermostat_set_data.json")
+    sent = []
+
+    def write_callback(url, **kwargs):
+        # pylint: disable=unused-argument
+        sent.append(kwargs["json"]["ManualTemperature"])
+        return CallbackResult(payload=success_data)
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(THERMOSTAT_URL, callback=write_callback, repeat=True)
+        writer = DebouncedWriter(SchluterApi(websession), window=0.01)
+        waiters = [
+            writer.set_temperature("abcd", "1084135", temperature)
+            for temperature in (20.0, 20.5, 21.0)
+        ]
+        assert writer.pending["1084135"].temperature == 21.0
+        results = await asyncio.gather(*waiters)
+
+    await websession.close()
+    assert results == [True, True, True]
+    assert sent == [2100]
+    assert not writer.pending
+
+
+@pytest.mark.asyncio
+async def test_writes_during_send_are_applied_last():
+    """Test that a value queued while a write is in flight is sent afterwards."""
+    success_data = load_fixture("thermostat_set_data.json")
+    sent = []
+
+    async def write_callback(url, **kwargs):
+        # pylint: disable=unused-argument
+        sent.append(kwargs["json"]["ManualTemperature"])
+        await asyncio.sleep(0.02)
+        return CallbackResult(payload=success_data)
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(THERMOSTAT_URL, callback=write_callback, repeat=True)
+        writer = DebouncedWriter(SchluterApi(websession), window=0)
+        first = writer.set_temperature("abcd", "1084135", 20.0)
+        await asyncio.sleep(0.005)
+        writer.set_temperature("abcd", "1084135", 21.0)
+        writer.set_temperature("abcd", "1084135", 22.0)
+        await first
+        await writer.async_flush()
+
+    await websession.close()
+    assert sent == [2000, 2200]
+
+
+@pytest.mark.asyncio
+async def test_temperature_after_mode_wins():
+    """Test that a temperature queued after a regulation mode is applied last."""
+    success_data = load_fixture("thermostat_set_data.json")
+    sent = []
+
+    def write_callback(url, **kwargs):
+        # pylint: disable=unused-argument
+        body = kwargs["json"]
+        if "ManualTemperature" in body:
+            sent.append(("temp", body["ManualTemperature"]))
+        else:
+            sent.append(("mode", body["RegulationMode"]))
+        return CallbackResult(payload=success_data)
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(THERMOSTAT_URL, callback=write_callback, repeat=True)
+        writer = DebouncedWriter(SchluterApi(websession), window=0.01)
+        waiters = [
+            writer.set_regulation_mode("abcd", "1084135", 1),
+            writer.set_temperature("abcd", "1084135", 22.0),
+        ]
+        results = await asyncio.gather(*waiters)
+        waiters = [
+            writer.set_temperature("abcd", "1084135", 20.0),
+            writer.set_regulation_mode("abcd", "1084135", 1),
+        ]
+        results += await asyncio.gather(*waiters)
+
+    await websession.close()
+    assert results == [True] * 4
+    assert sent == [("temp", 2200), ("temp", 2000), ("mode", 1)]
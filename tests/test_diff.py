@@ -0,0 +1,61 @@
+"""Tests for the aioschluter snapshot differ."""
+
+import copy
+
+from aioschluter.diff import ThermostatDiffer
+from aioschluter.thermostat import Thermostat
+
+
+def make_snapshot(*datas):
+    """Build a snapshot from raw thermostat data."""
+    return {data["SerialNumber"]: Thermostat(data) for data in datas}
+
+
+def test_first_update_reports_everything_as_added(thermostat_data):
+    """Test that the first snapshot only contains additions."""
+    differ = ThermostatDiffer()
+    diff = differ.update(make_snapshot(thermostat_data))
+    assert list(diff.added) == ["1084135"]
+    assert not diff.changed
+    assert not diff.removed
+
+
+def test_unchanged_snapshot_is_empty(thermostat_data):
+    """Test that an identical snapshot yields an empty diff."""
+    differ = ThermostatDiffer()
+    differ.update(make_snapshot(thermostat_data))
+    assert not differ.update(make_snapshot(copy.deepcopy(thermostat_data)))
+
+
+def test_changed_and_removed_thermostats(thermostat_data):
+    """Test that changed fields and removed thermostats are reported."""
+    other = copy.deepcopy(thermostat_data)
+    other["SerialNumber"] = "2000"
+    differ = ThermostatDiffer()
+    differ.update(make_snapshot(thermostat_data, other))
+
+    updated = copy.deepcopy(thermostat_data)
+    updated["Heating"] = True
+    updated["SetPointTemp"] = 2150
+    diff = differ.update(make_snapshot(updated))
+
+    assert list(diff.removed) == ["2000"]
+    change = diff.changed["1084135"]
+    assert change.changes == {
+        "set_point_temp": (20.0, 21.5),
+        "is_heating": (False, True),
+    }
+    assert change.previous.is_heating is False
+    assert change.thermostat.is_heating is True
+
+
+def test_single_field_differ(thermostat_data):
+    """Test that a differ tracking one field reports only that field."""
+    differ = ThermostatDiffer(fields=["is_online"])
+    differ.update(make_snapshot(thermostat_data))
+    updated = copy.deepcopy(thermostat_data)
+    updated["Heating"] = True
+    assert not differ.update(make_snapshot(updated))
+    updated["Online"] = False
+    diff = differ.update(make_snapshot(updated))
+    assert diff.changed["1084135"].changed_fields == ("is_online",)
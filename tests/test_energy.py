@@ -0,0 +1,77 @@
+"""Tests for the aioschluter energy aggregator."""
+
+import copy
+
+import pytest
+
+from aioschluter.energy import EnergyAggregator
+from aioschluter.thermostat import Thermostat
+
+
+def make_snapshot(data, *states):
+    """Build a snapshot of copies of ``data`` in the given states.
+
+    Every state is a tuple of serial number, group id, heating and watt.
+    """
+    snapshot = {}
+    for serial, group_id, heating, watt in states:
+        item = copy.deepcopy(data)
+        item.update(
+            SerialNumber=serial,
+            GroupId=group_id,
+            Heating=heating,
+            LoadMeasuredWatt=watt,
+            KwhCharge=0.2,
+        )
+        snapshot[serial] = Thermostat(item)
+    return snapshot
+
+
+def test_energy_is_integrated_between_polls(thermostat_data):
+    """Test that each interval counts with the state of its first poll."""
+    aggregator = EnergyAggregator()
+    aggregator.update(make_snapshot(thermostat_data, ("1", 10, True, 1000)), 0)
+    aggregator.update(make_snapshot(thermostat_data, ("1", 10, False, 1000)), 900)
+    aggregator.update(make_snapshot(thermostat_data, ("1", 10, True, 1000)), 1800)
+
+    room = aggregator.room("1")
+    assert room.kwh == 0.25
+    assert room.cost == pytest.approx(0.05)
+    assert room.seconds == 1800
+    assert room.duty_cycle == 0.5
+    assert room.name == "Bathroom"
+    assert aggregator.total.kwh == room.kwh
+
+
+def test_totals_roll_up_by_group_and_account(thermostat_data):
+    """Test that room totals are summed per group, account and in total."""
+    aggregator = EnergyAggregator()
+    for timestamp in (0, 600):
+        aggregator.update(
+            make_snapshot(thermostat_data, ("1", 10, True, 600), ("2", 20, True, 1200)),
+            timestamp,
+            account="home",
+        )
+        aggregator.update(
+            make_snapshot(thermostat_data, ("1", 10, True, 600)),
+            timestamp,
+            account="cabin",
+        )
+
+    assert aggregator.group(10, "home").kwh == 0.1
+    assert aggregator.group(20, "home").kwh == 0.2
+    assert aggregator.account("home").kwh == pytest.approx(0.3)
+    assert aggregator.account("cabin").kwh == 0.1
+    assert aggregator.total.kwh == pytest.approx(0.4)
+    assert set(aggregator.groups()) == {("home", 10), ("home", 20), ("cabin", 10)}
+
+
+def test_long_gaps_are_skipped(thermostat_data):
+    """Test that intervals longer than max_gap are not counted."""
+    aggregator = EnergyAggregator(max_gap=300)
+    aggregator.update(make_snapshot(thermostat_data, ("1", 10, True, 1000)), 0)
+    aggregator.update(make_snapshot(thermostat_data, ("1", 10, True, 1000)), 3600)
+    aggregator.update(make_snapshot(thermostat_data, ("1", 10, True, 1000)), 3780)
+
+    assert aggregator.room("1").seconds == 180
+    assert aggregator.room("1").kwh == 0.05
@@ -0,0 +1,84 @@
+"""Tests for the aioschluter fleet poller."""
+
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import CallbackResult, aioresponses
+
+from aioschluter import InvalidUserPasswordError
+from aioschluter.fleet import SchluterFleet
+
+from .conftest import AUTH_URL, THERMOSTATS_URL, load_fixture
+
+
+@pytest.mark.asyncio
+async def test_fleet_poll_isolates_failing_accounts():
+    """Test that a failing account does not prevent the others from reporting."""
+    valid = load_fixture("valid_user_data.json")
+    invalid = load_fixture("invalid_user_data.json")
+    thermostat_data = load_fixture("thermostats_data.json")
+
+    def auth_callback(url, **kwargs):
+        # pylint: disable=unused-argument
+        if kwargs["json"]["Email"].startswith("bad"):
+            return CallbackResult(payload=invalid)
+        return CallbackResult(payload=valid)
+
+    websession = ClientSession()
+    credentials = {"one@someplace.org": "pw", "bad@someplace.org": "pw"}
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, callback=auth_callback, repeat=True)
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data, repeat=True)
+        fleet = SchluterFleet(credentials, session=websession, max_concurrency=1)
+        results = await fleet.async_poll_all()
+
+    await websession.close()
+    assert set(results) == set(credentials)
+    assert results["one@someplace.org"].success
+    assert results["one@someplace.org"].thermostats["1084135"].name == "Bathroom"
+    assert not results["bad@someplace.org"].success
+    assert isinstance(results["bad@someplace.org"].error, InvalidUserPasswordError)
+
+
+def test_fleet_rejects_invalid_concurrency():
+    """Test that the concurrency limit has to be positive."""
+    with pytest.raises(ValueError):
+        SchluterFleet({}, max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_fleet_rejects_limit_per_host_with_a_session():
+    """Test that the connection limit is not silently ignored."""
+    websession = ClientSession()
+    with pytest.raises(ValueError):
+        SchluterFleet({}, session=websession, limit_per_host=2)
+    await websession.close()
+
+
+@pytest.mark.asyncio
+async def test_closing_the_poll_waits_for_cancelled_accounts():
+    """Test that accounts still polling are cancelled and awaited on close."""
+    cancelled = []
+
+    async def slow_poll(username, semaphore):
+        # pylint: disable=unused-argument
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            # Clean up asynchronously, like closing a connection.
+            await asyncio.sleep(0)
+            cancelled.append(username)
+            raise
+
+    fleet = SchluterFleet({"one@someplace.org": "pw", "two@someplace.org": "pw"})
+    # pylint: disable=protected-access
+    fleet._async_poll_account = slow_poll
+    poll = fleet.async_poll()
+    next_result = asyncio.ensure_future(poll.__anext__())
+    await asyncio.sleep(0)
+    next_result.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await next_result
+
+    assert sorted(cancelled) == ["one@someplace.org", "two@someplace.org"]
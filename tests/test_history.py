@@ -0,0 +1,85 @@
+"""Tests for the aioschluter thermostat history."""
+
+import pytest
+
+from aioschluter.history import RingBuffer, ThermostatHistory
+from aioschluter.thermostat import Thermostat
+
+
+def reading(data, temperature, heating, watt=1000):
+    """Return a snapshot with one thermostat in the given state."""
+    data = dict(
+        data,
+        Temperature=temperature * 100,
+        Heating=heating,
+        LoadMeasuredWatt=watt,
+        KwhCharge=0.5,
+    )
+    return {data["SerialNumber"]: Thermostat(data)}
+
+
+def test_ring_buffer_overwrites_oldest():
+    """Test that a full buffer keeps the newest values in order."""
+    buffer = RingBuffer("d", 3)
+    for value in range(5):
+        buffer.append(value)
+
+    assert len(buffer) == 3
+    assert list(buffer.to_array()) == [2.0, 3.0, 4.0]
+    assert buffer.last == 4.0
+    assert buffer.bisect_left(3) == 1
+    assert buffer.bisect_right(4) == 3
+    assert buffer.bisect_left(10) == 3
+
+
+def test_range_query_and_capacity(thermostat_data):
+    """Test that windows are selected by time and old readings dropped."""
+    history = ThermostatHistory(capacity=4)
+    for minute in range(6):
+        history.update(reading(thermostat_data, 20 + minute, False), minute * 60)
+
+    window = history.window("1084135", start=150, end=240)
+    assert list(window.timestamps) == [180.0, 240.0]
+    assert list(window.temperature) == [23.0, 24.0]
+    assert len(history.window("1084135")) == 4
+    assert "1084135" in history
+
+
+def test_aggregates(thermostat_data):
+    """Test mean, extremes, duty cycle and energy of a window."""
+    history = ThermostatHistory()
+    history.update(reading(thermostat_data, 20, True), 0)
+    history.update(reading(thermostat_data, 21, True), 1800)
+    history.update(reading(thermostat_data, 22, False), 3600)
+    history.update(reading(thermostat_data, 22, True), 7200)
+
+    window = history.window("1084135")
+    assert window.mean("temperature") == 21.25
+    assert window.minimum("temperature") == 20.0
+    assert window.maximum("temperature") == 22.0
+    assert window.duty_cycle() == 0.5
+    assert window.energy_kwh() == 1.0
+    assert window.energy_cost() == 0.5
+    with pytest.raises(ValueError):
+        window.mean("name")
+
+
+def test_downsample(thermostat_data):
+    """Test that downsampling averages the readings per interval."""
+    history = ThermostatHistory()
+    for minute, heating in enumerate((True, False, True, True)):
+        history.update(reading(thermostat_data, 20 + minute, heating), minute * 60)
+
+    downsampled = history.window("1084135").downsample(120)
+    assert list(downsampled.timestamps) == [0.0, 120.0]
+    assert list(downsampled.temperature) == [20.5, 22.5]
+    assert list(downsampled.is_heating) == [0.5, 1.0]
+
+
+def test_out_of_order_reading_is_ignored(thermostat_data):
+    """Test that a reading older than the newest one is dropped."""
+    history = ThermostatHistory()
+    history.update(reading(thermostat_data, 20, False), 60)
+    history.update(reading(thermostat_data, 25, False), 30)
+
+    assert list(history.window("1084135").temperature) == [20.0]
@@ -0,0 +1,54 @@
+"""Tests for the import time of aioschluter."""
+
+import subprocess  # nosec
+import sys
+
+import aioschluter
+from benchmarks.bench_import import import_times
+
+# Generous, a bare import takes a few milliseconds.
+MAX_IMPORT_SECONDS = 0.5
+
+HEAVY_MODULES = ("aiohttp", "aioschluter.api", "aioschluter.thermostat", "datetime")
+
+
+def test_import_does_not_load_heavy_modules():
+    """Test that importing the package leaves aiohttp and the client alone."""
+    times = import_times("aioschluter")
+    loaded = [name for name in HEAVY_MODULES if name in times]
+    assert not loaded
+    assert times["aioschluter"] < MAX_IMPORT_SECONDS * 1e6
+
+
+def test_public_names_are_loaded_on_access():
+    """Test that the public names resolve to the client and exceptions."""
+    from aioschluter.api import SchluterApi  # pylint: disable=import-outside-toplevel
+    from aioschluter.exceptions import (  # pylint: disable=import-outside-toplevel
+        CircuitOpenError,
+    )
+
+    assert aioschluter.SchluterApi is SchluterApi
+    assert aioschluter.CircuitOpenError is CircuitOpenError
+    assert aioschluter.Thermostat.__module__ == "aioschluter.thermostat"
+    assert set(aioschluter.__all__) <= set(dir(aioschluter))
+
+
+def test_submodules_are_loaded_on_access():
+    """Test that submodules resolve without importing them explicitly."""
+    process = subprocess.run(  # nosec
+        [
+            sys.executable,
+            "-c",
+            "import sys, aioschluter; "
+            "print(aioschluter.const.HTTP_OK, 'aiohttp' in sys.modules)",
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+    )
+    assert process.stdout.split() == ["200", "False"]
+
+
+def test_unknown_name_raises_attribute_error():
+    """Test that a missing name still raises AttributeError."""
+    assert not hasattr(aioschluter, "Missing")
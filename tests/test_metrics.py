@@ -0,0 +1,68 @@
+"""Tests for the aioschluter request instrumentation."""
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import InvalidSessionIdError, SchluterApi
+from aioschluter.const import ENDPOINT_AUTH, ENDPOINT_GET_THERMOSTATS
+from aioschluter.metrics import MetricsAggregator, RollingHistogram
+
+from .conftest import AUTH_URL, THERMOSTATS_URL, load_fixture
+
+
+def test_rolling_histogram_percentiles():
+    """Test nearest-rank percentiles over the rolling window."""
+    histogram = RollingHistogram(window=100)
+    for value in range(1, 201):
+        histogram.add(float(value))
+    assert len(histogram) == 100
+    assert histogram.percentile(50) == 150.0
+    summary = histogram.as_dict()
+    assert summary["p95"] == 195.0
+    assert summary["p99"] == 199.0
+    assert summary["max"] == 200.0
+
+
+@pytest.mark.asyncio
+async def test_observer_receives_every_request():
+    """Test that observers and the aggregator see successes and failures."""
+    logon_data = load_fixture("valid_user_data.json")
+    thermostat_data = load_fixture("thermostats_data.json")
+    events = []
+    aggregator = MetricsAggregator()
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, payload=logon_data)
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data)
+        session_mock.get(THERMOSTATS_URL, status=401)
+        schluter = SchluterApi(websession)
+        remove = schluter.add_observer(events.append)
+        schluter.add_observer(aggregator)
+
+        sessionid = await schluter.async_get_sessionid("user", "pw")
+        await schluter.async_get_current_thermostats(sessionid)
+        with pytest.raises(InvalidSessionIdError):
+            await schluter.async_get_current_thermostats(sessionid)
+        remove()
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data)
+        await schluter.async_get_current_thermostats(sessionid)
+
+    await websession.close()
+    assert [event.endpoint for event in events] == [
+        ENDPOINT_AUTH,
+        ENDPOINT_GET_THERMOSTATS,
+        ENDPOINT_GET_THERMOSTATS,
+    ]
+    assert events[1].success
+    assert events[2].status == 401
+    assert isinstance(events[2].error, InvalidSessionIdError)
+
+    metrics = aggregator.as_dict()
+    assert metrics[ENDPOINT_AUTH]["requests"] == 1
+    thermostats = metrics[ENDPOINT_GET_THERMOSTATS]
+    assert thermostats["requests"] == 3
+    assert thermostats["errors"] == 1
+    assert thermostats["statuses"] == {200: 2, 401: 1}
+    assert thermostats["latency"]["count"] == 3
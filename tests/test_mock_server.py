@@ -0,0 +1,46 @@
+"""Tests for the local mock Schluter API used by the benchmarks."""
+
+import pytest
+from aiohttp import ClientSession
+
+from aioschluter import InvalidSessionIdError, InvalidUserPasswordError, SchluterApi
+from aioschluter.session import SchluterSessionManager
+
+from .mock_server import INVALID_PASSWORD, MockSchluterServer
+
+
+@pytest.mark.asyncio
+async def test_client_round_trip():
+    """Test login, listing and writing against the mock server."""
+    async with MockSchluterServer(groups=3, thermostats_per_group=4) as server:
+        async with ClientSession() as websession:
+            api = SchluterApi(websession, base_url=server.url)
+            sessionid = await api.async_get_sessionid("user@example.org", "pw")
+            thermostats = await api.async_get_current_thermostats(sessionid)
+            assert len(thermostats) == 12
+            assert (
+                len({thermostat.group_id for thermostat in thermostats.values()}) == 3
+            )
+
+            serial = next(iter(thermostats))
+            assert await api.async_set_temperature(sessionid, serial, 22.5)
+            thermostats = await api.async_get_current_thermostats(sessionid)
+            assert thermostats[serial].set_point_temp == 22.5
+
+            with pytest.raises(InvalidUserPasswordError):
+                await api.async_get_sessionid("user@example.org", INVALID_PASSWORD)
+
+
+@pytest.mark.asyncio
+async def test_expired_sessions_are_rejected():
+    """Test that expired sessions answer 401 and the manager recovers."""
+    async with MockSchluterServer() as server:
+        async with ClientSession() as websession:
+            api = SchluterApi(websession, base_url=server.url)
+            manager = SchluterSessionManager(api, "user@example.org", "pw")
+            sessionid = await manager.async_get_sessionid()
+            server.expire_sessions()
+            with pytest.raises(InvalidSessionIdError):
+                await api.async_get_current_thermostats(sessionid)
+            assert len(await manager.async_get_current_thermostats()) == 5
+            assert server.requests["auth"] == 2
@@ -0,0 +1,148 @@
+"""Tests for the aioschluter optimistic state."""
+
+import copy
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import SchluterApi
+from aioschluter.optimistic import OptimisticState
+from aioschluter.thermostat import Thermostat
+
+from .conftest import THERMOSTAT_URL
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        """Initialize."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+def make_snapshot(data, **changes):
+    """Build a snapshot of one thermostat with some raw values changed."""
+    data = copy.deepcopy(data)
+    data.update(changes)
+    return {data["SerialNumber"]: Thermostat(data)}
+
+
+@pytest.mark.asyncio
+async def test_write_is_shown_until_confirmed(thermostat_data):
+    """Test that an acknowledged write is visible and confirmed by a poll."""
+    websession = ClientSession()
+    state = OptimisticState(SchluterApi(websession))
+    state.update(make_snapshot(thermostat_data))
+
+    with aioresponses() as session_mock:
+        session_mock.post(THERMOSTAT_URL, payload={"Success": True})
+        assert await state.async_set_temperature("abcd", "1084135", 21.3)
+    await websession.close()
+
+    assert state.thermostats["1084135"].set_point_temp == 21.5
+    assert state.is_pending("1084135")
+
+    # A poll that raced the write still shows the written value.
+    view = state.update(make_snapshot(thermostat_data))
+    assert view["1084135"].set_point_temp == 21.5
+    assert view["1084135"].name == "Bathroom"
+
+    view = state.update(
+        make_snapshot(thermostat_data, SetPointTemp=2150, ManualTemperature=2150)
+    )
+    assert view["1084135"].set_point_temp == 21.5
+    assert not state.pending
+
+
+@pytest.mark.asyncio
+async def test_unconfirmed_write_is_rolled_back(thermostat_data):
+    """Test that the server value wins once the confirm timeout passed."""
+    clock = FakeClock()
+    rollbacks = []
+    websession = ClientSession()
+    state = OptimisticState(
+        SchluterApi(websession),
+        confirm_timeout=60,
+        on_rollback=lambda *args: rollbacks.append(args),
+        clock=clock,
+    )
+    state.update(make_snapshot(thermostat_data))
+
+    with aioresponses() as session_mock:
+        session_mock.post(THERMOSTAT_URL, payload={"Success": True})
+        await state.async_set_regulation_mode("abcd", "1084135", 2)
+    await websession.close()
+    assert state.thermostats["1084135"].regulation_mode == 2
+
+    clock.now = 61
+    view = state.update(make_snapshot(thermostat_data))
+
+    assert view["1084135"].regulation_mode == 1
+    assert not state.is_pending("1084135")
+    assert rollbacks == [("1084135", "regulation_mode", 2, 1)]
+
+
+@pytest.mark.asyncio
+async def test_failing_rollback_listener_does_not_stop_the_update(thermostat_data):
+    """Test that every pending value is rolled back if the listener raises."""
+    clock = FakeClock()
+    rollbacks = []
+
+    def on_rollback(*args):
+        rollbacks.append(args)
+        raise RuntimeError("listener failed")
+
+    websession = ClientSession()
+    state = OptimisticState(
+        SchluterApi(websession),
+        confirm_timeout=60,
+        on_rollback=on_rollback,
+        clock=clock,
+    )
+    state.update(make_snapshot(thermostat_data))
+
+    with aioresponses() as session_mock:
+        session_mock.post(THERMOSTAT_URL, payload={"Success": True})
+        await state.async_set_temperature("abcd", "1084135", 25)
+    await websession.close()
+
+    clock.now = 61
+    view = state.update(make_snapshot(thermostat_data))
+
+    assert view["1084135"].set_point_temp == 20.0
+    assert view["1084135"].manual_temp == 23.0
+    assert not state.pending
+    assert len(rollbacks) == 2
+
+
+@pytest.mark.asyncio
+async def test_rejected_write_is_not_applied(thermostat_data):
+    """Test that a write the server did not accept leaves the state alone."""
+    websession = ClientSession()
+    state = OptimisticState(SchluterApi(websession))
+    state.update(make_snapshot(thermostat_data))
+
+    with aioresponses() as session_mock:
+        session_mock.post(THERMOSTAT_URL, payload={"Success": False})
+        assert not await state.async_set_temperature("abcd", "1084135", 25)
+    await websession.close()
+
+    assert state.thermostats["1084135"].set_point_temp == 20.0
+    assert not state.pending
+
+
+def test_replace_rejects_unknown_attributes(thermostat_data):
+    """Test that Thermostat.replace only accepts known attributes."""
+    thermostat = make_snapshot(thermostat_data)["1084135"]
+
+    assert thermostat.replace(set_point_temp=22.0).set_point_temp == 22.0
+    assert thermostat.set_point_temp == 20.0
+    with pytest.raises(AttributeError):
+        thermostat.replace(color="red")
@@ -0,0 +1,144 @@
+"""Tests for the aioschluter rate limiter."""
+
+import asyncio
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import SchluterApi
+from aioschluter.const import ENDPOINT_GET_THERMOSTATS, ENDPOINT_SET_THERMOSTAT
+from aioschluter.ratelimit import (
+    PRIORITY_BACKGROUND,
+    PRIORITY_USER,
+    TOTAL_BUCKET,
+    RateLimit,
+    RateLimiter,
+    TokenBucket,
+)
+from aioschluter.transport import Transport
+
+from .conftest import THERMOSTATS_URL, load_fixture
+
+
+@pytest.mark.asyncio
+async def test_burst_then_throttled():
+    """Test that the burst is served at once and the rest at the rate."""
+    bucket = TokenBucket(RateLimit(rate=50, burst=3))
+    loop = asyncio.get_running_loop()
+
+    start = loop.time()
+    waits = await asyncio.gather(*(bucket.async_acquire() for _ in range(5)))
+    elapsed = loop.time() - start
+
+    assert waits[:3] == [0.0, 0.0, 0.0]
+    assert all(wait > 0 for wait in waits[3:])
+    assert elapsed >= 0.035
+    assert bucket.acquired == 5
+    assert bucket.delayed == 2
+    assert bucket.max_wait == max(waits)
+    assert bucket.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_user_requests_overtake_background():
+    """Test that waiting user requests are served before background ones."""
+    bucket = TokenBucket(RateLimit(rate=100, burst=1))
+    order = []
+
+    async def acquire(name, priority):
+        await bucket.async_acquire(priority)
+        order.append(name)
+
+    await bucket.async_acquire()
+    tasks = [
+        asyncio.create_task(acquire("poll1", PRIORITY_BACKGROUND)),
+        asyncio.create_task(acquire("poll2", PRIORITY_BACKGROUND)),
+        asyncio.create_task(acquire("write", PRIORITY_USER)),
+    ]
+    await asyncio.sleep(0)
+    assert bucket.queue_depth == 3
+    await asyncio.gather(*tasks)
+
+    assert order == ["write", "poll1", "poll2"]
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_its_place():
+    """Test that a cancelled waiter does not consume a token."""
+    bucket = TokenBucket(RateLimit(rate=100, burst=1))
+    await bucket.async_acquire()
+
+    cancelled = asyncio.create_task(bucket.async_acquire(PRIORITY_USER))
+    waiting = asyncio.create_task(bucket.async_acquire())
+    await asyncio.sleep(0)
+    cancelled.cancel()
+    await asyncio.wait_for(waiting, 1)
+
+    assert cancelled.cancelled()
+    assert bucket.queue_depth == 0
+
+
+@pytest.mark.asyncio
+async def test_limiter_is_shared_between_transports():
+    """Test that two api instances draw from the same buckets."""
+    thermostat_data = load_fixture("thermostats_data.json")
+    limiter = RateLimiter(
+        {ENDPOINT_GET_THERMOSTATS: RateLimit(rate=20, burst=2)},
+        total=RateLimit(rate=1000, burst=10),
+    )
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data, repeat=True)
+        first = SchluterApi(
+            websession, transport=Transport(websession, None, None, limiter)
+        )
+        second = SchluterApi(
+            websession, transport=Transport(websession, None, None, limiter)
+        )
+        await asyncio.gather(
+            first.async_get_current_thermostats("sessionid"),
+            second.async_get_current_thermostats("sessionid"),
+            first.async_get_current_thermostats("sessionid"),
+        )
+    await websession.close()
+
+    metrics = limiter.as_dict()
+    assert metrics[ENDPOINT_GET_THERMOSTATS]["acquired"] == 3
+    assert metrics[ENDPOINT_GET_THERMOSTATS]["delayed"] == 1
+    assert metrics[TOTAL_BUCKET]["acquired"] == 3
+    assert metrics[ENDPOINT_SET_THERMOSTAT]["acquired"] == 0
+
+
+@pytest.mark.asyncio
+async def test_writes_overtake_polls_in_the_total_bucket():
+    """Test that a write waiting for the total budget goes before polls."""
+    limiter = RateLimiter(total=RateLimit(rate=100, burst=1))
+    order = []
+
+    async def acquire(name, endpoint):
+        await limiter.async_acquire(endpoint)
+        order.append(name)
+
+    await limiter.async_acquire(ENDPOINT_GET_THERMOSTATS)
+    tasks = [
+        asyncio.create_task(acquire("poll1", ENDPOINT_GET_THERMOSTATS)),
+        asyncio.create_task(acquire("poll2", ENDPOINT_GET_THERMOSTATS)),
+        asyncio.create_task(acquire("write", ENDPOINT_SET_THERMOSTAT)),
+    ]
+    await asyncio.gather(*tasks)
+
+    assert order == ["write", "poll1", "poll2"]
+    assert limiter.as_dict()[TOTAL_BUCKET]["delayed"] == 3
+
+
+def test_default_priorities():
+    """Test that writes default to user priority and polls to background."""
+    limiter = RateLimiter()
+
+    assert limiter.priority(ENDPOINT_SET_THERMOSTAT) == PRIORITY_USER
+    assert limiter.priority(ENDPOINT_GET_THERMOSTATS) == PRIORITY_BACKGROUND
+    assert limiter.priority("unknown") == PRIORITY_BACKGROUND
+    with pytest.raises(ValueError):
+        TokenBucket(RateLimit(rate=0))
@@ -0,0 +1,130 @@
+"""Tests for the aioschluter poll scheduler."""
+
+import asyncio
+
+import pytest
+
+from aioschluter import ApiError, InvalidSessionIdError, InvalidUserPasswordError
+from aioschluter.scheduler import PollScheduler
+from aioschluter.thermostat import Thermostat
+
+from .conftest import load_fixture
+
+
+def load_thermostats(heating=False):
+    """Load the fixture thermostats."""
+    data = load_fixture("thermostats_data.json")["Groups"][0]["Thermostats"][0]
+    data["Heating"] = heating
+    return {data["SerialNumber"]: Thermostat(data)}
+
+
+class FakePoll:
+    """Poll function returning queued results or raising queued errors."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self, *results):
+        """Initialize."""
+        self.results = list(results)
+        self.calls = 0
+
+    async def __call__(self):
+        """Return the next result."""
+        self.calls += 1
+        result = self.results.pop(0) if len(self.results) > 1 else self.results[0]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+@pytest.mark.asyncio
+async def test_errors_back_off_and_recover_gradually():
+    """Test that the interval grows on errors and shrinks again on success."""
+    idle = load_thermostats()
+    poll = FakePoll(ApiError(500), ApiError(500), idle, idle)
+    scheduler = PollScheduler(poll, interval=10, active_interval=5, jitter=0)
+
+    assert await scheduler.async_poll_once() is None
+    assert scheduler.next_interval() == 20
+    await scheduler.async_poll_once()
+    assert scheduler.next_interval() == 40
+    assert isinstance(scheduler.last_error, ApiError)
+    assert await scheduler.async_poll_once() is idle
+    assert scheduler.next_interval() == 20
+    await scheduler.async_poll_once()
+    assert scheduler.next_interval() == 10
+
+
+@pytest.mark.asyncio
+async def test_backoff_is_capped():
+    """Test that backing off never exceeds the maximum interval."""
+    scheduler = PollScheduler(
+        FakePoll(ApiError(500)), interval=10, max_interval=30, jitter=0
+    )
+    for _ in range(5):
+        await scheduler.async_poll_once()
+    assert scheduler.next_interval() == 30
+
+
+@pytest.mark.asyncio
+async def test_heating_and_pending_writes_shorten_interval():
+    """Test that the active interval applies while heating or confirming writes."""
+    poll = FakePoll(load_thermostats(heating=True), load_thermostats())
+    scheduler = PollScheduler(poll, interval=60, active_interval=15, jitter=0)
+
+    await scheduler.async_poll_once()
+    assert scheduler.next_interval() == 15
+    await scheduler.async_poll_once()
+    assert scheduler.next_interval() == 60
+    scheduler.mark_write_pending()
+    assert scheduler.next_interval() == 15
+
+
+@pytest.mark.asyncio
+async def test_background_loop_notifies_listener():
+    """Test that the background loop polls and calls the listener."""
+    received = []
+
+    async def listener(thermostats):
+        received.append(thermostats)
+
+    scheduler = PollScheduler(
+        FakePoll(load_thermostats()), listener, interval=0.01, jitter=0.5
+    )
+    scheduler.start()
+    await asyncio.sleep(0.05)
+    await scheduler.async_stop()
+
+    assert not scheduler.running
+    assert len(received) >= 2
+
+
+@pytest.mark.asyncio
+async def test_background_loop_survives_other_errors(caplog):
+    """Test that session, password and listener errors are logged, not fatal."""
+    idle = load_thermostats()
+    poll = FakePoll(
+        InvalidSessionIdError("expired"),
+        InvalidUserPasswordError("wrong"),
+        idle,
+        idle,
+    )
+    received = []
+
+    def listener(thermostats):
+        received.append(thermostats)
+        raise ValueError("listener failed")
+
+    scheduler = PollScheduler(poll, listener, interval=0.001, jitter=0)
+    scheduler.start()
+    for _ in range(100):
+        if len(received) >= 2:
+            break
+        await asyncio.sleep(0.01)
+    assert scheduler.running
+    await scheduler.async_stop()
+
+    assert len(received) >= 2
+    assert scheduler.last_error is None
+    assert "InvalidSessionIdError" in caplog.text
+    assert "Error in poll listener" in caplog.text
@@ -0,0 +1,85 @@
+"""Tests for the aioschluter session manager."""
+
+import asyncio
+from datetime import timedelta
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import CallbackResult, aioresponses
+
+from aioschluter import SchluterApi
+from aioschluter.session import SchluterSessionManager
+
+from .conftest import AUTH_URL, THERMOSTATS_URL, load_fixture
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_authentication():
+    """Test that parallel requests on a missing session authenticate once."""
+    logon_data = load_fixture("valid_user_data.json")
+    thermostat_data = load_fixture("thermostats_data.json")
+    auth_calls = []
+
+    async def auth_callback(url, **kwargs):
+        # pylint: disable=unused-argument
+        auth_calls.append(url)
+        await asyncio.sleep(0.01)
+        return CallbackResult(payload=logon_data)
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, callback=auth_callback, repeat=True)
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data, repeat=True)
+        manager = SchluterSessionManager(SchluterApi(websession), "user", "pw")
+        results = await asyncio.gather(
+            *(manager.async_get_current_thermostats() for _ in range(10))
+        )
+
+    await websession.close()
+    assert len(auth_calls) == 1
+    assert all(result["1084135"].name == "Bathroom" for result in results)
+
+
+@pytest.mark.asyncio
+async def test_rejected_session_is_retried_once():
+    """Test that a 401 triggers one re-authentication and one retry."""
+    logon_data = load_fixture("valid_user_data.json")
+    thermostat_data = load_fixture("thermostats_data.json")
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, payload=logon_data, repeat=True)
+        session_mock.get(THERMOSTATS_URL, status=401)
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data)
+        manager = SchluterSessionManager(SchluterApi(websession), "user", "pw")
+        thermostats = await manager.async_get_current_thermostats()
+        auth_requests = [key for key in session_mock.requests if key[0] == "POST"]
+        auth_count = len(session_mock.requests[auth_requests[0]])
+
+    await websession.close()
+    assert thermostats["1084135"].name == "Bathroom"
+    assert auth_count == 2
+
+
+@pytest.mark.asyncio
+async def test_session_refreshes_before_expiry():
+    """Test that the session is refreshed within the refresh margin."""
+    logon_data = load_fixture("valid_user_data.json")
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, payload=logon_data, repeat=True)
+        manager = SchluterSessionManager(
+            SchluterApi(websession),
+            "user",
+            "pw",
+            ttl=timedelta(minutes=10),
+            refresh_margin=timedelta(minutes=5),
+        )
+        assert manager.needs_refresh()
+        await manager.async_get_sessionid()
+        assert not manager.needs_refresh()
+        manager.api._sessionid_timestamp -= timedelta(minutes=6)
+        assert manager.needs_refresh()
+
+    await websession.close()
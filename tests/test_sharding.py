@@ -0,0 +1,77 @@
+"""Tests for the aioschluter sharded fleet."""
+
+import pytest
+
+from aioschluter.sharding import HashRing, ShardedFleet
+
+from .mock_server import INVALID_PASSWORD, MockSchluterServer
+
+
+def test_hash_ring_moves_few_keys():
+    """Test that adding a node only moves the keys it takes over."""
+    keys = [f"user{index}@example.org" for index in range(1000)]
+    before = HashRing(range(4))
+    after = HashRing(range(5))
+
+    counts = {node: 0 for node in range(4)}
+    moved = 0
+    for key in keys:
+        counts[before.node(key)] += 1
+        if before.node(key) != after.node(key):
+            assert after.node(key) == 4
+            moved += 1
+
+    assert all(150 < count < 350 for count in counts.values())
+    assert moved < 350
+
+
+@pytest.mark.asyncio
+async def test_workers_poll_their_shards():
+    """Test that every account is polled once by the worker owning it."""
+    credentials = {f"user{index}@example.org": "pw" for index in range(6)}
+    credentials["bad@example.org"] = INVALID_PASSWORD
+
+    async with MockSchluterServer(groups=2, thermostats_per_group=3) as server:
+        async with ShardedFleet(credentials, workers=2, base_url=server.url) as fleet:
+            assert sorted(fleet.usernames(0) + fleet.usernames(1)) == sorted(
+                credentials
+            )
+            first = await fleet.async_poll_all()
+            second = await fleet.async_poll_all()
+        assert not fleet.running
+
+    assert set(first) == set(credentials)
+    assert not first["bad@example.org"].success
+    assert type(first["bad@example.org"].error).__name__ == "InvalidUserPasswordError"
+    good = first["user0@example.org"]
+    assert good.success
+    assert len(good.thermostats) == 6
+    assert len(good.thermostats.in_group(1000)) == 3
+    assert all(result.success for name, result in second.items() if "user" in name)
+    assert server.requests["get_thermostats"] == 12
+
+
+@pytest.mark.asyncio
+async def test_dead_worker_is_started_again():
+    """Test that a killed worker fails its accounts once and is replaced."""
+    # pylint: disable=protected-access
+    credentials = {f"user{index}@example.org": "pw" for index in range(6)}
+
+    async with MockSchluterServer() as server:
+        async with ShardedFleet(credentials, workers=2, base_url=server.url) as fleet:
+            dead = fleet._shards[0].worker
+            dead.process.kill()
+            dead.process.join()
+
+            failed = await fleet.async_poll_all()
+            assert fleet._shards[0].worker is None
+            second = await fleet.async_poll_all()
+            assert fleet._shards[0].worker is not None
+            assert fleet._shards[0].worker is not dead
+
+    assert set(failed) == set(second) == set(credentials)
+    for username in fleet.usernames(0):
+        assert "Worker failed" in str(failed[username].error)
+    for username in fleet.usernames(1):
+        assert failed[username].success
+    assert all(result.success for result in second.values())
@@ -0,0 +1,118 @@
+"""Tests for the aioschluter session stores."""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import SchluterApi
+from aioschluter.session import SchluterSessionManager
+from aioschluter.store import JsonFileSessionStore, MemorySessionStore, StoredSession
+
+from .conftest import AUTH_URL, THERMOSTATS_URL, load_fixture
+
+NEW_SESSIONID = "85j7W9xNTku1bqDb4SCnPA"
+
+
+def auth_count(session_mock):
+    """Return the number of authentication requests sent."""
+    return sum(
+        len(calls) for key, calls in session_mock.requests.items() if key[0] == "POST"
+    )
+
+
+@pytest.mark.asyncio
+async def test_json_file_store_survives_restart(tmp_path):
+    """Test that sessions saved to the file are loaded by a new store."""
+    path = str(tmp_path / "sessions.json")
+    session = StoredSession("abc", datetime(2024, 1, 2, 3, 4, 5))
+
+    store = JsonFileSessionStore(path)
+    await store.async_save("user", session)
+    await store.async_save("other", StoredSession("def", datetime.now()))
+    await store.async_remove("other")
+
+    restarted = JsonFileSessionStore(path)
+    assert await restarted.async_load("user") == session
+    assert await restarted.async_load("other") is None
+
+
+@pytest.mark.asyncio
+async def test_json_file_store_ignores_corrupt_file(tmp_path):
+    """Test that an unreadable file is treated as empty."""
+    path = tmp_path / "sessions.json"
+    path.write_text("{not json", encoding="utf-8")
+
+    store = JsonFileSessionStore(str(path))
+    assert await store.async_load("user") is None
+    await store.async_save("user", StoredSession("abc", datetime.now()))
+    assert json.loads(path.read_text(encoding="utf-8"))["user"]["sessionid"] == "abc"
+
+
+@pytest.mark.asyncio
+async def test_stored_session_is_reused():
+    """Test that a valid stored session avoids authenticating."""
+    thermostat_data = load_fixture("thermostats_data.json")
+    store = MemorySessionStore()
+    await store.async_save("user", StoredSession("stored", datetime.now()))
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data)
+        manager = SchluterSessionManager(
+            SchluterApi(websession), "user", "pw", store=store
+        )
+        thermostats = await manager.async_get_current_thermostats()
+        auth_calls = auth_count(session_mock)
+
+    await websession.close()
+    assert thermostats["1084135"].name == "Bathroom"
+    assert manager.sessionid == "stored"
+    assert auth_calls == 0
+
+
+@pytest.mark.asyncio
+async def test_rejected_stored_session_is_replaced():
+    """Test that a stored session rejected with 401 is replaced and saved."""
+    logon_data = load_fixture("valid_user_data.json")
+    thermostat_data = load_fixture("thermostats_data.json")
+    store = MemorySessionStore()
+    await store.async_save("user", StoredSession("stored", datetime.now()))
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, payload=logon_data)
+        session_mock.get(THERMOSTATS_URL, status=401)
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data)
+        manager = SchluterSessionManager(
+            SchluterApi(websession), "user", "pw", store=store
+        )
+        await manager.async_get_current_thermostats()
+        auth_calls = auth_count(session_mock)
+
+    await websession.close()
+    assert auth_calls == 1
+    assert (await store.async_load("user")).sessionid == NEW_SESSIONID
+
+
+@pytest.mark.asyncio
+async def test_expired_stored_session_is_not_used():
+    """Test that an expired stored session triggers a new authentication."""
+    logon_data = load_fixture("valid_user_data.json")
+    store = MemorySessionStore()
+    issued = datetime.now() - timedelta(hours=2)
+    await store.async_save("user", StoredSession("stored", issued))
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, payload=logon_data)
+        manager = SchluterSessionManager(
+            SchluterApi(websession), "user", "pw", store=store
+        )
+        sessionid = await manager.async_get_sessionid()
+
+    await websession.close()
+    assert sessionid == NEW_SESSIONID
+    assert (await store.async_load("user")).timestamp > issued
@@ -0,0 +1,102 @@
+"""Tests for the aioschluter streaming parser."""
+
+import json
+
+import pytest
+from aiohttp import ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import ApiError, SchluterApi
+from aioschluter.streaming import ThermostatStreamParser, get_default_decoder
+
+from .conftest import THERMOSTATS_URL, load_fixture, load_raw_fixture
+
+
+def parse_in_chunks(raw, size):
+    """Feed ``raw`` to a parser in chunks of ``size`` bytes."""
+    parser = ThermostatStreamParser()
+    thermostats = []
+    for start in range(0, len(raw), size):
+        thermostats.extend(parser.feed(raw[start : start + size]))
+    parser.close()
+    return thermostats
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 1 << 20])
+def test_chunked_parse_matches_full_parse(size):
+    """Test that chunk boundaries do not change the result."""
+    raw = load_raw_fixture("thermostats_data.json")
+    expected = [
+        thermostat["SerialNumber"]
+        for group in json.loads(raw)["Groups"]
+        for thermostat in group["Thermostats"]
+    ]
+    thermostats = parse_in_chunks(raw, size)
+    assert [thermostat.serial_number for thermostat in thermostats] == expected
+    assert thermostats[0].name == "Bathroom"
+
+
+def test_strings_with_structural_characters():
+    """Test that brackets and escaped quotes inside strings are ignored."""
+    data = load_fixture("thermostats_data.json")
+    data["Groups"][0]["GroupName"] = 'Thermostats": [{'
+    data["Groups"][0]["Thermostats"][0]["Room"] = 'Bath "room" {1} [a]\\'
+    raw = json.dumps(data).encode()
+    thermostats = parse_in_chunks(raw, 5)
+    assert thermostats[0].name == 'Bath "room" {1} [a]\\'
+
+
+def test_incomplete_document_is_rejected():
+    """Test that a truncated response raises on close."""
+    parser = ThermostatStreamParser()
+    raw = load_raw_fixture("thermostats_data.json")
+    parser.feed(raw[: len(raw) // 2])
+    with pytest.raises(ValueError):
+        parser.close()
+
+
+def test_default_decoder_prefers_orjson():
+    """Test that orjson is used when it is installed."""
+    try:
+        import orjson  # pylint: disable=import-outside-toplevel
+    except ImportError:
+        assert get_default_decoder() is json.loads
+    else:
+        assert get_default_decoder() is orjson.loads  # pylint: disable=no-member
+
+
+@pytest.mark.asyncio
+async def test_stream_thermostats():
+    """Test streaming the thermostats from the API."""
+    raw = load_raw_fixture("thermostats_data.json")
+    websession = ClientSession()
+    sessionid = "abcd12345456"
+
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, body=raw, repeat=True)
+        schluter = SchluterApi(websession, json_decoder=get_default_decoder())
+        streamed = [
+            thermostat.serial_number
+            async for thermostat in schluter.async_stream_thermostats(sessionid)
+        ]
+        thermostats = await schluter.async_get_current_thermostats(sessionid)
+
+    await websession.close()
+    assert streamed == list(thermostats)
+
+
+@pytest.mark.asyncio
+async def test_stream_rejects_truncated_response():
+    """Test that a truncated response raises ApiError."""
+    raw = load_raw_fixture("thermostats_data.json")
+    websession = ClientSession()
+    sessionid = "abcd12345456"
+
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, body=raw[:-10])
+        schluter = SchluterApi(websession)
+        with pytest.raises(ApiError):
+            async for _ in schluter.async_stream_thermostats(sessionid):
+                pass
+
+    await websession.close()
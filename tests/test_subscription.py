@@ -0,0 +1,155 @@
+"""Tests for the aioschluter subscription hub."""
+
+import asyncio
+import copy
+
+import pytest
+
+from aioschluter.subscription import (
+    OVERFLOW_COALESCE,
+    OVERFLOW_DROP_OLDEST,
+    SubscriptionClosed,
+    SubscriptionHub,
+)
+from aioschluter.thermostat import Thermostat
+
+from .conftest import load_fixture
+
+
+@pytest.fixture(name="snapshot")
+def fixture_snapshot():
+    """Return a snapshot of two thermostats in different groups."""
+    data = load_fixture("thermostats_data.json")["Groups"][0]["Thermostats"][0]
+    other = copy.deepcopy(data)
+    other.update(SerialNumber="2000", GroupId=99)
+    return {item["SerialNumber"]: Thermostat(item) for item in (data, other)}
+
+
+async def never_poll():
+    """Fail if the hub polls."""
+    raise AssertionError("unexpected poll")
+
+
+@pytest.mark.asyncio
+async def test_one_poll_is_fanned_out():
+    """Test that every subscriber gets each polled snapshot."""
+    polls = []
+
+    async def poll():
+        polls.append(None)
+        return {}
+
+    hub = SubscriptionHub(poll, interval=60, jitter=0)
+    first = hub.subscribe()
+    second = hub.subscribe()
+    async with hub:
+        results = await asyncio.wait_for(
+            asyncio.gather(first.async_get(), second.async_get()), 1
+        )
+
+    assert results == [{}, {}]
+    assert len(polls) == 1
+    assert first.closed and second.closed
+
+
+@pytest.mark.asyncio
+async def test_filters_by_serial_and_group(snapshot):
+    """Test that subscribers only receive the selected thermostats."""
+    hub = SubscriptionHub(never_poll)
+    by_serial = hub.subscribe(serialnumbers=["1084135"])
+    by_group = hub.subscribe(group_ids=[99])
+    nothing = hub.subscribe(group_ids=[1])
+    hub.publish(snapshot)
+
+    assert list(await by_serial.async_get()) == ["1084135"]
+    assert list(await by_group.async_get()) == ["2000"]
+    assert nothing.qsize == 0
+
+
+@pytest.mark.asyncio
+async def test_overflow_policies(snapshot):
+    """Test that full queues drop the oldest or coalesce to the latest."""
+    hub = SubscriptionHub(never_poll)
+    dropping = hub.subscribe(maxsize=2, overflow=OVERFLOW_DROP_OLDEST)
+    coalescing = hub.subscribe(maxsize=1, overflow=OVERFLOW_COALESCE)
+    first, second = ({serial: item} for serial, item in snapshot.items())
+    for item in (snapshot, second, first):
+        hub.publish(item)
+
+    assert dropping.qsize == 2
+    assert dropping.dropped == 1
+    assert await dropping.async_get() == second
+    assert coalescing.qsize == 1
+    assert coalescing.dropped == 2
+    # The removed thermostat of the full snapshot is gone.
+    assert await coalescing.async_get() == first
+
+
+@pytest.mark.asyncio
+async def test_late_subscriber_gets_latest_and_close_ends_iteration(snapshot):
+    """Test that new subscribers start from the latest snapshot."""
+    hub = SubscriptionHub(never_poll)
+    hub.publish(snapshot)
+    received = []
+
+    async with hub.subscribe() as subscription:
+        subscription.close()
+        async for item in subscription:
+            received.append(item)
+
+    assert received == [snapshot]
+    assert not hub.subscriptions
+
+
+class PollingStopped(BaseException):
+    """Error ending the polling loop."""
+
+
+@pytest.mark.asyncio
+async def test_subscriptions_end_with_the_poll_loop(snapshot):
+    """Test that subscribers stop waiting when the polling loop ends."""
+
+    async def poll():
+        raise PollingStopped()
+
+    hub = SubscriptionHub(poll, interval=0.01)
+    failed = hub.subscribe()
+    hub.start()
+    with pytest.raises(SubscriptionClosed) as info:
+        await asyncio.wait_for(failed.async_get(), 1)
+    assert isinstance(info.value.__cause__, PollingStopped)
+    await hub.async_stop()
+
+    hub = SubscriptionHub(lambda: asyncio.sleep(0, snapshot), interval=10)
+    subscription = hub.subscribe()
+    hub.start()
+    assert await asyncio.wait_for(subscription.async_get(), 1) == snapshot
+    hub.scheduler.task.cancel()
+    received = [item async for item in subscription]
+    assert not received
+    assert subscription.error is None
+    await hub.async_stop()
+
+
+@pytest.mark.asyncio
+async def test_subscribing_to_a_stopped_hub(snapshot):
+    """Test that subscriptions made after the hub stopped do not wait forever."""
+
+    async def poll():
+        raise PollingStopped()
+
+    hub = SubscriptionHub(poll, interval=0.01)
+    hub.start()
+    await asyncio.wait([hub.scheduler.task], timeout=1)
+    late = hub.subscribe()
+    assert late.closed
+    with pytest.raises(SubscriptionClosed) as info:
+        await late.async_get()
+    assert isinstance(info.value.__cause__, PollingStopped)
+    await hub.async_stop()
+
+    hub = SubscriptionHub(never_poll)
+    hub.publish(snapshot)
+    await hub.async_stop()
+    received = [item async for item in hub.subscribe()]
+    assert received == [snapshot]
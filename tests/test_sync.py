@@ -0,0 +1,97 @@
+"""Tests for the aioschluter synchronous client."""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+import pytest
+from aioresponses import CallbackResult, aioresponses
+
+from aioschluter import InvalidUserPasswordError
+from aioschluter.sync import SyncSchluterClient
+
+from .conftest import AUTH_URL, THERMOSTAT_URL, THERMOSTATS_URL, load_fixture
+
+
+def test_calls_from_many_threads_share_one_login():
+    """Test that blocking calls from several threads reuse the session."""
+    logins = []
+
+    def auth_callback(url, **kwargs):
+        # pylint: disable=unused-argument
+        logins.append(threading.current_thread().name)
+        return CallbackResult(payload=load_fixture("valid_user_data.json"))
+
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, callback=auth_callback, repeat=True)
+        session_mock.get(
+            THERMOSTATS_URL, payload=load_fixture("thermostats_data.json"), repeat=True
+        )
+        with SyncSchluterClient({"one@someplace.org": "pw"}) as client:
+            with ThreadPoolExecutor(8) as executor:
+                results = list(
+                    executor.map(lambda _: client.get_current_thermostats(), range(16))
+                )
+
+    assert logins == ["aioschluter-sync"]
+    assert all(result["1084135"].name == "Bathroom" for result in results)
+    assert client.closed
+
+
+def test_writes_and_errors_are_returned_to_the_caller():
+    """Test that results and exceptions cross over to the calling thread."""
+    credentials = {"one@someplace.org": "pw", "bad@someplace.org": "pw"}
+
+    def auth_callback(url, **kwargs):
+        # pylint: disable=unused-argument
+        if kwargs["json"]["Email"].startswith("bad"):
+            return CallbackResult(payload=load_fixture("invalid_user_data.json"))
+        return CallbackResult(payload=load_fixture("valid_user_data.json"))
+
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, callback=auth_callback, repeat=True)
+        session_mock.post(THERMOSTAT_URL, payload={"Success": True}, repeat=True)
+        session_mock.get(
+            THERMOSTATS_URL, payload=load_fixture("thermostats_data.json"), repeat=True
+        )
+        with SyncSchluterClient(credentials) as client:
+            assert client.set_temperature("1084135", 21.5, "one@someplace.org")
+            with pytest.raises(InvalidUserPasswordError):
+                client.get_current_thermostats("bad@someplace.org")
+            with pytest.raises(ValueError):
+                client.get_current_thermostats()
+            results = client.poll_all()
+
+    assert results["one@someplace.org"].success
+    assert not results["bad@someplace.org"].success
+
+
+def test_call_timeout_cancels_the_request():
+    """Test that a blocking call gives up and cancels its coroutine."""
+    cancelled = threading.Event()
+
+    async def slow(fleet):
+        # pylint: disable=unused-argument
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with SyncSchluterClient({}, call_timeout=0.05) as client:
+        with pytest.raises(FutureTimeoutError):
+            client.call(slow)
+        assert cancelled.wait(1)
+
+
+def test_closed_client_rejects_calls():
+    """Test that a closed client raises instead of starting a new loop."""
+    client = SyncSchluterClient({"one@someplace.org": "pw"})
+    assert client.call(lambda fleet: asyncio.sleep(0, fleet.usernames)) == [
+        "one@someplace.org"
+    ]
+    client.close()
+    client.close()
+    with pytest.raises(RuntimeError):
+        client.get_current_thermostats()
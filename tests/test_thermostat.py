@@ -0,0 +1,32 @@
+"""Tests for the aioschluter Thermostat."""
+
+import pickle
+
+from aioschluter.thermostat import Thermostat
+
+
+def test_temperatures_are_converted(thermostat_data):
+    """Test that temperatures are rounded to half a degree."""
+    thermostat = Thermostat(thermostat_data)
+    assert thermostat.temperature == 23.5
+    assert thermostat.set_point_temp == 20.0
+    assert thermostat.manual_temp == 23.0
+    assert thermostat.max_temp == 40.0
+    assert thermostat.min_temp == 5.0
+
+
+def test_early_start_of_heating(thermostat_data):
+    """Test that early start of heating is read from the data."""
+    thermostat_data["EarlyStartOfHeating"] = True
+    assert Thermostat(thermostat_data).is_early_start_of_heating is True
+    thermostat_data["EarlyStartOfHeating"] = False
+    assert Thermostat(thermostat_data).is_early_start_of_heating is False
+
+
+def test_thermostat_has_no_instance_dict(thermostat_data):
+    """Test that Thermostat uses slots and survives pickling."""
+    thermostat = Thermostat(thermostat_data)
+    assert not hasattr(thermostat, "__dict__")
+    restored = pickle.loads(pickle.dumps(thermostat))
+    assert restored.serial_number == "1084135"
+    assert restored.temperature == thermostat.temperature
@@ -0,0 +1,172 @@
+"""Tests for the aioschluter transport layer."""
+
+import asyncio
+
+import pytest
+from aiohttp import ClientError, ClientSession
+from aioresponses import aioresponses
+
+from aioschluter import ApiError, CircuitOpenError, SchluterApi
+from aioschluter.const import ENDPOINT_GET_THERMOSTATS
+from aioschluter.transport import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    CircuitBreaker,
+    EndpointPolicy,
+    Transport,
+)
+
+from .conftest import AUTH_URL, THERMOSTATS_URL, load_fixture
+from .mock_server import MockSchluterServer
+
+NO_BACKOFF = EndpointPolicy(retries=2, backoff=0)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    # pylint: disable=too-few-public-methods
+
+    def __init__(self):
+        """Initialize."""
+        self.now = 0.0
+
+    def __call__(self):
+        """Return the current time."""
+        return self.now
+
+
+@pytest.mark.asyncio
+async def test_server_errors_are_retried():
+    """Test that idempotent requests are retried after a 5xx response."""
+    thermostat_data = load_fixture("thermostats_data.json")
+    events = []
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, status=503)
+        session_mock.get(THERMOSTATS_URL, status=502)
+        session_mock.get(THERMOSTATS_URL, payload=thermostat_data)
+        transport = Transport(websession, {ENDPOINT_GET_THERMOSTATS: NO_BACKOFF})
+        schluter = SchluterApi(websession, transport=transport)
+        schluter.add_observer(events.append)
+        thermostats = await schluter.async_get_current_thermostats("abcd")
+
+    await websession.close()
+    assert thermostats["1084135"].name == "Bathroom"
+    assert events[0].retries == 2
+
+
+@pytest.mark.asyncio
+async def test_retries_are_exhausted():
+    """Test that the last server error is reported once retries run out."""
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, status=503, repeat=True)
+        transport = Transport(websession, {ENDPOINT_GET_THERMOSTATS: NO_BACKOFF})
+        schluter = SchluterApi(websession, transport=transport)
+        with pytest.raises(ApiError):
+            await schluter.async_get_current_thermostats("abcd")
+        request_count = sum(len(calls) for calls in session_mock.requests.values())
+
+    await websession.close()
+    assert request_count == 3
+
+
+@pytest.mark.asyncio
+async def test_retries_are_reported_when_the_request_fails():
+    """Test that a request raising after its last retry reports every retry."""
+    events = []
+
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, exception=ClientError(), repeat=True)
+        transport = Transport(websession, {ENDPOINT_GET_THERMOSTATS: NO_BACKOFF})
+        schluter = SchluterApi(websession, transport=transport)
+        schluter.add_observer(events.append)
+        with pytest.raises(ClientError):
+            await schluter.async_get_current_thermostats("abcd")
+
+    await websession.close()
+    assert len(events) == 1
+    assert events[0].retries == 2
+    assert isinstance(events[0].error, ClientError)
+
+
+@pytest.mark.asyncio
+async def test_authentication_is_not_retried():
+    """Test that a failed login is not sent again, as each creates a session."""
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.post(AUTH_URL, status=503, repeat=True)
+        schluter = SchluterApi(websession)
+        with pytest.raises(ApiError):
+            await schluter.async_get_sessionid("one@someplace.org", "pw")
+        request_count = sum(len(calls) for calls in session_mock.requests.values())
+
+    await websession.close()
+    assert request_count == 1
+
+
+@pytest.mark.asyncio
+async def test_requests_time_out():
+    """Test that the endpoint timeout bounds a hung request."""
+    async with MockSchluterServer(latency=(0.2, 0.2)) as server:
+        async with ClientSession() as websession:
+            transport = Transport(
+                websession,
+                {ENDPOINT_GET_THERMOSTATS: EndpointPolicy(timeout=0.02, retries=0)},
+            )
+            schluter = SchluterApi(websession, base_url=server.url, transport=transport)
+            with pytest.raises(asyncio.TimeoutError):
+                await schluter.async_get_current_thermostats("abcd")
+
+
+def test_circuit_breaker_opens_and_probes():
+    """Test the closed, open and half open states of the circuit breaker."""
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, recovery_time=10, clock=clock)
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+
+    clock.now = 10
+    assert breaker.state == CIRCUIT_HALF_OPEN
+    breaker.before_request()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_request()
+    breaker.record_failure()
+    assert breaker.state == CIRCUIT_OPEN
+
+    clock.now = 20
+    breaker.before_request()
+    breaker.record_success()
+    assert breaker.state == CIRCUIT_CLOSED
+    breaker.before_request()
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast():
+    """Test that no request is sent while the circuit is open."""
+    websession = ClientSession()
+    with aioresponses() as session_mock:
+        session_mock.get(THERMOSTATS_URL, status=503, repeat=True)
+        transport = Transport(
+            websession,
+            {ENDPOINT_GET_THERMOSTATS: EndpointPolicy(retries=0)},
+            CircuitBreaker(failure_threshold=3),
+        )
+        schluter = SchluterApi(websession, transport=transport)
+        for _ in range(3):
+            with pytest.raises(ApiError):
+                await schluter.async_get_current_thermostats("abcd")
+        with pytest.raises(CircuitOpenError):
+            await schluter.async_get_current_thermostats("abcd")
+        request_count = sum(len(calls) for calls in session_mock.requests.values())
+
+    await websession.close()
+    assert request_count == 3